@@ -1,5 +1,5 @@
 """连接模块对外导出的公共对象。"""
-from sf_rdf_acl.connection.client import FusekiClient, RDFClient
+from sf_rdf_acl.connection.client import FusekiClient, RDFClient, RDFClientOwner
 
-__all__ = ["FusekiClient", "RDFClient"]
+__all__ = ["FusekiClient", "RDFClient", "RDFClientOwner"]
 
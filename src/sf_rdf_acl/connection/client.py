@@ -6,19 +6,28 @@ SPARQL 操作，同时在客户端侧内置以下能力：
 * 按请求级别的超时控制与指数退避重试；
 * 基于失败次数的熔断器（circuit breaker）；
 * 失败/成功指标上报，便于监控可视化；
-* 统一的 trace id 透传机制。
+* 统一的 trace id 透传机制；
+* 复用单个 ``httpx.AsyncClient`` 连接池，避免每次请求重复建立 TCP/TLS 连接；
+* 已安装 ``orjson`` 时使用其解析 SELECT 结果，否则回退到标准库 ``json``。
 
 所有实际的 Fuseki 请求均使用 HTTP POST 完成，与 Jena Fuseki REST 接口保持兼容。"""
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import random
 import time
+from functools import lru_cache
 from threading import Lock
-from typing import Any, Protocol
+from typing import TYPE_CHECKING, Any, Protocol, Self
 
 import httpx
 
+try:  # orjson 为可选加速依赖，直接解析响应字节
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - 未安装时回退标准库
+    from json import loads as _json_loads
+
 from common.exceptions import ErrorCode, ExternalServiceError
 from common.logging import LoggerFactory
 from common.observability import (
@@ -27,6 +36,26 @@ from common.observability import (
     set_fuseki_circuit_state,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - 仅用于类型提示
+    from common.config.settings import Settings
+
+
+#: 仅缓存较短的查询文本（常量探活/分页模板查询），避免大体积 UPDATE 占用缓存内存。
+_ENCODE_CACHE_MAX_CHARS = 4096
+
+
+@lru_cache(maxsize=256)
+def _encode_cached(query: str) -> bytes:
+    return query.encode("utf-8")
+
+
+def _encode_query(query: str) -> bytes:
+    """将 SPARQL 文本编码为 UTF-8 请求体，重复出现的短查询直接复用缓存结果。"""
+
+    if len(query) <= _ENCODE_CACHE_MAX_CHARS:
+        return _encode_cached(query)
+    return query.encode("utf-8")
+
 
 class RDFClient(Protocol):
     """RDF 客户端最小协议。
@@ -67,6 +96,8 @@ class FusekiClient:
     """与 Fuseki REST 接口交互的 HTTP 客户端。"""
 
     _DEFAULT_RETRY_CODES = {408, 409, 429, 500, 502, 503, 504}
+    _ERROR_MESSAGE_LIMIT = 1024
+    _POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
 
     def __init__(
         self,
@@ -122,12 +153,19 @@ class FusekiClient:
 
         cb = circuit_breaker or {}
         self._cb_failure_threshold = int(cb.get("failureThreshold", 5))
-        self._cb_recovery_timeout = float(cb.get("recoveryTimeout", 30.0))
+        # 熔断窗口统一以整数纳秒计算，与 _now() 的 monotonic_ns 对齐
+        self._cb_recovery_timeout_ns = int(float(cb.get("recoveryTimeout", 30.0)) * 1_000_000_000)
         self._cb_record_timeout_only = bool(cb.get("recordTimeoutOnly", False))
         self._cb_failure_count = 0
-        self._cb_open_until: float | None = None
+        self._cb_open_until: int | None = None
         self._breaker_lock = Lock()
 
+        # 共享连接池按事件循环惰性创建：httpx 的连接与创建它的事件循环绑定
+        self._http: httpx.AsyncClient | None = None
+        self._http_loop: asyncio.AbstractEventLoop | None = None
+        # 正在后台释放的旧连接池任务，保留强引用防止任务被提前回收
+        self._releasing: set[asyncio.Task[None]] = set()
+
     async def select(self, query: str, *, timeout: int | None = 30, trace_id: str | None = None) -> dict[str, Any]:
         """执行 SPARQL SELECT 请求。
 
@@ -143,7 +181,7 @@ class FusekiClient:
             timeout=timeout,
             trace_id=trace_id,
         )
-        data = response.json()
+        data = _json_loads(response.content)
         return {
             "vars": data.get("head", {}).get("vars", []),
             "bindings": data.get("results", {}).get("bindings", []),
@@ -193,6 +231,18 @@ class FusekiClient:
 
         return {"ok": True, "backend": "fuseki", "dataset": self.dataset}
 
+    async def aclose(self) -> None:
+        """关闭共享的 HTTP 连接池；之后的请求会按需重新创建连接池。"""
+
+        http, loop = self._http, self._http_loop
+        self._http, self._http_loop = None, None
+        if http is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await http.aclose()
+        else:
+            await self._release_http(http, loop)
+
     # ---- 内部工具 -----------------------------------------------------
 
     async def _execute(
@@ -230,6 +280,8 @@ class FusekiClient:
         }
         if trace_id:
             headers[self.trace_header] = trace_id
+        # 请求体只编码一次，重试时复用
+        content = _encode_query(query)
 
         attempt = 0
         backoff = float(self._retry_policy["backoff_seconds"])
@@ -241,14 +293,13 @@ class FusekiClient:
             attempt += 1
             start = time.perf_counter()
             try:
-                # 每次请求使用新的 AsyncClient，确保超时设置独立
-                async with httpx.AsyncClient(timeout=resolved_timeout) as client:
-                    response = await client.post(
-                        url,
-                        content=query.encode("utf-8"),
-                        headers=headers,
-                        auth=self._auth,
-                    )
+                # 复用连接池，超时按请求单独指定
+                response = await self._get_http().post(
+                    url,
+                    content=content,
+                    headers=headers,
+                    timeout=resolved_timeout,
+                )
                 duration_ms = (time.perf_counter() - start) * 1000
                 status_code = response.status_code
 
@@ -284,6 +335,40 @@ class FusekiClient:
                 await self._sleep(backoff, jitter)
                 backoff *= multiplier
 
+    def _get_http(self) -> httpx.AsyncClient:
+        """返回绑定当前事件循环的共享 ``AsyncClient``，必要时惰性创建。"""
+
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http_loop is not loop:
+            if self._http is not None:
+                # 事件循环已切换：旧连接池绑定在原循环上，后台释放后再换用新池
+                task = loop.create_task(self._release_http(self._http, self._http_loop))
+                self._releasing.add(task)
+                task.add_done_callback(self._releasing.discard)
+            # BasicAuth 在构造时已预先编码，随连接池一次性注入，请求路径不再逐次传递
+            self._http = httpx.AsyncClient(
+                auth=self._auth,
+                limits=self._POOL_LIMITS,
+                timeout=self._resolve_timeout(None),
+            )
+            self._http_loop = loop
+        return self._http
+
+    @staticmethod
+    async def _release_http(http: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+        """关闭绑定在其他事件循环上的连接池。
+
+        原循环仍在（其他线程中）运行时交回该循环关闭；原循环已关闭时底层传输无法再正常关闭，
+        ``aclose`` 会抛出 RuntimeError，但连接已从池中移除，套接字随对象回收释放。
+        """
+
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                asyncio.run_coroutine_threadsafe(http.aclose(), loop)
+            return
+        with contextlib.suppress(RuntimeError):
+            await http.aclose()
+
     def _resolve_timeout(self, timeout: int | None) -> httpx.Timeout:
         """计算本次请求使用的超时时间对象。"""
 
@@ -307,7 +392,8 @@ class FusekiClient:
     def _raise_http_error(self, response: httpx.Response, reason: str) -> None:
         """将 HTTP 错误响应转换为平台统一异常。"""
 
-        message = response.text
+        # 只解码保留的前 1024 字节，避免大体积错误页整体解码；截断处的半个字符直接丢弃
+        message = response.content[: self._ERROR_MESSAGE_LIMIT].decode(response.encoding or "utf-8", errors="ignore")
         code = ErrorCode.FUSEKI_QUERY_ERROR
         if response.status_code == 400:
             code = ErrorCode.BAD_REQUEST
@@ -318,7 +404,7 @@ class FusekiClient:
         raise ExternalServiceError(
             code,
             "Fuseki 查询失败",
-            details={"status": response.status_code, "message": message[:1024], "reason": reason},
+            details={"status": response.status_code, "message": message, "reason": reason},
         )
 
     # ---- 熔断与指标 -----------------------------------------------------
@@ -339,7 +425,7 @@ class FusekiClient:
                 return
         if self._cb_open_until is not None:
             observe_fuseki_failure(operation, "circuit_open")
-            remaining = max(0.0, (self._cb_open_until or 0) - self._now())
+            remaining = max(0, (self._cb_open_until or 0) - self._now()) / 1_000_000_000
             raise ExternalServiceError(
                 ErrorCode.FUSEKI_CIRCUIT_OPEN,
                 "Fuseki 服务已被熔断",
@@ -356,7 +442,7 @@ class FusekiClient:
                 return
             self._cb_failure_count += 1
             if self._cb_failure_count >= self._cb_failure_threshold:
-                self._cb_open_until = self._now() + self._cb_recovery_timeout
+                self._cb_open_until = self._now() + self._cb_recovery_timeout_ns
                 set_fuseki_circuit_state(operation, True)
                 self._logger.warning(
                     "Fuseki 熔断器已打开",
@@ -364,7 +450,7 @@ class FusekiClient:
                         "trace_id": trace_id,
                         "operation": operation,
                         "reason": reason,
-                        "recovery_timeout": self._cb_recovery_timeout,
+                        "recovery_timeout": self._cb_recovery_timeout_ns / 1_000_000_000,
                     },
                 )
 
@@ -415,7 +501,69 @@ class FusekiClient:
         return "update" if "update" in path else "query"
 
     @staticmethod
-    def _now() -> float:
-        """返回单调递增时间戳，用于计算耗时。"""
+    def _now() -> int:
+        """返回单调递增的纳秒时间戳，用于熔断窗口计算。"""
+
+        return time.monotonic_ns()
+
+
+class RDFClientOwner:
+    """持有 RDF 客户端的组件基类，统一客户端的归属与关闭。
+
+    未注入客户端时由组件通过 ``_create_client`` 按 ``self._settings`` 自建 ``FusekiClient`` 并负责释放其连接池；
+    外部注入的客户端由注入方管理生命周期。支持 ``await owner.aclose()`` 或 ``async with owner:``。
+    子类需在调用 ``_adopt_client`` 之前设置 ``self._settings``。
+    """
+
+    _settings: Settings
+    _owned_client: FusekiClient | None = None
+
+    def _adopt_client(self, client: RDFClient | None) -> RDFClient:
+        """返回注入的客户端；未注入时自建并记录为自有客户端。"""
+
+        if client is not None:
+            return client
+        self._owned_client = self._create_client()
+        return self._owned_client
+
+    def _create_client(self) -> FusekiClient:
+        """根据当前配置构造默认的 :class:`FusekiClient`。
+
+        返回：
+            配置完成的 ``FusekiClient`` 实例，可直接执行查询或更新。
+        """
+
+        rdf = self._settings.rdf
+        security = self._settings.security
+        auth_tuple: tuple[str, str] | None = None
+        if rdf.auth.username and rdf.auth.password:
+            auth_tuple = (rdf.auth.username, rdf.auth.password)
+        retry_policy = {
+            "max_attempts": rdf.retries.max_attempts,
+            "backoff_seconds": rdf.retries.backoff_seconds,
+            "backoff_multiplier": rdf.retries.backoff_multiplier,
+            "jitter_seconds": rdf.retries.jitter_seconds or 0.0,
+        }
+        breaker_policy = rdf.circuit_breaker.model_dump(by_alias=True)
+        return FusekiClient(
+            endpoint=str(rdf.endpoint),
+            dataset=rdf.dataset,
+            auth=auth_tuple,
+            trace_header=security.trace_header,
+            default_timeout=rdf.timeout.default,
+            max_timeout=rdf.timeout.max,
+            retry_policy=retry_policy,
+            circuit_breaker=breaker_policy,
+        )
+
+    async def aclose(self) -> None:
+        """释放自建客户端的连接池；可重复调用。"""
+
+        if self._owned_client is not None:
+            await self._owned_client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
 
-        return time.monotonic()
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
@@ -1,45 +1,73 @@
 """RDF 图数据格式化工具。
 
-本模块提供将 Turtle 文本转换为多种输出格式的能力，包括：
+本模块提供将 Turtle 文本（或已解析的 rdflib 图）转换为多种输出格式的能力，包括：
 - "turtle"：原样透传
 - "json-ld"：使用 rdflib 进行 JSON‑LD 序列化，并支持自定义 ``@context``
 - "simplified-json"：面向前端/可视化的简化 JSON 结构（节点/边/统计）
 
-注意：为保证兼容性，保留 ``to_turtle`` 方法用于最简单的透传场景。
+注意：为保证兼容性，保留 ``to_turtle`` 方法用于最简单的透传场景；已安装 ``orjson`` 时
+JSON‑LD 序列化结果直接由其解析字节流，否则回退到标准库 ``json``。
 """
 from __future__ import annotations
 
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from io import BytesIO
 from typing import Any, Literal
 
 from common.logging import LoggerFactory
 from rdflib import Graph as RDFGraph
 from rdflib import Literal as RDFLiteral
-from rdflib import RDF, RDFS, URIRef
+from rdflib import RDF, RDFS, URIRef, plugin
+from rdflib.serializer import Serializer
 import json
 
+try:  # orjson 为可选加速依赖，直接解析序列化输出的字节
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - 未安装时回退标准库
+    from json import loads as _json_loads
+
 
 # 输出格式类型约束
 FormatType = Literal["turtle", "json-ld", "simplified-json"]
 
 
+@lru_cache(maxsize=1)
+def _jsonld_serializer() -> type[Serializer]:
+    """首次使用时解析 rdflib 的 JSON‑LD 序列化插件，之后复用同一个类。"""
+
+    return plugin.get("json-ld", Serializer)
+
+
 class GraphFormatter:
     """图数据格式化与转换帮助类。
 
     功能：
-    - ``format_graph``：根据 ``format_type`` 将 Turtle 文本转换为目标格式；
+    - ``format_graph``：根据 ``format_type`` 将 Turtle 文本或已解析的图转换为目标格式；
     - ``to_turtle``：与历史行为兼容的透传方法；
 
+    缓存（默认关闭，通过 ``cache_size`` 开启）：
+    - 对 Turtle 文本输入，按 ``(文本摘要, 格式, @context)`` 缓存转换结果（LRU），相同输入再次转换时
+      跳过 rdflib 解析与遍历；缓存中保存结果的 JSON 文本，命中时重新解析为新对象，
+      调用方修改返回值不会污染缓存，未命中时直接返回新构造的结果。
+
     线程安全：
-    - 本类无共享可变状态，方法为纯函数式（除日志外），可在并发环境中安全复用。
+    - 除带锁的 LRU 缓存外无共享可变状态，可在并发环境中安全复用。
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, cache_size: int = 0) -> None:
         """初始化格式化器。
 
-        无参数；创建模块级默认日志器用于调试与故障排查。
+        参数:
+            cache_size (int): Turtle 转换结果的 LRU 缓存容量；默认 ``0`` 表示关闭缓存。
         """
 
         self._logger = LoggerFactory.create_default_logger(__name__)
+        self._cache_size = max(0, int(cache_size))
+        self._cache: OrderedDict[tuple[bytes, str, str | None], str] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def to_turtle(self, graph_ttl: str) -> str:
         """将传入的 Turtle 文本原样返回（历史兼容）。
@@ -55,15 +83,16 @@ class GraphFormatter:
 
     def format_graph(
         self,
-        turtle_data: str,
+        turtle_data: str | RDFGraph,
         *,
         format_type: FormatType = "turtle",
         context: dict[str, Any] | None = None,
     ) -> str | dict[str, Any]:
-        """将 Turtle 文本格式化为指定目标格式。
+        """将 Turtle 文本或已解析的图格式化为指定目标格式。
 
         参数:
-            turtle_data (str): Turtle 格式的 RDF 数据文本。
+            turtle_data (str | RDFGraph): Turtle 格式的 RDF 数据文本；同一份数据需多次转换时
+                可直接传入已解析的 ``rdflib.Graph``，跳过重复解析。
             format_type (Literal["turtle", "json-ld", "simplified-json"]): 目标格式类型。
             context (dict[str, Any] | None): 当 ``format_type="json-ld"`` 时可选的自定义
                 ``@context`` 映射，键应为前缀或简名，值为 IRI 或映射对象。
@@ -77,12 +106,72 @@ class GraphFormatter:
             ValueError: 当 ``format_type`` 不被支持时抛出。
         """
 
+        if isinstance(turtle_data, RDFGraph):
+            graph = turtle_data
+            if format_type == "turtle":
+                return graph.serialize(format="turtle")
+            return self._format_from_graph(graph, format_type=format_type, context=context)
+
         if format_type == "turtle":
             return turtle_data
+        if not self._cache_size:
+            return self._format_text(turtle_data, format_type, context)
+        try:
+            context_key = json.dumps(context, sort_keys=True) if context else None
+        except TypeError:
+            # @context 含不可序列化对象时无法构造稳定键，直接转换不入缓存
+            return self._format_text(turtle_data, format_type, context)
+
+        # 以文本摘要作键，避免缓存长期持有完整的 CONSTRUCT 文本
+        key = (hashlib.blake2b(turtle_data.encode("utf-8"), digest_size=16).digest(), format_type, context_key)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        if cached is not None:
+            return _json_loads(cached)
+
+        result = self._format_text(turtle_data, format_type, context)
+        with self._cache_lock:
+            self._cache[key] = json.dumps(result)
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _format_text(
+        self,
+        turtle_data: str,
+        format_type: FormatType,
+        context: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """解析 Turtle 文本并转换为目标格式。"""
 
         # 解析 Turtle 为 RDFLib Graph
         graph = RDFGraph()
         graph.parse(data=turtle_data, format="turtle")
+        return self._format_from_graph(graph, format_type=format_type, context=context)
+
+    def _format_from_graph(
+        self,
+        graph: RDFGraph,
+        *,
+        format_type: FormatType,
+        context: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """将已解析的 RDFLib Graph 转换为 JSON‑LD 或简化 JSON，跳过 Turtle 解析。
+
+        参数:
+            graph (RDFGraph): 已解析的 RDF 图。
+            format_type (Literal["json-ld", "simplified-json"]): 目标格式类型。
+            context (dict[str, Any] | None): JSON‑LD 自定义 ``@context``。
+
+        返回:
+            dict[str, Any]: 目标格式的数据结构。
+
+        异常:
+            ValueError: 当 ``format_type`` 不被支持时抛出。
+        """
 
         if format_type == "json-ld":
             return self._to_jsonld(graph, context)
@@ -104,11 +193,10 @@ class GraphFormatter:
             dict[str, Any]: JSON‑LD 对象，若提供 ``context`` 则会注入 ``@context`` 键。
         """
 
-        jsonld_str = graph.serialize(format="json-ld")
-        # rdflib 返回 str；出于健壮性允许 bytes → str
-        if isinstance(jsonld_str, bytes):
-            jsonld_str = jsonld_str.decode("utf-8")
-        jsonld_data = json.loads(jsonld_str)
+        # 直接驱动缓存的序列化器写入字节流，省去 graph.serialize 每次的插件查找与 bytes → str 解码
+        stream = BytesIO()
+        _jsonld_serializer()(graph).serialize(stream, base=graph.base, encoding="utf-8")
+        jsonld_data = _json_loads(stream.getvalue())
         # rdflib 在某些情形下直接返回顶层 list（expanded form），为便于消费统一包裹到 @graph
         if isinstance(jsonld_data, list):
             wrapped: dict[str, Any] = {"@graph": jsonld_data}
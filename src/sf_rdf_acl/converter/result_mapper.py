@@ -8,7 +8,37 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
+
+
+def _to_int(value: Any) -> Any:
+    """转换为整数，失败时返回原值。"""
+
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_float(value: Any) -> Any:
+    """经 ``Decimal`` 转换为浮点数，失败时返回原值。"""
+
+    try:
+        return float(Decimal(value))
+    except (TypeError, ValueError, ArithmeticError):
+        return value
+
+
+def _to_bool(value: Any) -> bool:
+    """按 XSD 布尔字面量（``true``/``1``）转换。"""
+
+    return str(value).lower() in {"true", "1"}
+
+
+def _to_datetime(value: Any) -> str:
+    """将 XSD `dateTime` 规范化为 ISO 8601 字符串。"""
+
+    return ResultMapper._normalize_datetime(str(value))
 
 
 class ResultMapper:
@@ -45,6 +75,14 @@ class ResultMapper:
     _BOOL_TYPE = "http://www.w3.org/2001/XMLSchema#boolean"
     _DATETIME_TYPE = "http://www.w3.org/2001/XMLSchema#dateTime"
 
+    #: 数据类型 URI 到转换函数的分派表。
+    _CASTERS: dict[str, Callable[[Any], Any]] = {
+        **{dtype: _to_int for dtype in _INT_TYPES},
+        **{dtype: _to_float for dtype in _DECIMAL_TYPES},
+        _BOOL_TYPE: _to_bool,
+        _DATETIME_TYPE: _to_datetime,
+    }
+
     def map_bindings(self, vars: list[str], bindings: list[dict[str, Any]]) -> list[dict[str, Any]]:
         """将 SPARQL JSON 绑定数组转换为统一结构。
 
@@ -67,14 +105,28 @@ class ResultMapper:
                 当某个变量在该行不存在时，其值为 ``None``。
         """
 
-        rows: list[dict[str, Any]] = []
+        columns = tuple(vars)
+        convert = self._convert_cell
+        return [{var: convert(binding.get(var)) for var in columns} for binding in bindings]
+
+    def iter_bindings(self, vars: list[str], bindings: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """按需逐行转换绑定结果，行结构与 :meth:`map_bindings` 相同。
+
+        适用于分页等只消费部分行的场景：配合 ``itertools.islice`` 使用时，
+        未被读取的行不会被转换，也无需预先复制原始绑定列表。
+
+        参数:
+            vars (list[str]): 查询头部返回的变量名列表。
+            bindings (Iterable[dict[str, Any]]): Fuseki 返回的 `results.bindings`。
+
+        返回:
+            Iterator[dict[str, Any]]: 逐行产出 ``{变量名: {value, raw, type, ...}}``。
+        """
+
+        columns = tuple(vars)
+        convert = self._convert_cell
         for binding in bindings:
-            row: dict[str, Any] = {}
-            for var in vars:
-                cell = binding.get(var)
-                row[var] = self._convert_cell(cell)
-            rows.append(row)
-        return rows
+            yield {var: convert(binding.get(var)) for var in columns}
 
     def _convert_cell(self, cell: dict[str, Any] | None) -> dict[str, Any] | None:
         """将单个 SPARQL 单元格转换为标准结构。
@@ -117,28 +169,11 @@ class ResultMapper:
             Any: 转换后的 Python 对象；若无法转换则返回原值。
         """
 
+        # 无数据类型（URI / 空白节点 / 普通字面量）与未知类型均原样返回
         if dtype is None:
-            # 对于没有显式数据类型的值，仅在 URI / 空白节点时原样返回。
-            if ctype in {"uri", "bnode"}:
-                return value
-            return value
-        if dtype in self._INT_TYPES:
-            try:
-                return int(value)
-            except (TypeError, ValueError):
-                return value
-        if dtype in self._DECIMAL_TYPES:
-            try:
-                return float(Decimal(value))
-            except (TypeError, ValueError, ArithmeticError):
-                return value
-        if dtype == self._BOOL_TYPE:
-            return str(value).lower() in {"true", "1"}
-        if dtype == self._DATETIME_TYPE:
-            return self._normalize_datetime(str(value))
-        if dtype.endswith("#string"):
             return value
-        return value
+        caster = self._CASTERS.get(dtype)
+        return caster(value) if caster is not None else value
 
     @staticmethod
     def _normalize_datetime(text: str) -> str:
@@ -13,12 +13,12 @@ from common.config.settings import Settings
 from common.exceptions import ExternalServiceError
 from common.logging import LoggerFactory
 
-from sf_rdf_acl.connection.client import FusekiClient, RDFClient
+from sf_rdf_acl.connection.client import RDFClient, RDFClientOwner
 from sf_rdf_acl.query.dsl import GraphRef
 from sf_rdf_acl.utils import resolve_graph_iri
 
 
-class NamedGraphManager:
+class NamedGraphManager(RDFClientOwner):
     """命名图管理器。
 
 主要职责：
@@ -42,7 +42,7 @@ class NamedGraphManager:
 
         self._config_manager = ConfigManager.current()
         self._settings = settings or self._config_manager.settings
-        self._client = client or self._create_client()
+        self._client = self._adopt_client(client)
         self._logger = LoggerFactory.create_default_logger(__name__)
 
     async def create(self, graph: GraphRef, *, trace_id: str) -> dict[str, Any]:
@@ -532,36 +532,6 @@ class NamedGraphManager:
 
         return value.replace('\\', '\\\\').replace('"', '\\"')
 
-    def _create_client(self) -> FusekiClient:
-        """根据当前配置构造默认的 :class:`FusekiClient`。
-
-返回：
-    配置好的 ``FusekiClient`` 实例，可直接执行查询或更新。
-"""
-
-        rdf = self._settings.rdf
-        security = self._settings.security
-        auth_tuple: tuple[str, str] | None = None
-        if rdf.auth.username and rdf.auth.password:
-            auth_tuple = (rdf.auth.username, rdf.auth.password)
-        retry_policy = {
-            "max_attempts": rdf.retries.max_attempts,
-            "backoff_seconds": rdf.retries.backoff_seconds,
-            "backoff_multiplier": rdf.retries.backoff_multiplier,
-            "jitter_seconds": rdf.retries.jitter_seconds or 0.0,
-        }
-        breaker_policy = rdf.circuit_breaker.model_dump(by_alias=True)
-        return FusekiClient(
-            endpoint=str(rdf.endpoint),
-            dataset=rdf.dataset,
-            auth=auth_tuple,
-            trace_header=security.trace_header,
-            default_timeout=rdf.timeout.default,
-            max_timeout=rdf.timeout.max,
-            retry_policy=retry_policy,
-            circuit_breaker=breaker_policy,
-        )
-
     def _resolve_graph(self, graph: GraphRef) -> str:
         """将 :class:`GraphRef` 解析为命名图 IRI。
 
@@ -12,7 +12,7 @@ from common.config.settings import GraphConfig, Settings
 from common.exceptions import APIError, ErrorCode
 from common.logging import LoggerFactory
 
-from ..connection.client import FusekiClient, RDFClient
+from ..connection.client import RDFClient, RDFClientOwner
 from ..query.builder import SPARQLQueryBuilder
 from ..query.dsl import GraphRef, QueryDSL
 from ..utils import resolve_graph_iri
@@ -39,7 +39,7 @@ class ProjectionPayload:
     graph_iri: str | None
 
 
-class GraphProjectionBuilder:
+class GraphProjectionBuilder(RDFClientOwner):
     """图投影构建器。
 
 职责：
@@ -73,7 +73,7 @@ class GraphProjectionBuilder:
 
         self._config_manager = ConfigManager.current()
         self._settings = settings or self._config_manager.settings
-        self._client = client or self._create_client()
+        self._client = self._adopt_client(client)
         self._builder = builder or SPARQLQueryBuilder()
         self._graph_config: GraphConfig = self._settings.graph
         self._logger = LoggerFactory.create_default_logger(__name__)
@@ -167,36 +167,6 @@ class GraphProjectionBuilder:
 
     # ---- 内部工具方法 -----------------------------------------------------
 
-    def _create_client(self) -> FusekiClient:
-        """根据当前配置构造默认的 :class:`FusekiClient`。
-
-返回：
-    已配置完成的 ``FusekiClient`` 实例，用于执行查询与更新。
-"""
-
-        rdf = self._settings.rdf
-        security = self._settings.security
-        auth_tuple: tuple[str, str] | None = None
-        if rdf.auth.username and rdf.auth.password:
-            auth_tuple = (rdf.auth.username, rdf.auth.password)
-        retry_policy = {
-            "max_attempts": rdf.retries.max_attempts,
-            "backoff_seconds": rdf.retries.backoff_seconds,
-            "backoff_multiplier": rdf.retries.backoff_multiplier,
-            "jitter_seconds": rdf.retries.jitter_seconds or 0.0,
-        }
-        breaker_policy = rdf.circuit_breaker.model_dump(by_alias=True)
-        return FusekiClient(
-            endpoint=str(rdf.endpoint),
-            dataset=rdf.dataset,
-            auth=auth_tuple,
-            trace_header=security.trace_header,
-            default_timeout=rdf.timeout.default,
-            max_timeout=rdf.timeout.max,
-            retry_policy=retry_policy,
-            circuit_breaker=breaker_policy,
-        )
-
     async def _collect(
         self,
         source: QueryDSL | GraphRef,
@@ -11,13 +11,13 @@ from common.config import ConfigManager
 from common.config.settings import Settings
 from common.logging import LoggerFactory
 
-from ..connection.client import FusekiClient, RDFClient
+from ..connection.client import RDFClient, RDFClientOwner
 from ..query.dsl import GraphRef
 from ..transaction.upsert import Provenance, Triple
 from ..utils import resolve_graph_iri
 
 
-class ProvenanceService:
+class ProvenanceService(RDFClientOwner):
     """RDF* 溯源写入服务。
 
     职责：
@@ -48,7 +48,7 @@ class ProvenanceService:
 
         self._config_manager = ConfigManager.current()
         self._settings = settings or self._config_manager.settings
-        self._client = client or self._create_client()
+        self._client = self._adopt_client(client)
         self._logger = LoggerFactory.create_default_logger(__name__)
 
     async def annotate(
@@ -98,36 +98,6 @@ class ProvenanceService:
 
     # ---- 内部工具方法 -----------------------------------------------------
 
-    def _create_client(self) -> FusekiClient:
-        """根据当前配置构造默认的 FusekiClient。
-
-        返回：
-            配置完成的 ``FusekiClient`` 实例，可直接执行查询或更新。
-        """
-
-        rdf = self._settings.rdf
-        security = self._settings.security
-        auth_tuple: tuple[str, str] | None = None
-        if rdf.auth.username and rdf.auth.password:
-            auth_tuple = (rdf.auth.username, rdf.auth.password)
-        retry_policy = {
-            "max_attempts": rdf.retries.max_attempts,
-            "backoff_seconds": rdf.retries.backoff_seconds,
-            "backoff_multiplier": rdf.retries.backoff_multiplier,
-            "jitter_seconds": rdf.retries.jitter_seconds or 0.0,
-        }
-        breaker_policy = rdf.circuit_breaker.model_dump(by_alias=True)
-        return FusekiClient(
-            endpoint=str(rdf.endpoint),
-            dataset=rdf.dataset,
-            auth=auth_tuple,
-            trace_header=security.trace_header,
-            default_timeout=rdf.timeout.default,
-            max_timeout=rdf.timeout.max,
-            retry_policy=retry_policy,
-            circuit_breaker=breaker_policy,
-        )
-
     def _build_statements(
         self,
         triples: Iterable[Triple],
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import math
 import re
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Iterable, Sequence
 
@@ -18,8 +19,13 @@ class SPARQLSanitizer:
     注意：该工具仅负责语法级别的安全防护，不等价于权限与数据级安全控制。
     """
 
-    @staticmethod
-    def escape_uri(uri: str) -> str:
+    # 校验用正则与转义表在类加载时预编译，调用时只走 C 层的 match/translate
+    _URI_RE = re.compile(r"https?://[^<>\"{}|\\^`\s]*")
+    _NCNAME_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+    _LITERAL_TRANS = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+    @classmethod
+    def escape_uri(cls, uri: str) -> str:
         """转义并校验 IRI。
 
         参数：
@@ -29,25 +35,22 @@ class SPARQLSanitizer:
             通过校验的 IRI 字符串（原样返回，不包角括号）。
 
         异常：
-            ValueError: 当 IRI 为空、类型错误、或包含危险字符时抛出。
+            ValueError: 当 IRI 为空、类型错误、或包含危险字符/空白时抛出。
         """
 
         if not uri or not isinstance(uri, str):
             raise ValueError(f"Invalid URI: {uri}")
 
+        if cls._URI_RE.fullmatch(uri):
+            return uri
         # 要求 http/https IRI，其他协议或裸字符串一律拒绝
         if not (uri.startswith("http://") or uri.startswith("https://")):
             raise ValueError(f"Invalid URI scheme: {uri}")
+        # 拦截常见危险字符与空白，避免拼接破坏 SPARQL 结构
+        raise ValueError(f"URI contains dangerous characters: {uri}")
 
-        # 拦截常见危险字符，避免拼接破坏 SPARQL 结构
-        dangerous_chars = ["<", ">", '"', "{", "}", "|", "\\", "^", "`"]
-        if any(ch in uri for ch in dangerous_chars):
-            raise ValueError(f"URI contains dangerous characters: {uri}")
-
-        return uri
-
-    @staticmethod
-    def escape_literal(value: str, datatype: str | None = None) -> str:
+    @classmethod
+    def escape_literal(cls, value: str, datatype: str | None = None) -> str:
         """转义字面量为安全的 SPARQL 表达式。
 
         参数：
@@ -60,14 +63,14 @@ class SPARQLSanitizer:
             - 带类型："2024-01-01"^^<http://www.w3.org/2001/XMLSchema#date>
         """
 
-        # 仅进行必要转义：反斜杠与双引号
-        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        # 转义反斜杠、双引号与换行/回车/制表符（短字符串字面量中不允许裸换行）
+        escaped = value.translate(cls._LITERAL_TRANS)
         if datatype:
             return f'"{escaped}"^^<{datatype}>'
         return f'"{escaped}"'
 
-    @staticmethod
-    def validate_prefix(prefix: str) -> bool:
+    @classmethod
+    def validate_prefix(cls, prefix: str) -> bool:
         """验证前缀名称是否合法。
 
         参数：
@@ -77,11 +80,49 @@ class SPARQLSanitizer:
             True 表示合法，False 表示不合法。
         """
 
-        import re as _re
-
         # XML NCName 的近似校验：首字符字母或下划线，后续为字母/数字/下划线/连字符
-        pattern = r"^[A-Za-z_][A-Za-z0-9_-]*$"
-        return bool(_re.match(pattern, prefix))
+        return bool(cls._NCNAME_RE.fullmatch(prefix))
+
+
+def _fill_segments(segments: tuple[str, ...], params: Sequence[str]) -> str:
+    """按顺序将参数填入预切分的模板片段之间。"""
+
+    parts = [segments[0]]
+    for value, segment in zip(params, segments[1:]):
+        parts.append(value)
+        parts.append(segment)
+    return "".join(parts)
+
+
+@dataclass(frozen=True, slots=True)
+class SelectTemplate:
+    """按 DSL 结构预编译的 SELECT 模板。
+
+    过滤值、时间窗边界与 LIMIT/OFFSET 数值位于片段之间的参数位，结构相同仅取值不同的
+    DSL 共享同一模板，调用方持有模板后只需传入已渲染的参数即可得到完整查询。
+
+    参数:
+        segments (tuple[str, ...]): 按参数位切分的查询片段，长度为参数个数 + 1。
+    """
+
+    segments: tuple[str, ...]
+
+    @property
+    def param_count(self) -> int:
+        """模板所需的参数个数。"""
+
+        return len(self.segments) - 1
+
+    def render(self, params: Sequence[str]) -> str:
+        """按顺序填入已渲染（已转义）的参数，返回完整查询文本。
+
+        异常:
+            ValueError: 当参数个数与模板参数位不一致时抛出。
+        """
+
+        if len(params) != self.param_count:
+            raise ValueError(f"SelectTemplate 需要 {self.param_count} 个参数，实际为 {len(params)}")
+        return _fill_segments(self.segments, params)
 
 
 class SPARQLQueryBuilder:
@@ -110,7 +151,12 @@ class SPARQLQueryBuilder:
     }
 
     _TIME_PREDICATE = "prov:generatedAtTime"
+    _CURSOR_SLOT = "\x00cursor\x00"
     _PARTICIPANT_PREDICATE = "sf:participant"
+    _PARAM_SLOT = "\x00param\x00"
+    # in 操作符的取值超过该数量且全部为字符串（IRI/CURIE/普通字符串字面量）时改用 VALUES 内联数据块，
+    # 便于端点按哈希连接处理；VALUES 按 RDF 项精确匹配，数值/布尔/日期等需按值比较的取值仍用 IN
+    _IN_VALUES_THRESHOLD = 50
 
     def __init__(self, *, default_prefixes: dict[str, str] | None = None) -> None:
         """
@@ -139,6 +185,30 @@ class SPARQLQueryBuilder:
 
         return self._build_query(dsl, graph=graph, construct=False)
 
+    def build_select_template(
+        self, dsl: QueryDSL, *, graph: str | None = None
+    ) -> tuple[SelectTemplate, list[str]]:
+        """返回 DSL 对应的预编译 SELECT 模板及本次取值渲染出的参数。
+
+        同一结构的 DSL 返回相等的模板，``template.render(params)`` 与
+        ``build_select(dsl, graph=graph)`` 结果一致；调用方可持有模板，仅替换参数重复使用。
+
+        参数:
+            dsl: QueryDSL，例如 QueryDSL(type="entity", filters=[Filter(field="ex:name", op="=", value="A")]).
+            graph: 命名图 IRI；None 表示默认图。
+
+        返回:
+            tuple[SelectTemplate, list[str]]: 模板与按参数位顺序排列的已转义参数。
+        """
+
+        params: list[str] = []
+        text = self._build_query(dsl, graph=graph, construct=False, params=params)
+        segments = tuple(text.split(self._PARAM_SLOT))
+        if len(segments) != len(params) + 1:
+            # 非参数部分本身含占位符文本、无法安全切分时，退化为不含参数位的整段模板
+            return SelectTemplate((self._build_query(dsl, graph=graph, construct=False),)), []
+        return SelectTemplate(segments), params
+
     def build_construct(self, dsl: QueryDSL, *, graph: str | None = None) -> str:
         """
         按 DSL 定义构建 CONSTRUCT 查询语句。
@@ -175,8 +245,31 @@ class SPARQLQueryBuilder:
             str: 可直接发送至 Fuseki 的 SPARQL 查询文本。
         """
 
+        template = self.build_select_with_cursor_template(dsl, cursor_page.size, sort_key, graph=graph)
+        return template.render(cursor_page.cursor)
+
+    def build_select_with_cursor_template(
+        self,
+        dsl: QueryDSL,
+        size: int,
+        sort_key: str = "?s",
+        *,
+        graph: str | None = None,
+    ) -> "CursorQueryTemplate":
+        """预构建游标分页查询模板，翻页时只需替换游标 FILTER。
+
+        参数:
+            dsl: 查询 DSL，参与构建 WHERE 的过滤、展开、时间窗等内容。
+            size: 每页条数，例如 100；实际 LIMIT 为 ``size + 1`` 以判断 has_more。
+            sort_key: 排序与游标比较的变量名，默认为 "?s"（主语）。
+            graph: 可选的命名图 IRI；None 表示默认图。
+
+        返回:
+            CursorQueryTemplate: 通过 ``template.render(cursor)`` 得到每一页的查询文本。
+        """
+
         # 延迟导入，避免循环依赖
-        from .pagination import CursorPagination
+        from .pagination import CursorQueryTemplate
 
         prefixes = self._merge_prefixes(dsl)
 
@@ -207,22 +300,28 @@ class SPARQLQueryBuilder:
             where_lines.append(self._render_time_window(prefixes))
             where_lines.extend(self._render_time_filters(dsl.time_window))
 
-        # 游标过滤
-        if cursor_page.cursor:
-            data = CursorPagination.decode_cursor(cursor_page.cursor)
-            where_lines.append(CursorPagination.build_cursor_filter(data, sort_key))
+        # 游标过滤占位：位于 WHERE 最后一行，模板按此切分为前后两段
+        where_lines.append(self._CURSOR_SLOT)
 
         body = self._wrap_graph(where_lines, graph)
         header = self._render_prefix_block(prefixes)
 
         parts: list[str] = [header, "SELECT DISTINCT ?s", "WHERE {", body, "}"]
         parts.append(f"ORDER BY {sort_key}")
-        parts.append(f"LIMIT {max(1, cursor_page.size) + 1}")  # 多取 1 条用于判断 has_more
-        return "\n".join(parts)
+        parts.append(f"LIMIT {max(1, size) + 1}")  # 多取 1 条用于判断 has_more
+        prefix, _, suffix = "\n".join(parts).rpartition(f"\n  {self._CURSOR_SLOT}")
+        return CursorQueryTemplate(prefix=prefix, suffix=suffix, sort_key=sort_key)
 
     # ---- 内部实现 -----------------------------------------------------
 
-    def _build_query(self, dsl: QueryDSL, *, graph: str | None, construct: bool) -> str:
+    def _build_query(
+        self,
+        dsl: QueryDSL,
+        *,
+        graph: str | None,
+        construct: bool,
+        params: list[str] | None = None,
+    ) -> str:
         """
         统一处理 SELECT 与 CONSTRUCT 的构建流程。
 
@@ -230,6 +329,8 @@ class SPARQLQueryBuilder:
             dsl: QueryDSL，例如 QueryDSL(type="entity", filters=[...])。
             graph: 命名图 IRI，例如 "http://data.example/graph/c"；None 表示默认图。
             construct: bool，例 True 表示生成 CONSTRUCT，False 表示生成 SELECT。
+            params: 预编译模板时传入的参数收集列表；过滤值、时间窗边界与分页数值按出现顺序
+                追加到该列表，并在文本中以占位符代替。None 表示直接渲染取值。
 
         返回:
             完整的 SPARQL 查询文本。
@@ -246,7 +347,7 @@ class SPARQLQueryBuilder:
             var_name = f"?f{next_index}"
             next_index += 1
             # 根据过滤条件生成三元组与 FILTER 片段
-            triple_parts, filter_parts = self._render_filter(item, var_name, prefixes)
+            triple_parts, filter_parts = self._render_filter(item, var_name, prefixes, params=params)
             where_lines.extend(triple_parts)
             where_lines.extend(filter_parts)
 
@@ -268,7 +369,7 @@ class SPARQLQueryBuilder:
         if dsl.time_window:
             # 时间窗口需要先尝试绑定时间，再追加过滤条件
             where_lines.append(self._render_time_window(prefixes))
-            where_lines.extend(self._render_time_filters(dsl.time_window))
+            where_lines.extend(self._render_time_filters(dsl.time_window, params=params))
 
         # 去重以避免相同变量重复出现在 SELECT 头部
         select_vars = list(dict.fromkeys(select_vars))
@@ -289,35 +390,54 @@ class SPARQLQueryBuilder:
                 head = f"SELECT DISTINCT {' '.join(select_vars)}"
 
         query_parts = [header, head, "WHERE {", body, "}"]
+        query_parts.append(self._render_select_tail(dsl, select_vars, construct=construct, params=params))
+        return "\n".join(part for part in query_parts if part)
 
-        # 聚合查询通常按 GROUP BY 字段或聚合结果排序；为避免无效的 ?s 排序导致 400，
-        # 当存在聚合时仅在 DSL 显式给出 sort 时再渲染 ORDER BY，并且不追加稳定排序 ?s。
-        order_clause = ""
-        if not construct and not getattr(dsl, "aggregations", None):
-            order_clause = self._render_order_clause(dsl, select_vars)
-        elif not construct and getattr(dsl, "aggregations", None) and dsl.sort:
-            order_spec = dsl.sort or {}
-            order_field = str(order_spec.get("by", "")).strip()
-            if order_field:
-                if not order_field.startswith("?"):
-                    order_field = f"?{order_field}"
-                direction = (order_spec.get("order", "asc") or "asc").lower()
-                func = "DESC" if direction == "desc" else "ASC"
-                order_clause = f"ORDER BY {func}({order_field})"
-        if order_clause:
-            query_parts.append(order_clause)
-        # GROUP BY / HAVING（仅当存在聚合定义时生成）
-        if not construct and hasattr(dsl, "group_by") and dsl.group_by:
-            query_parts.append(self._build_group_by_clause(dsl.group_by))
-        if not construct and hasattr(dsl, "having") and dsl.having:
-            query_parts.append(self._build_having_clause(dsl.having))
-
-        query_parts.append(self._render_limit_clause(dsl))
-        offset_clause = self._render_offset_clause(dsl)
-        if offset_clause:
-            query_parts.append(offset_clause)
+    def _render_select_tail(
+        self,
+        dsl: QueryDSL,
+        select_vars: list[str],
+        *,
+        construct: bool,
+        params: list[str] | None = None,
+    ) -> str:
+        """一次性渲染 WHERE 之后的结果修饰子句（solution modifiers）。
 
-        return "\n".join(part for part in query_parts if part)
+        按 SPARQL 语法顺序输出 GROUP BY、HAVING、ORDER BY、LIMIT、OFFSET，缺省子句跳过，
+        只做一次拼接。CONSTRUCT 仅渲染 LIMIT/OFFSET。
+
+        参数:
+            dsl: QueryDSL，提供分组、HAVING、排序与分页定义。
+            select_vars: SELECT 头部变量，用于校验非聚合查询的排序字段。
+            construct: 是否为 CONSTRUCT 查询。
+            params: 预编译模板的参数收集列表，语义同 ``_build_query``。
+
+        返回:
+            以换行分隔的子句文本；全部缺省时为空串。
+        """
+
+        clauses: list[str] = []
+        if not construct:
+            # GROUP BY / HAVING（仅当存在聚合定义时生成）
+            if dsl.group_by:
+                clauses.append(self._build_group_by_clause(dsl.group_by))
+            if dsl.having:
+                clauses.append(self._build_having_clause(dsl.having))
+            # 聚合查询通常按 GROUP BY 字段或聚合结果排序；为避免无效的 ?s 排序导致 400，
+            # 当存在聚合时仅在 DSL 显式给出 sort 时再渲染 ORDER BY，并且不追加稳定排序 ?s。
+            if not dsl.aggregations:
+                clauses.append(self._render_order_clause(dsl, select_vars))
+            elif dsl.sort:
+                order_field = str(dsl.sort.get("by", "")).strip()
+                if order_field:
+                    if not order_field.startswith("?"):
+                        order_field = f"?{order_field}"
+                    direction = (dsl.sort.get("order", "asc") or "asc").lower()
+                    func = "DESC" if direction == "desc" else "ASC"
+                    clauses.append(f"ORDER BY {func}({order_field})")
+        clauses.append(self._render_limit_clause(dsl, params=params))
+        clauses.append(self._render_offset_clause(dsl, params=params))
+        return "\n".join(clause for clause in clauses if clause)
 
     # -------------------- 聚合 / HAVING 支持 --------------------
 
@@ -459,6 +579,8 @@ class SPARQLQueryBuilder:
         filter_item: Filter,
         var_name: str,
         prefixes: dict[str, str],
+        *,
+        params: list[str] | None = None,
     ) -> tuple[list[str], list[str]]:
         """
         根据单个过滤条件生成三元组与 FILTER 片段。
@@ -467,6 +589,7 @@ class SPARQLQueryBuilder:
             filter_item: Filter，例如 Filter(field="sf:name", op="=", value="Alice")。
             var_name: 变量名字符串，例如 "?f0"，需要以问号开头。
             prefixes: 前缀映射，例如 {"sf": "http://semanticforge.ai/ontologies/core#"}。
+            params: 预编译模板的参数收集列表，语义同 ``_build_query``。
 
         返回:
             (三元组列表, FILTER 列表) 的二元组，用于拼接 WHERE 体。
@@ -487,41 +610,76 @@ class SPARQLQueryBuilder:
 
         # 其他操作符需要确保三元组被显式匹配
         triple_lines = [f"?s {predicate} {var_name} ."]
+        values = [
+            None if value is None else self._bind_param(value, params)
+            for value in self._filter_values(filter_item, prefixes)
+        ]
         if filter_item.op == "=":
-            value = self._format_value(filter_item.value, prefixes)
-            filter_lines.append(f"FILTER({var_name} = {value})")
+            filter_lines.append(f"FILTER({var_name} = {values[0]})")
         elif filter_item.op == "!=":
-            value = self._format_value(filter_item.value, prefixes)
-            filter_lines.append(f"FILTER({var_name} != {value})")
+            filter_lines.append(f"FILTER({var_name} != {values[0]})")
         elif filter_item.op == "in":
-            values = [
-                self._format_value(v, prefixes)
-                for v in self._to_iterable(filter_item.value)
-            ]
-            filter_lines.append(f"FILTER({var_name} IN ({', '.join(values)}))")
+            in_list, values_block = values
+            if in_list is not None:
+                filter_lines.append(f"FILTER({var_name} IN ({in_list}))")
+            else:
+                filter_lines.append(f"VALUES {var_name} {{ {values_block} }}")
         elif filter_item.op == "range":
-            lower, upper = self._split_range(filter_item.value)
+            lower, upper = values
             if lower is not None:
-                filter_lines.append(
-                    f"FILTER({var_name} >= {self._format_value(lower, prefixes)})"
-                )
+                filter_lines.append(f"FILTER({var_name} >= {lower})")
             if upper is not None:
-                filter_lines.append(
-                    f"FILTER({var_name} <= {self._format_value(upper, prefixes)})"
-                )
+                filter_lines.append(f"FILTER({var_name} <= {upper})")
         elif filter_item.op == "contains":
-            value = self._escape_string(str(filter_item.value))
             filter_lines.append(
-                f"FILTER(CONTAINS(LCASE(STR({var_name})), LCASE(\"{value}\")))"
+                f"FILTER(CONTAINS(LCASE(STR({var_name})), LCASE(\"{values[0]}\")))"
             )
         elif filter_item.op == "regex":
-            pattern = self._escape_string(str(filter_item.value))
-            filter_lines.append(f"FILTER(REGEX(STR({var_name}), \"{pattern}\", \"i\"))")
-        else:
-            raise ValueError(f"暂不支持的过滤操作符: {filter_item.op}")
+            filter_lines.append(f"FILTER(REGEX(STR({var_name}), \"{values[0]}\", \"i\"))")
 
         return triple_lines, filter_lines
 
+    def _filter_values(self, filter_item: Filter, prefixes: dict[str, str]) -> tuple[str | None, ...]:
+        """
+        渲染过滤条件中的取值部分，供 ``_render_filter`` 与预编译模板的参数填充共用。
+
+        参数:
+            filter_item: Filter，例如 Filter(field="ex:score", op="range", value=[1, 10])。
+            prefixes: 前缀映射，供 CURIE 校验使用。
+
+        返回:
+            已转义的取值元组：``=``/``!=``/``contains``/``regex`` 为单元素；``range`` 固定为
+            ``(下限, 上限)``，缺失端为 None；``in`` 固定为 ``(IN 列表, VALUES 列表)``，按去重后的
+            取值数量二选一、另一端为 None；``exists``/``isNull`` 为空元组。
+        """
+
+        op = filter_item.op
+        if op in {"exists", "isNull"}:
+            return ()
+        if op in {"=", "!="}:
+            return (self._format_value(filter_item.value, prefixes),)
+        if op == "in":
+            # 按渲染结果去重：既缩短查询，也避免 True/1 等相等但渲染不同的值被误合并
+            raw_values = list(self._to_iterable(filter_item.value))
+            rendered = list(dict.fromkeys(self._format_value(v, prefixes) for v in raw_values))
+            if len(rendered) > self._IN_VALUES_THRESHOLD and all(isinstance(v, str) for v in raw_values):
+                return None, " ".join(rendered)
+            return ", ".join(rendered), None
+        if op == "range":
+            lower, upper = self._split_range(filter_item.value)
+            return tuple(None if bound is None else self._format_value(bound, prefixes) for bound in (lower, upper))
+        if op in {"contains", "regex"}:
+            return (self._escape_string(str(filter_item.value)),)
+        raise ValueError(f"暂不支持的过滤操作符: {op}")
+
+    def _bind_param(self, rendered: str, params: list[str] | None) -> str:
+        """预编译模式下记录参数并返回占位符；否则直接返回渲染结果。"""
+
+        if params is None:
+            return rendered
+        params.append(rendered)
+        return self._PARAM_SLOT
+
     def _render_expand(
         self,
         expand: Sequence[str],
@@ -596,12 +754,13 @@ class SPARQLQueryBuilder:
         predicate = self._expand_term(self._TIME_PREDICATE, prefixes)
         return f"OPTIONAL {{ ?s {predicate} ?__time . }}"
 
-    def _render_time_filters(self, time_window: TimeWindow | None) -> list[str]:
+    def _render_time_filters(self, time_window: TimeWindow | None, *, params: list[str] | None = None) -> list[str]:
         """
         根据时间窗口生成 FILTER 条件。
 
         参数:
             time_window: TimeWindow，例如 TimeWindow(gte=datetime(2024, 1, 1))。
+            params: 预编译模板的参数收集列表，语义同 ``_build_query``。
 
         返回:
             由字符串组成的列表，每个元素都是 FILTER 片段。
@@ -609,25 +768,26 @@ class SPARQLQueryBuilder:
 
         filters: list[str] = []
         if time_window and time_window.gte:
-            filters.append(self._datetime_filter(">=", time_window.gte))
+            filters.append(self._datetime_filter(">=", time_window.gte, params))
         if time_window and time_window.lte:
-            filters.append(self._datetime_filter("<=", time_window.lte))
+            filters.append(self._datetime_filter("<=", time_window.lte, params))
         return filters
 
-    def _datetime_filter(self, op: str, value: datetime) -> str:
+    def _datetime_filter(self, op: str, value: datetime, params: list[str] | None = None) -> str:
         """
         构造时间比较的 FILTER 子句。
 
         参数:
             op: 比较操作符字符串，例如 ">=","<="。
             value: datetime，例如 datetime(2024, 1, 1, 0, 0, 0)。
+            params: 预编译模板的参数收集列表，语义同 ``_build_query``。
 
         返回:
             表示时间过滤的字符串，例如
             "FILTER(?__time >= \"2024-01-01T00:00:00Z\"^^xsd:dateTime)"。
         """
 
-        literal = self._format_datetime(value)
+        literal = self._bind_param(self._format_datetime(value), params)
         return f"FILTER(?__time {op} {literal})"
 
     def _render_order_clause(self, dsl: QueryDSL, select_vars: list[str]) -> str:
@@ -653,26 +813,28 @@ class SPARQLQueryBuilder:
         # 追加 ?s 作为稳定排序的次级键，避免排序结果非确定
         return f"ORDER BY {func}({order_field}) ?s"
 
-    def _render_limit_clause(self, dsl: QueryDSL) -> str:
+    def _render_limit_clause(self, dsl: QueryDSL, *, params: list[str] | None = None) -> str:
         """
         依据分页信息生成 LIMIT 子句。
 
         参数:
             dsl: QueryDSL，其中 page.size 范围通常在 1~1000，示例 100。
+            params: 预编译模板的参数收集列表，语义同 ``_build_query``。
 
         返回:
             LIMIT 字符串，例如 "LIMIT 100"。
         """
 
         size = max(1, dsl.page.size)
-        return f"LIMIT {size}"
+        return f"LIMIT {self._bind_param(str(size), params)}"
 
-    def _render_offset_clause(self, dsl: QueryDSL) -> str:
+    def _render_offset_clause(self, dsl: QueryDSL, *, params: list[str] | None = None) -> str:
         """
         依据分页信息生成 OFFSET 子句。
 
         参数:
             dsl: QueryDSL，其中 page.offset 示例 200；传入 None 或 0 表示不偏移。
+            params: 预编译模板的参数收集列表，语义同 ``_build_query``。
 
         返回:
             OFFSET 字符串或空字符串。
@@ -681,7 +843,7 @@ class SPARQLQueryBuilder:
         offset = dsl.page.offset or 0
         if offset <= 0:
             return ""
-        return f"OFFSET {offset}"
+        return f"OFFSET {self._bind_param(str(offset), params)}"
 
     def _wrap_graph(self, where_lines: Iterable[str], graph: str | None) -> str:
         """
@@ -11,6 +11,13 @@ import base64
 import json
 
 
+# 游标载荷为 ``type<US>value`` 的 UTF-8 字节，固定两段无需 JSON 编解码
+_CURSOR_SEP = b"\x1f"
+# 按值类型选择的游标 FILTER 模板；IRI 使用 STR() 比较（保持词法序），字面量直接比较
+_CURSOR_FILTERS = {"uri": 'FILTER(STR({key}) > "{value}")'}
+_LITERAL_CURSOR_FILTER = 'FILTER({key} > "{value}")'
+
+
 @dataclass(frozen=True, slots=True)
 class CursorPage:
     """游标分页参数。
@@ -24,6 +31,32 @@ class CursorPage:
     size: int = 100
 
 
+@dataclass(frozen=True, slots=True)
+class CursorQueryTemplate:
+    """预先构建的游标分页查询模板。
+
+    查询文本中只有游标 FILTER 随页变化，其余部分按 ``prefix``/``suffix`` 缓存，
+    翻页时仅需字符串拼接，无需重新遍历 DSL。
+
+    参数:
+        prefix (str): 游标 FILTER 之前的查询文本。
+        suffix (str): 游标 FILTER 之后的查询文本（以换行开头）。
+        sort_key (str): 游标比较使用的变量名，例如 "?s"。
+    """
+
+    prefix: str
+    suffix: str
+    sort_key: str = "?s"
+
+    def render(self, cursor: str | None) -> str:
+        """根据游标渲染完整查询；``cursor`` 为 None 时表示第一页。"""
+
+        if not cursor:
+            return self.prefix + self.suffix
+        cursor_filter = CursorPagination.build_cursor_filter(CursorPagination.decode_cursor(cursor), self.sort_key)
+        return f"{self.prefix}\n  {cursor_filter}{self.suffix}"
+
+
 @dataclass
 class PageResult:
     """分页结果载体。
@@ -60,17 +93,25 @@ class CursorPagination:
         if key not in last_item:
             raise ValueError(f"Sort key {sort_key} not in item")
         cell = last_item[key]
-        cursor_data = {"value": cell.get("value"), "type": cell.get("type", "uri")}
-        json_str = json.dumps(cursor_data, sort_keys=True, ensure_ascii=False)
-        return base64.urlsafe_b64encode(json_str.encode("utf-8")).decode("utf-8")
+        value_type = cell.get("type") or "uri"
+        value = cell.get("value")
+        if value is None:
+            # 字节载荷无法区分 None 与空串，缺值时沿用 JSON 载荷以便原样解码
+            payload = json.dumps({"value": None, "type": value_type}).encode("utf-8")
+        else:
+            payload = value_type.encode("utf-8") + _CURSOR_SEP + str(value).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
 
     @staticmethod
     def decode_cursor(cursor: str) -> dict[str, Any]:
-        """解析 Base64 游标为原始数据结构。"""
+        """解析 Base64 游标为原始数据结构；兼容旧版 JSON 载荷的游标。"""
 
         try:
-            json_str = base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
-            return json.loads(json_str)
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            if payload.startswith(b"{"):
+                return json.loads(payload)
+            value_type, value = payload.split(_CURSOR_SEP, 1)
+            return {"type": value_type.decode("utf-8"), "value": value.decode("utf-8")}
         except Exception as e:  # pragma: no cover - 防御性
             raise ValueError(f"Invalid cursor: {e}")
 
@@ -86,11 +127,6 @@ class CursorPagination:
             str: 可直接拼接到 WHERE 的 FILTER 片段。
         """
 
-        value = cursor_data["value"]
-        value_type = cursor_data.get("type", "uri")
-        if value_type == "uri":
-            # 对 IRI 使用 STR() 比较（保持词法序）
-            return f'FILTER(STR({sort_key}) > "{value}")'
-        # 对字面量直接比较
-        return f'FILTER({sort_key} > "{value}")'
+        template = _CURSOR_FILTERS.get(cursor_data.get("type", "uri"), _LITERAL_CURSOR_FILTER)
+        return template.format(key=sort_key, value=cursor_data["value"])
 
@@ -2,8 +2,11 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import functools
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Optional
 
@@ -12,14 +15,36 @@ from sqlalchemy.engine import Engine
 
 
 class AuditLogger:
-    """封装 PostgreSQL 写入逻辑的审计记录器。"""
+    """封装 PostgreSQL 写入逻辑的审计记录器。
 
-    def __init__(self, dsn: str, schema: str, *, engine: Optional[Engine] = None, logger: Optional[logging.Logger] = None) -> None:
-        """初始化审计记录器，允许注入 Engine 便于测试。"""
+    request_log 通过异步接口写入时先进入内存队列，由绑定在当前事件循环上的后台任务按批合并为
+    一次事务提交；事件循环切换时自动在新循环上重建写入任务，并转移旧队列中尚未写入的记录。
+    调用方在退出前应 ``await aclose()``（``TransactionManager.aclose`` 会代为调用）以落盘剩余记录
+    并释放线程池；关闭后再次写入会按需重新启动。阻塞的数据库调用统一在专用线程池中执行，
+    不占用事件循环，也不与默认执行器上的其他任务争抢线程。
+    """
+
+    _MAX_WORKERS = 4
+
+    def __init__(
+        self,
+        dsn: str,
+        schema: str,
+        *,
+        engine: Optional[Engine] = None,
+        logger: Optional[logging.Logger] = None,
+        batch_size: int = 100,
+    ) -> None:
+        """初始化审计记录器，允许注入 Engine 便于测试；``batch_size`` 为单次批量写入的最大行数。"""
 
         self._engine = engine or create_engine(dsn, future=True, pool_pre_ping=True)
         self._schema = schema
         self._logger = logger or logging.getLogger(__name__)
+        self._batch_size = max(1, int(batch_size))
+        self._request_queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._request_writer: asyncio.Task[None] | None = None
+        self._request_loop: asyncio.AbstractEventLoop | None = None
+        self._executor: ThreadPoolExecutor | None = None
 
     async def log_operation_async(
         self,
@@ -37,7 +62,7 @@ class AuditLogger:
     ) -> str | None:
         """异步写入 rdf_operation_audit，返回记录 ID。"""
 
-        return await asyncio.to_thread(
+        return await self._run_blocking(
             self.log_operation,
             op_type=op_type,
             graph_iri=graph_iri,
@@ -115,10 +140,9 @@ class AuditLogger:
         user_id: str | None = None,
         occurred_at: datetime | None = None,
     ) -> None:
-        """异步写入 request_log。"""
+        """异步写入 request_log：记录入队后立即返回，由后台任务批量提交。"""
 
-        await asyncio.to_thread(
-            self.log_request,
+        row = self._request_row(
             trace_id=trace_id,
             route=route,
             method=method,
@@ -129,6 +153,7 @@ class AuditLogger:
             user_id=user_id,
             occurred_at=occurred_at,
         )
+        self._ensure_request_writer().put_nowait(row)
 
     def log_request(
         self,
@@ -145,6 +170,142 @@ class AuditLogger:
     ) -> None:
         """同步写入 request_log。失败时仅记录告警，不影响主流程。"""
 
+        row = self._request_row(
+            trace_id=trace_id,
+            route=route,
+            method=method,
+            status_code=status_code,
+            duration_ms=duration_ms,
+            params_hash=params_hash,
+            client_ip=client_ip,
+            user_id=user_id,
+            occurred_at=occurred_at,
+        )
+        self._write_request_rows([row])
+
+    async def aclose(self) -> None:
+        """等待队列中的 request_log 全部落盘并停止后台写入任务。"""
+
+        writer, queue, loop = self._request_writer, self._request_queue, self._request_loop
+        self._request_writer = None
+        self._request_queue = None
+        self._request_loop = None
+        if writer is not None and queue is not None:
+            if loop is asyncio.get_running_loop() and not writer.done():
+                await queue.join()
+                writer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await writer
+            else:
+                # 写入任务已退出或属于其他事件循环：剩余记录直接在当前循环写入
+                self._detach_writer(writer, loop)
+                rows = self._take_pending(queue)
+                if rows:
+                    await self._run_blocking(self._write_request_rows, rows=rows)
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    # ---- 内部工具 -----------------------------------------------------
+
+    async def _run_blocking(self, func: Any, /, **kwargs: Any) -> Any:
+        """在审计专用线程池中执行阻塞的数据库写入。"""
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._MAX_WORKERS, thread_name_prefix="sf-audit")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, **kwargs))
+
+    def _ensure_request_writer(self) -> asyncio.Queue[dict[str, Any]]:
+        """返回当前事件循环上的写入队列，必要时启动后台写入任务。
+
+        事件循环切换（或旧任务已退出）时在当前循环上重建队列与写入任务，并把旧队列中
+        尚未写入的记录转入新队列，避免记录滞留在已失效的循环上。
+        """
+
+        loop = asyncio.get_running_loop()
+        writer = self._request_writer
+        if self._request_queue is not None and writer is not None and self._request_loop is loop and not writer.done():
+            return self._request_queue
+        stale = self._request_queue
+        if writer is not None:
+            self._detach_writer(writer, self._request_loop)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        if stale is not None:
+            for row in self._take_pending(stale):
+                queue.put_nowait(row)
+        self._request_queue = queue
+        self._request_loop = loop
+        self._request_writer = loop.create_task(self._drain_requests(queue))
+        return queue
+
+    @staticmethod
+    def _detach_writer(writer: asyncio.Task[None], loop: asyncio.AbstractEventLoop | None) -> None:
+        """停止不再使用的写入任务；其所属循环已关闭时无需（也无法）取消。"""
+
+        if writer.done() or loop is None or loop.is_closed():
+            return
+        if loop is asyncio.get_running_loop():
+            writer.cancel()
+        else:
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(writer.cancel)
+
+    @staticmethod
+    def _take_pending(queue: asyncio.Queue[dict[str, Any]]) -> list[dict[str, Any]]:
+        """取出队列中尚未被写入任务领取的全部记录。"""
+
+        rows: list[dict[str, Any]] = []
+        while not queue.empty():
+            rows.append(queue.get_nowait())
+        return rows
+
+    async def _drain_requests(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        """后台任务：每次取出至多 ``batch_size`` 行，合并为一次事务写入。"""
+
+        while True:
+            rows = [await queue.get()]
+            while len(rows) < self._batch_size and not queue.empty():
+                rows.append(queue.get_nowait())
+            try:
+                await self._run_blocking(self._write_request_rows, rows=rows)
+            finally:
+                for _ in rows:
+                    queue.task_done()
+
+    @staticmethod
+    def _request_row(
+        *,
+        trace_id: str,
+        route: str,
+        method: str,
+        status_code: int,
+        duration_ms: float,
+        params_hash: str,
+        client_ip: str | None,
+        user_id: str | None,
+        occurred_at: datetime | None,
+    ) -> dict[str, Any]:
+        """构造 request_log 单行参数；created_at 在调用时确定，不受排队延迟影响。"""
+
+        return {
+            "trace_id": trace_id,
+            "route": route,
+            "method": method,
+            "status_code": status_code,
+            "duration_ms": int(duration_ms),
+            "client_ip": client_ip,
+            "user_id": user_id,
+            "params_hash": params_hash,
+            "created_at": occurred_at or datetime.utcnow(),
+        }
+
+    def _write_request_rows(self, rows: list[dict[str, Any]]) -> None:
+        """在同一事务中写入多行 request_log。失败时仅记录告警，不影响主流程。"""
+
+        # 同一批次内 trace_id 重复时只保留最后一条，与 ON CONFLICT 覆盖语义一致，
+        # 也避免多行 VALUES 在同一语句内重复命中冲突
+        unique_rows = list({row["trace_id"]: row for row in rows}.values())
         try:
             sql = text(
                 f"""
@@ -164,19 +325,6 @@ class AuditLogger:
                 """
             )
             with self._engine.begin() as conn:
-                conn.execute(
-                    sql,
-                    {
-                        "trace_id": trace_id,
-                        "route": route,
-                        "method": method,
-                        "status_code": status_code,
-                        "duration_ms": int(duration_ms),
-                        "client_ip": client_ip,
-                        "user_id": user_id,
-                        "params_hash": params_hash,
-                        "created_at": occurred_at or datetime.utcnow(),
-                    },
-                )
+                conn.execute(sql, unique_rows[0] if len(unique_rows) == 1 else unique_rows)
         except Exception as exc:  # noqa: BLE001
             self._logger.warning("写入 request_log 失败: %s", exc, exc_info=True)
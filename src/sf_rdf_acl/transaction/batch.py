@@ -2,8 +2,8 @@
 
 本模块面向高吞吐写入场景，提供以下能力：
 - 使用 `BatchTemplate` 承载 SPARQL 片段模板与多组变量绑定；
-- `BatchOperator.apply_template(...)` 将模板渲染为 INSERT DATA，并分批提交；
-- 在批次失败时，自动对每条绑定进行单条重试，最大重试次数可配置；
+- `BatchOperator.apply_template(...)` 将模板渲染为 INSERT DATA，并分批并发提交（并发度可配置）；
+- 在批次失败时，自动对每条绑定并发地进行单条重试，最大重试次数可配置；
 - 返回 `BatchResult` 汇总结果，包含总量/成功/失败/失败项/耗时等信息。
 
 注意：模板字符串中变量形式为 `{?s}`、`{?o}`，绑定中键名需与之完全一致，例如：
@@ -19,14 +19,40 @@
 from __future__ import annotations
 
 import asyncio
+import re
 from dataclasses import dataclass
-from typing import Any, List
+from functools import lru_cache
+from typing import Any
 
 from common.logging import LoggerFactory
 
 from ..connection.client import RDFClient
 
 
+# 模板变量占位符：`{?s}`、`{?o}` 等；切分时保留分组，奇数下标即为占位符
+_PLACEHOLDER_PATTERN = re.compile(r"(\{\?[^{}\s]+\})")
+
+# 预切分的模板片段：(文本, 绑定键)；字面量片段的绑定键为 None，占位符片段的文本为原始占位符
+_Segments = tuple[tuple[str, str | None], ...]
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> _Segments:
+    """将模板切分为字面量与占位符片段；同一模板跨批次、跨调用复用切分结果。"""
+
+    return tuple(
+        (text, text[1:-1] if index % 2 else None)
+        for index, text in enumerate(_PLACEHOLDER_PATTERN.split(pattern))
+        if text
+    )
+
+
+def _render_binding(segments: _Segments, binding: dict[str, str]) -> str:
+    """按预切分片段渲染单条绑定；未绑定的占位符原样保留。"""
+
+    return "".join(text if key is None else binding.get(key, text) for text, key in segments)
+
+
 @dataclass
 class BatchTemplate:
     """批处理模板定义。
@@ -55,21 +81,30 @@ class BatchResult:
 class BatchOperator:
     """批处理执行器。
 
-    通过分批 INSERT DATA 提交，失败时逐条重试，兼顾吞吐与稳定性。
+    通过分批 INSERT DATA 提交，批次之间相互独立并发执行，失败时逐条重试，兼顾吞吐与稳定性。
+    批次提交与单条重试共用同一并发上限：每次请求单独占用槽位，退避等待期间不占用。
     """
 
-    def __init__(self, client: RDFClient, batch_size: int = 1000, max_retries: int = 3) -> None:
+    def __init__(
+        self,
+        client: RDFClient,
+        batch_size: int = 1000,
+        max_retries: int = 3,
+        max_concurrency: int = 4,
+    ) -> None:
         """初始化执行器。
 
         参数:
             client (RDFClient): RDF 客户端，通常为 `FusekiClient` 实例。
             batch_size (int): 每个批次写入的绑定条数；建议 100~2000。
             max_retries (int): 单条失败的最大重试次数（指数退避）。
+            max_concurrency (int): 同时在途的批次数上限，用于控制对 Fuseki 的并发压力。
         """
 
         self._client = client
         self._batch_size = max(1, int(batch_size))
         self._max_retries = max(0, int(max_retries))
+        self._max_concurrency = max(1, int(max_concurrency))
         self._logger = LoggerFactory.create_default_logger(__name__)
 
     async def apply_template(
@@ -97,63 +132,113 @@ class BatchOperator:
         start = time.perf_counter()
         total = len(template.bindings)
         success = 0
-        failed = 0
         failed_items: list[dict[str, Any]] = []
 
-        # 分批执行
-        for i in range(0, total, self._batch_size):
-            batch = template.bindings[i : i + self._batch_size]
-            try:
-                if not dry_run and batch:
-                    await self._execute_batch(template.pattern, batch, graph_iri, trace_id)
-                success += len(batch)
-            except Exception as exc:  # 批次失败，逐条重试
-                self._logger.error("Batch %s failed: %s", i // self._batch_size, exc)
-                for binding in batch:
-                    ok = await self._retry_single(template.pattern, binding, graph_iri, trace_id)
-                    if ok:
-                        success += 1
-                    else:
-                        failed += 1
-                        failed_items.append(binding)
+        # 模板只切分一次，各批次与单条重试共享
+        segments = _compile_pattern(template.pattern)
+        # 批次之间互不依赖，使用信号量限制并发后同时提交
+        batches = [template.bindings[i : i + self._batch_size] for i in range(0, total, self._batch_size)]
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        outcomes = await asyncio.gather(
+            *(
+                self._apply_batch(index, segments, batch, graph_iri, trace_id, dry_run, semaphore)
+                for index, batch in enumerate(batches)
+            )
+        )
+        for batch_success, batch_failed in outcomes:
+            success += batch_success
+            failed_items.extend(batch_failed)
 
         duration_ms = (time.perf_counter() - start) * 1000.0
-        return BatchResult(total=total, success=success, failed=failed, failed_items=failed_items, duration_ms=duration_ms)
+        return BatchResult(
+            total=total,
+            success=success,
+            failed=len(failed_items),
+            failed_items=failed_items,
+            duration_ms=duration_ms,
+        )
+
+    async def _apply_batch(
+        self,
+        index: int,
+        segments: _Segments,
+        batch: list[dict[str, str]],
+        graph_iri: str,
+        trace_id: str,
+        dry_run: bool,
+        semaphore: asyncio.Semaphore,
+    ) -> tuple[int, list[dict[str, Any]]]:
+        """提交单个批次，失败时对批内绑定并发地逐条重试。
 
-    async def _execute_batch(self, pattern: str, bindings: list[dict[str, str]], graph_iri: str, trace_id: str) -> None:
+        参数:
+            index (int): 批次序号，用于日志定位。
+            segments (_Segments): 预切分的模板片段。
+            batch (list[dict[str, str]]): 本批次的变量绑定。
+            graph_iri (str): 目标命名图 IRI。
+            trace_id (str): 追踪 ID。
+            dry_run (bool): 为 True 时不发起更新。
+            semaphore (asyncio.Semaphore): 限制在途请求数的共享信号量。
+
+        返回:
+            tuple[int, list[dict[str, Any]]]: 成功条数与最终失败的绑定列表（保持原顺序）。
+        """
+
+        try:
+            if not dry_run and batch:
+                async with semaphore:
+                    await self._execute_batch(segments, batch, graph_iri, trace_id)
+            return len(batch), []
+        except Exception as exc:  # 批次失败，逐条重试
+            self._logger.error("Batch %s failed: %s", index, exc)
+        outcomes = await asyncio.gather(
+            *(self._retry_single(segments, binding, graph_iri, trace_id, semaphore) for binding in batch)
+        )
+        failed_items = [binding for binding, ok in zip(batch, outcomes) if not ok]
+        return len(batch) - len(failed_items), failed_items
+
+    async def _execute_batch(
+        self,
+        segments: _Segments,
+        bindings: list[dict[str, str]],
+        graph_iri: str,
+        trace_id: str,
+    ) -> None:
         """执行单个批次 INSERT DATA。
 
         参数:
-            pattern (str): 模板字符串。
+            segments (_Segments): 预切分的模板片段。
             bindings (list[dict[str, str]]): 变量绑定列表。
             graph_iri (str): 目标命名图 IRI。
             trace_id (str): 追踪 ID。
         """
 
-        triple_snippets: List[str] = []
-        for binding in bindings:
-            stmt = pattern
-            for var, value in binding.items():
-                stmt = stmt.replace(f"{{{var}}}", value)
-            triple_snippets.append(stmt)
-
-        update_query = (
-            "INSERT DATA {\n"
-            f"  GRAPH <{graph_iri}> {{\n"
-            f"    {' '.join(triple_snippets)}\n"
-            "  }\n"
-            "}"
-        )
+        # 所有片段收集后一次性拼接，避免逐条累加字符串
+        parts: list[str] = ["INSERT DATA {\n  GRAPH <", graph_iri, "> {\n    "]
+        for position, binding in enumerate(bindings):
+            if position:
+                parts.append(" ")
+            parts.append(_render_binding(segments, binding))
+        parts.append("\n  }\n}")
+        update_query = "".join(parts)
         await self._client.update(update_query, trace_id=trace_id)
 
-    async def _retry_single(self, pattern: str, binding: dict[str, str], graph_iri: str, trace_id: str) -> bool:
+    async def _retry_single(
+        self,
+        segments: _Segments,
+        binding: dict[str, str],
+        graph_iri: str,
+        trace_id: str,
+        semaphore: asyncio.Semaphore,
+    ) -> bool:
         """在批次失败时，针对单个绑定进行重试。
 
         参数:
-            pattern (str): 模板字符串。
+            segments (_Segments): 预切分的模板片段。
             binding (dict[str,str]): 单条变量绑定。
             graph_iri (str): 目标命名图 IRI。
             trace_id (str): 追踪 ID。
+            semaphore (asyncio.Semaphore): 限制在途请求数的共享信号量，仅在请求期间占用。
 
         返回:
             bool: 是否最终写入成功。
@@ -161,7 +246,8 @@ class BatchOperator:
 
         for attempt in range(self._max_retries):
             try:
-                await self._execute_batch(pattern, [binding], graph_iri, trace_id)
+                async with semaphore:
+                    await self._execute_batch(segments, [binding], graph_iri, trace_id)
                 return True
             except Exception as exc:
                 if attempt == self._max_retries - 1:
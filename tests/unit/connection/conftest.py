@@ -0,0 +1,24 @@
+"""connection 模块单元测试共用 fixture。"""
+from __future__ import annotations
+
+from typing import Callable
+
+import httpx
+import pytest
+
+
+@pytest.fixture(scope="session")
+def stub_request() -> httpx.Request:
+    """所有桩响应共享同一个请求对象，避免逐个解析 URL 与构建头部。"""
+
+    return httpx.Request("POST", "http://fuseki")
+
+
+@pytest.fixture(scope="session")
+def make_response(stub_request: httpx.Request) -> Callable[..., httpx.Response]:
+    """在用例装配阶段预构造桩响应；默认响应体为预先编码的空结果集 SPARQL JSON，跳过文本编码。"""
+
+    def _make(status: int = 200, body: str | bytes = b'{"head": {"vars": []}, "results": {"bindings": []}}') -> httpx.Response:
+        return httpx.Response(status, content=body, request=stub_request)
+
+    return _make
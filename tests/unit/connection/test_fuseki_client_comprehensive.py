@@ -3,7 +3,7 @@ from __future__ import annotations
 """FusekiClient 综合单元测试（以 mock/monkeypatch 方式验证关键路径）。
 
 覆盖点：
-- 熔断器开启/恢复
+- 熔断器恢复（开启路径见 test_fuseki_client_resilience.py）
 - 超时重试
 - trace_id 透传
 - 指标记录（observe_fuseki_response 调用）
@@ -12,17 +12,15 @@ from __future__ import annotations
 - 本文件以 mock 为主；端到端覆盖在其它 e2e 用例中已验证（真实 Fuseki）。
 """
 
-import asyncio
-from collections import deque
+from typing import Callable
 
 import httpx
 import pytest
 
-from common.exceptions import ErrorCode, ExternalServiceError
 from sf_rdf_acl.connection.client import FusekiClient
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def client() -> FusekiClient:
     return FusekiClient(
         endpoint="http://fuseki",
@@ -32,58 +30,53 @@ def client() -> FusekiClient:
     )
 
 
+@pytest.fixture(autouse=True)
+def _reset_client(client: FusekiClient) -> None:
+    """每个用例开始前复位共享客户端的熔断状态。"""
+
+    client._cb_failure_count = 0
+    client._cb_open_until = None
+
+
 class _StubAsyncClient:
-    """httpx.AsyncClient 的桩，用队列模拟状态码或异常。"""
+    """httpx.AsyncClient 的桩，按顺序返回预构造的响应或抛出异常。"""
 
-    def __init__(self, responses: deque | None = None, exc: Exception | None = None) -> None:
-        self._responses = responses or deque()
+    def __init__(self, responses: tuple[httpx.Response, ...] = (), exc: Exception | None = None) -> None:
+        self._it = iter(responses)
         self._exc = exc
         self.last_headers: dict[str, str] | None = None
 
-    async def __aenter__(self) -> "_StubAsyncClient":
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb) -> None:
-        return None
-
-    async def post(self, url: str, *, content: bytes, headers: dict[str, str], auth: httpx.Auth | None) -> httpx.Response:
+    async def post(
+        self,
+        url: str,
+        *,
+        content: bytes,
+        headers: dict[str, str],
+        timeout: httpx.Timeout | None = None,
+    ) -> httpx.Response:
         self.last_headers = headers
         if self._exc is not None:
             raise self._exc
-        if not self._responses:
-            raise AssertionError("no stub response configured")
-        status, text = self._responses.popleft()
-        request = httpx.Request("POST", url)
-        return httpx.Response(status, text=text, request=request)
-
-
-@pytest.mark.asyncio
-async def test_circuit_breaker_opens(client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
-    """连续失败达到阈值后，后续请求应直接返回熔断异常。"""
-
-    queue = deque([(503, "err")] * 5)
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *a, **k: _StubAsyncClient(queue))
-
-    with pytest.raises(ExternalServiceError) as exc:
-        await client.select("SELECT * WHERE {?s ?p ?o}")
-    assert exc.value.code == ErrorCode.FUSEKI_QUERY_ERROR
-
-    with pytest.raises(ExternalServiceError) as exc2:
-        await client.select("SELECT * WHERE {?s ?p ?o}")
-    assert exc2.value.code == ErrorCode.FUSEKI_CIRCUIT_OPEN
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise AssertionError("no stub response configured") from None
 
 
 @pytest.mark.asyncio
-async def test_circuit_breaker_recovery(client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_circuit_breaker_recovery(
+    client: FusekiClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     """熔断窗口后，允许请求并在成功后复位。"""
 
-    # 先让其进入 open 状态
+    # 熔断器处于 open 状态且恢复窗口已过期，无需真实等待
     client._cb_failure_count = 3
-    client._cb_open_until = client._now() + 0.01
-    await asyncio.sleep(0.02)
+    client._cb_open_until = client._now() - 1
 
-    queue = deque([(200, '{"head": {"vars": []}, "results": {"bindings": []}}')])
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *a, **k: _StubAsyncClient(queue))
+    stub = _StubAsyncClient((make_response(),))
+    monkeypatch.setattr(client, "_get_http", lambda: stub)
 
     res = await client.select("SELECT * WHERE {?s ?p ?o}")
     assert res["stats"]["status"] == 200
@@ -91,44 +84,49 @@ async def test_circuit_breaker_recovery(client: FusekiClient, monkeypatch: pytes
 
 
 @pytest.mark.asyncio
-async def test_retry_on_timeout(client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_retry_on_timeout(
+    client: FusekiClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     """前两次超时后第三次成功，应正好尝试3次。"""
 
     attempts = {"n": 0}
 
     class _TimeoutThenOK:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return None
-
         async def post(self, *args, **kwargs):
             attempts["n"] += 1
             if attempts["n"] < 3:
                 raise httpx.ReadTimeout("timeout")
-            request = httpx.Request("POST", "http://fuseki")
-            return httpx.Response(200, text='{"head": {"vars": []}, "results": {"bindings": []}}', request=request)
+            return make_response()
 
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *a, **k: _TimeoutThenOK())
+    monkeypatch.setattr(client, "_get_http", lambda: _TimeoutThenOK())
 
     await client.select("SELECT * WHERE {?s ?p ?o}")
     assert attempts["n"] == 3
 
 
 @pytest.mark.asyncio
-async def test_trace_id_propagation(client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_trace_id_propagation(
+    client: FusekiClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     """trace_id 应注入到 HTTP 头部。"""
 
-    stub = _StubAsyncClient(deque([(200, '{"head": {"vars": []}, "results": {"bindings": []}}')]))
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *a, **k: stub)
+    stub = _StubAsyncClient((make_response(),))
+    monkeypatch.setattr(client, "_get_http", lambda: stub)
 
     await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-xyz")
     assert stub.last_headers and stub.last_headers.get(client.trace_header) == "trace-xyz"
 
 
 @pytest.mark.asyncio
-async def test_metrics_recording(client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_metrics_recording(
+    client: FusekiClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     """成功响应应调用 observe_fuseki_response。"""
 
     calls = {"n": 0}
@@ -137,10 +135,8 @@ async def test_metrics_recording(client: FusekiClient, monkeypatch: pytest.Monke
         calls["n"] += 1
 
     monkeypatch.setattr("sf_rdf_acl.connection.client.observe_fuseki_response", fake_observe)
-    monkeypatch.setattr(
-        "sf_rdf_acl.connection.client.httpx.AsyncClient",
-        lambda *a, **k: _StubAsyncClient(deque([(200, '{"head": {"vars": []}, "results": {"bindings": []}}')]))
-    )
+    stub = _StubAsyncClient((make_response(),))
+    monkeypatch.setattr(client, "_get_http", lambda: stub)
 
     await client.select("SELECT * WHERE {?s ?p ?o}")
     assert calls["n"] >= 1
@@ -1,8 +1,8 @@
-"""FusekiClient 可靠性测试：验证熔断与重试行为。\n\n说明：\n- 本测试通过 monkeypatch 替换 httpx.AsyncClient，以模拟不同 HTTP 响应与异常，\n  用于验证 FusekiClient 的重试、熔断、超时收敛、鉴权/追踪头注入等行为。\n- 由于此类测试关注客户端健壮性与指标上报逻辑，输入采用 stub/mock；\n  端到端真实服务调用由独立 e2e 用例覆盖（tests/test_rdf_end_to_end.py）。\n"""
+"""FusekiClient 可靠性测试：验证熔断与重试行为。\n\n说明：\n- 本测试通过 monkeypatch 替换 FusekiClient 的共享 httpx.AsyncClient，以模拟不同 HTTP 响应与异常，\n  用于验证 FusekiClient 的重试、熔断、超时收敛、鉴权/追踪头注入等行为。\n- 由于此类测试关注客户端健壮性与指标上报逻辑，输入采用 stub/mock；\n  端到端真实服务调用由独立 e2e 用例覆盖（tests/test_rdf_end_to_end.py）。\n"""
 from __future__ import annotations
 
 import asyncio
-from collections import deque
+from typing import Any, Callable
 
 import httpx
 import pytest
@@ -13,35 +13,36 @@ from sf_rdf_acl.connection.client import FusekiClient
 
 
 class _AsyncClientStub:
-    """httpx.AsyncClient 的替身：按预置队列返回响应或抛异常。\n\n    参数：\n    - responses: 预置的 (status, text) 元组队列；为空时若未设置 `exc` 则视为配置错误\n    - exc: 若非空，post 调用直接抛出该异常\n    """
+    """httpx.AsyncClient 的替身：按顺序返回预构造的响应或抛异常。\n\n    参数：\n    - responses: 预构造的 httpx.Response 元组；耗尽时若未设置 `exc` 则视为配置错误\n    - exc: 若非空，post 调用直接抛出该异常\n    """
 
-    def __init__(self, responses: deque[tuple[int, str]] | None = None, exc: Exception | None = None) -> None:
-        self._responses = responses or deque()
+    def __init__(self, responses: tuple[httpx.Response, ...] = (), exc: Exception | None = None) -> None:
+        self._it = iter(responses)
         self._exc = exc
         self.calls = 0
 
-    async def __aenter__(self) -> "_AsyncClientStub":
-        return self
-
-    async def __aexit__(self, exc_type, exc, tb) -> None:  # noqa: D401 - 占位
-        return None
-
-    async def post(self, url: str, *, content: bytes, headers: dict[str, str], auth: httpx.Auth | None) -> httpx.Response:
-        """模拟 POST 请求，从队列取出一个响应返回。"""
+    async def post(
+        self,
+        url: str,
+        *,
+        content: bytes,
+        headers: dict[str, str],
+        timeout: httpx.Timeout | None = None,
+    ) -> httpx.Response:
+        """模拟 POST 请求，从迭代器取出下一个预构造响应。"""
 
         if self._exc is not None:
             raise self._exc
-        if not self._responses:
-            raise AssertionError("no stub response configured")
+        try:
+            response = next(self._it)
+        except StopIteration:
+            raise AssertionError("no stub response configured") from None
         self.calls += 1
-        status, text = self._responses.popleft()
-        request = httpx.Request("POST", url)
-        return httpx.Response(status, text=text, request=request)
+        return response
 
 
-@pytest.fixture()
-def fuseki_client(monkeypatch: pytest.MonkeyPatch) -> FusekiClient:
-    """构造短时窗口与低阈值的 FusekiClient，便于触发熔断与恢复。"""
+@pytest.fixture(scope="session")
+def fuseki_client() -> FusekiClient:
+    """构造短时窗口与低阈值的 FusekiClient，便于触发熔断与恢复；整个会话共享一个实例。"""
 
     client = FusekiClient(
         endpoint="http://fuseki",
@@ -52,33 +53,56 @@ def fuseki_client(monkeypatch: pytest.MonkeyPatch) -> FusekiClient:
         retry_policy={"max_attempts": 3, "backoff_seconds": 0.0, "backoff_multiplier": 1.0, "jitter_seconds": 0.0},
         circuit_breaker={"failureThreshold": 2, "recoveryTimeout": 60.0, "recordTimeoutOnly": False},
     )
-    monkeypatch.setattr(client, "_sleep", lambda *args, **kwargs: asyncio.sleep(0))
+    client._sleep = lambda *args, **kwargs: asyncio.sleep(0)  # type: ignore[method-assign]
     return client
 
 
-def _patch_async_client(monkeypatch: pytest.MonkeyPatch, responses: list[tuple[int, str]] | None = None, exc: Exception | None = None) -> None:
-    """替换 httpx.AsyncClient 构造器，注入桩以可控返回。"""
+@pytest.fixture(autouse=True)
+def _reset_fuseki_client(fuseki_client: FusekiClient) -> None:
+    """每个用例开始前复位共享客户端的熔断状态。"""
 
-    queue = deque(responses or [])
+    fuseki_client._cb_failure_count = 0
+    fuseki_client._cb_open_until = None
 
-    def factory(*args, **kwargs):
-        return _AsyncClientStub(queue, exc)
 
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", factory)
+def _patch_async_client(
+    monkeypatch: pytest.MonkeyPatch,
+    client: FusekiClient,
+    responses: tuple[httpx.Response, ...] = (),
+    exc: Exception | None = None,
+) -> _AsyncClientStub:
+    """替换客户端共享的 httpx.AsyncClient，注入桩以按序返回预构造的响应。"""
 
+    stub = _AsyncClientStub(responses, exc)
+    monkeypatch.setattr(client, "_get_http", lambda: stub)
+    return stub
 
-def _metric_value(name: str, labels: dict[str, str]) -> float:
-    """读取 Prometheus 指标当前值。"""
 
-    value = REGISTRY.get_sample_value(name, labels)
-    return 0.0 if value is None else value
+def _metrics_snapshot() -> dict[tuple[str, tuple[tuple[str, str], ...]], float]:
+    """一次遍历 Prometheus 注册表，返回以 (样本名, 排序后的标签) 为键的指标快照。
 
+    多个断言共享同一快照，避免每读取一个指标就重新收集全部 collector。
+    """
 
-@pytest.mark.asyncio
-async def test_circuit_opens_after_consecutive_failures(fuseki_client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
-    """连续失败达到阈值时，应打开熔断并暴露指标。"""
+    snapshot: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+    for family in REGISTRY.collect():
+        for sample in family.samples:
+            snapshot.setdefault((sample.name, tuple(sorted(sample.labels.items()))), sample.value)
+    return snapshot
 
-    _patch_async_client(monkeypatch, responses=[(503, "error"), (503, "error"), (503, "error"), (503, "error")])
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("threshold", [2, 3])
+async def test_circuit_opens_after_consecutive_failures(
+    fuseki_client: FusekiClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+    threshold: int,
+) -> None:
+    """连续失败达到阈值时，应打开熔断并暴露指标；阈值等于最大重试次数时同样成立。"""
+
+    monkeypatch.setattr(fuseki_client, "_cb_failure_threshold", threshold)
+    _patch_async_client(monkeypatch, fuseki_client, responses=(make_response(503, "error"),) * 5)
 
     with pytest.raises(ExternalServiceError) as exc_info:
         await fuseki_client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-1")
@@ -93,33 +117,45 @@ async def test_circuit_opens_after_consecutive_failures(fuseki_client: FusekiCli
 
 
 @pytest.mark.asyncio
-async def test_circuit_recover_after_timeout_window(fuseki_client: FusekiClient, monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_circuit_recover_after_timeout_window(
+    fuseki_client: FusekiClient,
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     """熔断窗口过后应允许探测并恢复。"""
 
-    fuseki_client._cb_failure_threshold = 1  # 降低触发熔断门槛
-    fuseki_client._cb_recovery_timeout = 0.01
-    _patch_async_client(monkeypatch, responses=[(503, "error"), (503, "error"), (503, "error")])
+    monkeypatch.setattr(fuseki_client, "_cb_failure_threshold", 1)  # 降低触发熔断门槛
+    monkeypatch.setattr(fuseki_client, "_cb_recovery_timeout_ns", 10_000_000)
+    _patch_async_client(monkeypatch, fuseki_client, responses=(make_response(503, "error"),) * 3)
 
     with pytest.raises(ExternalServiceError):
         await fuseki_client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-3")
 
     # 人工设置熔断器处于可恢复状态
-    fuseki_client._cb_open_until = fuseki_client._now() - 1
+    fuseki_client._cb_open_until = fuseki_client._now() - 1_000_000_000
     fuseki_client._cb_failure_count = 0
-    _patch_async_client(monkeypatch, responses=[(200, '{"head": {"vars": []}, "results": {"bindings": []}}')])
+    _patch_async_client(monkeypatch, fuseki_client, responses=(make_response(),))
 
     result = await fuseki_client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-4")
     assert result["stats"]["status"] == 200
-    gauge_value = _metric_value("sf_fuseki_circuit_breaker_state", {"operation": "query"})
+    metrics = _metrics_snapshot()
+    gauge_value = metrics.get(("sf_fuseki_circuit_breaker_state", (("operation", "query"),)), 0.0)
     assert gauge_value == pytest.approx(0.0)
 
 
 @pytest.mark.asyncio
-async def test_failure_metric_increments(monkeypatch: pytest.MonkeyPatch, fuseki_client: FusekiClient) -> None:
+async def test_failure_metric_increments(
+    monkeypatch: pytest.MonkeyPatch,
+    fuseki_client: FusekiClient,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     """失败后应累计失败指标，随后成功不会回滚累计值。"""
 
-    stub = _AsyncClientStub(deque([(503, "boom"), (200, '{"head": {"vars": []}, "results": {"bindings": []}}')]))
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *args, **kwargs: stub)
+    stub = _patch_async_client(
+        monkeypatch,
+        fuseki_client,
+        responses=(make_response(503, "boom"), make_response()),
+    )
 
     result = await fuseki_client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-retry")
     assert result["stats"]["status"] == 200
@@ -137,7 +173,12 @@ async def test_failure_metric_increments(monkeypatch: pytest.MonkeyPatch, fuseki
         (503, ErrorCode.FUSEKI_QUERY_ERROR),
     ],
 )
-async def test_http_error_code_mapping(monkeypatch: pytest.MonkeyPatch, status: int, expected: ErrorCode) -> None:
+async def test_http_error_code_mapping(
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+    status: int,
+    expected: ErrorCode,
+) -> None:
     client = FusekiClient(
         endpoint="http://fuseki",
         dataset="demo",
@@ -146,7 +187,7 @@ async def test_http_error_code_mapping(monkeypatch: pytest.MonkeyPatch, status:
         max_timeout=5,
         retry_policy={"max_attempts": 1, "backoff_seconds": 0.0, "backoff_multiplier": 1.0, "jitter_seconds": 0.0},
     )
-    _patch_async_client(monkeypatch, responses=[(status, "x" * 2000)])
+    _patch_async_client(monkeypatch, client, responses=(make_response(status, "x" * 2000),))
 
     with pytest.raises(ExternalServiceError) as exc:
         await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-error")
@@ -157,12 +198,29 @@ async def test_http_error_code_mapping(monkeypatch: pytest.MonkeyPatch, status:
 
 
 @pytest.mark.asyncio
-async def test_retryable_status_codes_respected(monkeypatch: pytest.MonkeyPatch) -> None:
-    responses = deque([(418, "teapot"), (200, '{"head": {"vars": []}, "results": {"bindings": []}}')])
-    stub = _AsyncClientStub(responses, None)
+async def test_http_error_message_truncates_on_byte_boundary(
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
+    client = FusekiClient(
+        endpoint="http://fuseki",
+        dataset="demo",
+        retry_policy={"max_attempts": 1, "backoff_seconds": 0.0, "backoff_multiplier": 1.0, "jitter_seconds": 0.0},
+    )
+    _patch_async_client(monkeypatch, client, responses=(make_response(400, "错" * 2000),))
+
+    with pytest.raises(ExternalServiceError) as exc:
+        await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-error-utf8")
+
+    message = exc.value.details["message"]
+    assert message == "错" * (1024 // 3)
 
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *args, **kwargs: stub)
 
+@pytest.mark.asyncio
+async def test_retryable_status_codes_respected(
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     client = FusekiClient(
         endpoint="http://fuseki",
         dataset="demo",
@@ -171,6 +229,11 @@ async def test_retryable_status_codes_respected(monkeypatch: pytest.MonkeyPatch)
         max_timeout=5,
         retry_policy={"max_attempts": 2, "retryable_status_codes": [418], "backoff_seconds": 0.0, "backoff_multiplier": 1.0, "jitter_seconds": 0.0},
     )
+    stub = _patch_async_client(
+        monkeypatch,
+        client,
+        responses=(make_response(418, "teapot"), make_response()),
+    )
 
     result = await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-retry")
     assert result["stats"]["status"] == 200
@@ -178,12 +241,10 @@ async def test_retryable_status_codes_respected(monkeypatch: pytest.MonkeyPatch)
 
 
 @pytest.mark.asyncio
-async def test_record_timeout_only_skips_connect_errors(monkeypatch: pytest.MonkeyPatch) -> None:
-    def factory(*args, **kwargs):
-        return _AsyncClientStub(deque(), httpx.ConnectError("fail", request=httpx.Request("POST", "http://fuseki")))
-
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", factory)
-
+async def test_record_timeout_only_skips_connect_errors(
+    monkeypatch: pytest.MonkeyPatch,
+    stub_request: httpx.Request,
+) -> None:
     client = FusekiClient(
         endpoint="http://fuseki",
         dataset="demo",
@@ -193,6 +254,7 @@ async def test_record_timeout_only_skips_connect_errors(monkeypatch: pytest.Monk
         retry_policy={"max_attempts": 1, "backoff_seconds": 0.0, "backoff_multiplier": 1.0, "jitter_seconds": 0.0},
         circuit_breaker={"failureThreshold": 1, "recoveryTimeout": 60.0, "recordTimeoutOnly": True},
     )
+    _patch_async_client(monkeypatch, client, exc=httpx.ConnectError("fail", request=stub_request))
 
     with pytest.raises(ExternalServiceError):
         await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-connect")
@@ -217,26 +279,33 @@ def test_timeout_clamping() -> None:
 
 
 @pytest.mark.asyncio
-async def test_basic_auth_and_trace_header(monkeypatch: pytest.MonkeyPatch) -> None:
+async def test_basic_auth_and_trace_header(
+    monkeypatch: pytest.MonkeyPatch,
+    make_response: Callable[..., httpx.Response],
+) -> None:
     class _CaptureClient:
-        def __init__(self) -> None:
+        def __init__(self, **kwargs: Any) -> None:
+            self.kwargs = kwargs
             self.headers: dict[str, str] | None = None
-            self.auth: httpx.Auth | None = None
 
-        async def __aenter__(self) -> "_CaptureClient":
-            return self
+        async def post(
+            self,
+            url: str,
+            *,
+            content: bytes,
+            headers: dict[str, str],
+            timeout: httpx.Timeout | None = None,
+        ) -> httpx.Response:
+            self.headers = headers
+            return make_response()
 
-        async def __aexit__(self, exc_type, exc, tb) -> None:
-            return None
+    created: list[_CaptureClient] = []
 
-        async def post(self, url: str, *, content: bytes, headers: dict[str, str], auth: httpx.Auth | None) -> httpx.Response:
-            self.headers = headers
-            self.auth = auth
-            request = httpx.Request("POST", url)
-            return httpx.Response(200, text='{"head": {"vars": []}, "results": {"bindings": []}}', request=request)
+    def _factory(**kwargs: Any) -> _CaptureClient:
+        created.append(_CaptureClient(**kwargs))
+        return created[-1]
 
-    capture = _CaptureClient()
-    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", lambda *args, **kwargs: capture)
+    monkeypatch.setattr("sf_rdf_acl.connection.client.httpx.AsyncClient", _factory)
 
     client = FusekiClient(
         endpoint="http://fuseki",
@@ -248,9 +317,45 @@ async def test_basic_auth_and_trace_header(monkeypatch: pytest.MonkeyPatch) -> N
         retry_policy={"max_attempts": 1},
     )
 
+    await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-headers")
     await client.select("SELECT * WHERE {?s ?p ?o}", trace_id="trace-headers")
 
+    assert len(created) == 1
+    capture = created[0]
     assert capture.headers and capture.headers.get("X-Trace-Id") == "trace-headers"
-    assert isinstance(capture.auth, httpx.BasicAuth)
-    assert isinstance(capture.auth._auth_header, str)
-    assert capture.auth._auth_header.startswith("Basic ")
+    auth = capture.kwargs.get("auth")
+    assert isinstance(auth, httpx.BasicAuth)
+    assert isinstance(auth._auth_header, str)
+    assert auth._auth_header.startswith("Basic ")
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_reused_until_closed() -> None:
+    client = FusekiClient(endpoint="http://fuseki", dataset="demo")
+
+    first = client._get_http()
+    assert client._get_http() is first
+
+    await client.aclose()
+    assert client._http is None
+    second = client._get_http()
+    assert second is not first
+    await client.aclose()
+
+
+def test_loop_switch_releases_previous_pool() -> None:
+    """事件循环切换时应换用新连接池并关闭旧池，aclose 可跨循环释放当前池。"""
+
+    client = FusekiClient(endpoint="http://fuseki", dataset="demo")
+
+    async def current_pool() -> httpx.AsyncClient:
+        http = client._get_http()
+        await asyncio.sleep(0)
+        return http
+
+    first = asyncio.run(current_pool())
+    second = asyncio.run(current_pool())
+    asyncio.run(client.aclose())
+
+    assert second is not first
+    assert first.is_closed and second.is_closed
@@ -7,127 +7,182 @@ from __future__ import annotations
 - JSON-LD 转换与 @context 注入
 - simplified-json 转换（节点/边/统计）
 - simplified-json 多语言标签支持
+- Turtle 转换结果缓存（含自定义 @context）
 - 非法格式参数校验
 
-测试数据尽量使用内联 Turtle，避免外部依赖；
+测试数据尽量使用内联 Turtle，避免外部依赖；样例图在模块级只解析一次，
+各用例直接向 ``format_graph`` 传入已解析的图，仅 Turtle 解析路径单独覆盖。
 本模块不访问外部 Fuseki/PG 服务，满足端到端（模块级）可运行。
 """
 
+from dataclasses import dataclass
+
 import pytest
+from rdflib import Graph as RDFGraph
 
 from sf_rdf_acl.converter.graph_formatter import GraphFormatter
 
 
-class TestGraphFormatter:
-    def setup_method(self) -> None:
-        """准备被测实例与基础 Turtle 文本。
-
-        - formatter: 被测 GraphFormatter 实例
-        - sample_turtle: 包含 2 个实体、标签、关系与数值属性
-        - multilabel_turtle: 同一实体具备中英文两个 label 的示例
-        """
-
-        self.formatter = GraphFormatter()
-        self.sample_turtle = (
-            """
-            @prefix ex: <http://example.com/> .
-            @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
-
-            ex:Person1 a ex:Person ;
-                rdfs:label "Alice" ;
-                ex:age 30 ;
-                ex:knows ex:Person2 .
-
-            ex:Person2 a ex:Person ;
-                rdfs:label "Bob" .
-            """
-        )
-
-        self.multilabel_turtle = (
-            """
-            @prefix ex: <http://example.com/> .
-            @prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
-
-            ex:E1 a ex:Entity ;
-                rdfs:label "示例"@zh ;
-                rdfs:label "Sample"@en .
-            """
-        )
-
-    def test_format_turtle_passthrough(self) -> None:
-        """Turtle 格式透传应保持内容不变。"""
-
-        result = self.formatter.format_graph(self.sample_turtle, format_type="turtle")
-        assert result == self.sample_turtle
-
-    def test_format_jsonld(self) -> None:
-        """JSON-LD 转换应产出字典，包含 @context 或 @graph。"""
-
-        result = self.formatter.format_graph(self.sample_turtle, format_type="json-ld")
-        assert isinstance(result, dict)
-        # 不同 rdflib 版本可能产出不同顶层键，但通常含 @context 或 @graph
-        assert "@context" in result or "@graph" in result
-
-    def test_format_jsonld_with_context(self) -> None:
-        """JSON-LD 转换时自定义 @context 应被注入。"""
-
-        custom_context = {
-            "ex": "http://example.com/",
-            "name": "http://www.w3.org/2000/01/rdf-schema#label",
-        }
-        result = self.formatter.format_graph(
-            self.sample_turtle, format_type="json-ld", context=custom_context
-        )
-        assert isinstance(result, dict)
-        assert result.get("@context") == custom_context
-
-    def test_format_simplified_json(self) -> None:
-        """简化 JSON 转换应包含 nodes/edges/stats，且内容合理。"""
-
-        result = self.formatter.format_graph(
-            self.sample_turtle, format_type="simplified-json"
-        )
-        assert isinstance(result, dict)
-        assert "nodes" in result and "edges" in result and "stats" in result
-
-        # 验证节点数量与字段
-        nodes = result["nodes"]
-        assert len(nodes) == 2  # Person1 与 Person2
-        person1 = next(n for n in nodes if "Person1" in n["id"])
-        assert person1["type"] == "http://example.com/Person"
-        assert person1["label"] == "Alice"
-        assert "http://example.com/age" in person1["properties"]
-
-        # 验证边
-        knows_edge = next(
-            e
-            for e in result["edges"]
-            if e["predicate"] == "http://example.com/knows"
-        )
-        assert "Person1" in knows_edge["source"]
-        assert "Person2" in knows_edge["target"]
-
-        # 统计字段
-        assert result["stats"]["node_count"] == 2
-        assert result["stats"]["edge_count"] >= 1
-
-    def test_simplified_json_multilang_labels(self) -> None:
-        """同一实体存在多语言标签时，应同时记录 label 与 labels。"""
-
-        result = self.formatter.format_graph(
-            self.multilabel_turtle, format_type="simplified-json"
-        )
-        nodes = result["nodes"]
-        e1 = next(n for n in nodes if n["id"].endswith("E1"))
-        # labels 应包含 zh/en 两种语言
-        assert e1["labels"]["zh"] == "示例"
-        assert e1["labels"]["en"] == "Sample"
-        # label 默认可取任意一个（实现为优先无语言标签，否则首个见到）——至少应为字符串
-        assert isinstance(e1["label"], str)
-
-    def test_invalid_format_type(self) -> None:
-        """传入不支持的格式类型应抛出 ValueError。"""
-
-        with pytest.raises(ValueError, match="Unsupported format"):
-            self.formatter.format_graph(self.sample_turtle, format_type="invalid")
+SAMPLE_TURTLE = """
+@prefix ex: <http://example.com/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Person1 a ex:Person ;
+    rdfs:label "Alice" ;
+    ex:age 30 ;
+    ex:knows ex:Person2 .
+
+ex:Person2 a ex:Person ;
+    rdfs:label "Bob" .
+"""
+
+MULTILABEL_TURTLE = """
+@prefix ex: <http://example.com/> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:E1 a ex:Entity ;
+    rdfs:label "示例"@zh ;
+    rdfs:label "Sample"@en .
+"""
+
+
+@dataclass(frozen=True)
+class _FormatterCase:
+    """模块级共享的被测实例与预解析图。
+
+    - formatter: 被测 GraphFormatter 实例
+    - sample_graph: 包含 2 个实体、标签、关系与数值属性
+    - multilabel_graph: 同一实体具备中英文两个 label 的示例
+    """
+
+    formatter: GraphFormatter
+    sample_graph: RDFGraph
+    multilabel_graph: RDFGraph
+
+
+@pytest.fixture(scope="module")
+def case() -> _FormatterCase:
+    return _FormatterCase(
+        formatter=GraphFormatter(),
+        sample_graph=RDFGraph().parse(data=SAMPLE_TURTLE, format="turtle"),
+        multilabel_graph=RDFGraph().parse(data=MULTILABEL_TURTLE, format="turtle"),
+    )
+
+
+def test_format_turtle_passthrough(case: _FormatterCase) -> None:
+    """Turtle 格式透传应保持内容不变。"""
+
+    result = case.formatter.format_graph(SAMPLE_TURTLE, format_type="turtle")
+    assert result == SAMPLE_TURTLE
+
+
+def test_format_turtle_from_graph(case: _FormatterCase) -> None:
+    """传入已解析的图时，turtle 输出应为可回读的等价序列化结果。"""
+
+    result = case.formatter.format_graph(case.sample_graph, format_type="turtle")
+    assert isinstance(result, str)
+    assert len(RDFGraph().parse(data=result, format="turtle")) == len(case.sample_graph)
+
+
+def test_format_graph_parses_turtle(case: _FormatterCase) -> None:
+    """经 Turtle 解析的结果应与直接使用预解析图一致。"""
+
+    parsed = case.formatter.format_graph(SAMPLE_TURTLE, format_type="simplified-json")
+    direct = case.formatter.format_graph(case.sample_graph, format_type="simplified-json")
+    assert parsed["stats"] == direct["stats"]
+    assert sorted(node["id"] for node in parsed["nodes"]) == sorted(node["id"] for node in direct["nodes"])
+
+
+def test_format_graph_caches_turtle_conversion() -> None:
+    """开启缓存后，调用方修改返回值不影响后续对相同 Turtle 的转换结果。"""
+
+    formatter = GraphFormatter(cache_size=8)
+    first = formatter.format_graph(SAMPLE_TURTLE, format_type="simplified-json")
+    first["nodes"].clear()
+    second = formatter.format_graph(SAMPLE_TURTLE, format_type="simplified-json")
+    second["nodes"].clear()
+    third = formatter.format_graph(SAMPLE_TURTLE, format_type="simplified-json")
+
+    assert second["stats"]["node_count"] == 2
+    assert len(third["nodes"]) == 2
+
+
+@pytest.mark.parametrize("cache_size", [0, 8])
+def test_format_turtle_jsonld_with_context(cache_size: int) -> None:
+    """Turtle 文本转 JSON-LD 时应注入自定义 @context，不同 @context 互不串用。"""
+
+    formatter = GraphFormatter(cache_size=cache_size)
+    custom_context = {"name": "http://www.w3.org/2000/01/rdf-schema#label", "ex": "http://example.com/"}
+    other_context = {"ex": "http://example.com/"}
+
+    for _ in range(2):
+        result = formatter.format_graph(SAMPLE_TURTLE, format_type="json-ld", context=custom_context)
+        assert result["@context"] == custom_context
+    other = formatter.format_graph(SAMPLE_TURTLE, format_type="json-ld", context=other_context)
+    assert other["@context"] == other_context
+
+
+def test_format_jsonld(case: _FormatterCase) -> None:
+    """JSON-LD 转换应产出字典，包含 @context 或 @graph。"""
+
+    result = case.formatter.format_graph(case.sample_graph, format_type="json-ld")
+    assert isinstance(result, dict)
+    # 不同 rdflib 版本可能产出不同顶层键，但通常含 @context 或 @graph
+    assert "@context" in result or "@graph" in result
+
+
+def test_format_jsonld_with_context(case: _FormatterCase) -> None:
+    """JSON-LD 转换时自定义 @context 应被注入。"""
+
+    custom_context = {
+        "ex": "http://example.com/",
+        "name": "http://www.w3.org/2000/01/rdf-schema#label",
+    }
+    result = case.formatter.format_graph(case.sample_graph, format_type="json-ld", context=custom_context)
+    assert isinstance(result, dict)
+    assert result.get("@context") == custom_context
+
+
+def test_format_simplified_json(case: _FormatterCase) -> None:
+    """简化 JSON 转换应包含 nodes/edges/stats，且内容合理。"""
+
+    result = case.formatter.format_graph(case.sample_graph, format_type="simplified-json")
+    assert isinstance(result, dict)
+    assert "nodes" in result and "edges" in result and "stats" in result
+
+    # 验证节点数量与字段
+    nodes = result["nodes"]
+    assert len(nodes) == 2  # Person1 与 Person2
+    person1 = next(n for n in nodes if "Person1" in n["id"])
+    assert person1["type"] == "http://example.com/Person"
+    assert person1["label"] == "Alice"
+    assert "http://example.com/age" in person1["properties"]
+
+    # 验证边
+    knows_edge = next(e for e in result["edges"] if e["predicate"] == "http://example.com/knows")
+    assert "Person1" in knows_edge["source"]
+    assert "Person2" in knows_edge["target"]
+
+    # 统计字段
+    assert result["stats"]["node_count"] == 2
+    assert result["stats"]["edge_count"] >= 1
+
+
+def test_simplified_json_multilang_labels(case: _FormatterCase) -> None:
+    """同一实体存在多语言标签时，应同时记录 label 与 labels。"""
+
+    result = case.formatter.format_graph(case.multilabel_graph, format_type="simplified-json")
+    nodes = result["nodes"]
+    e1 = next(n for n in nodes if n["id"].endswith("E1"))
+    # labels 应包含 zh/en 两种语言
+    assert e1["labels"]["zh"] == "示例"
+    assert e1["labels"]["en"] == "Sample"
+    # label 默认可取任意一个（实现为优先无语言标签，否则首个见到）——至少应为字符串
+    assert isinstance(e1["label"], str)
+
+
+def test_invalid_format_type(case: _FormatterCase) -> None:
+    """传入不支持的格式类型应抛出 ValueError。"""
 
+    with pytest.raises(ValueError, match="Unsupported format"):
+        case.formatter.format_graph(case.sample_graph, format_type="invalid")  # type: ignore[arg-type]
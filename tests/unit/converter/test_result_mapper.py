@@ -3,6 +3,7 @@ from __future__ import annotations
 """ResultMapper 将 SPARQL JSON 绑定映射为平台统一结构的测试。"""
 
 from datetime import datetime
+from itertools import islice
 
 from sf_rdf_acl.converter.result_mapper import ResultMapper
 
@@ -55,3 +56,52 @@ def test_map_bindings_handles_missing_cells() -> None:
 
     assert rows == [{"col": None}]
 
+
+def test_map_bindings_keeps_raw_value_when_cast_fails() -> None:
+    mapper = ResultMapper()
+    bindings = [
+        {
+            "price": {"type": "literal", "value": "9.5", "datatype": "http://www.w3.org/2001/XMLSchema#decimal"},
+            "bad": {"type": "literal", "value": "n/a", "datatype": "http://www.w3.org/2001/XMLSchema#int"},
+            "custom": {"type": "literal", "value": "x", "datatype": "http://example.com/dt"},
+        }
+    ]
+
+    first = mapper.map_bindings(["price", "bad", "custom"], bindings)[0]
+
+    assert first["price"]["value"] == 9.5
+    assert first["bad"]["value"] == "n/a"
+    assert first["custom"]["value"] == "x"
+    assert first["custom"]["datatype"] == "http://example.com/dt"
+
+
+def test_map_bindings_casts_freshly_decoded_datatypes() -> None:
+    """JSON 解码得到的新字符串同样应命中转换；非字符串数据类型原样返回。"""
+
+    mapper = ResultMapper()
+    xsd = "".join(["http://www.w3.org/2001/", "XMLSchema#"])
+    bindings = [
+        {
+            "n": {"type": "literal", "value": "7", "datatype": xsd + "integer"},
+            "flag": {"type": "literal", "value": "1", "datatype": xsd + "boolean"},
+        }
+        for _ in range(2)
+    ]
+
+    rows = mapper.map_bindings(["n", "flag"], bindings)
+
+    assert [row["n"]["value"] for row in rows] == [7, 7]
+    assert all(row["flag"]["value"] is True for row in rows)
+    odd = mapper.map_bindings(["x"], [{"x": {"type": "literal", "value": "7", "datatype": 42}}])
+    assert odd[0]["x"]["value"] == "7"
+
+
+def test_iter_bindings_converts_lazily() -> None:
+    mapper = ResultMapper()
+    bindings = [{"n": {"type": "literal", "value": str(i), "datatype": "http://www.w3.org/2001/XMLSchema#integer"}} for i in range(5)]
+    bindings.append({"n": "not-a-cell"})  # 若被转换会因非 dict 单元格报错
+
+    rows = list(islice(mapper.iter_bindings(["n"], bindings), 3))
+
+    assert [row["n"]["value"] for row in rows] == [0, 1, 2]
+    assert list(mapper.iter_bindings(["n"], bindings[:5])) == mapper.map_bindings(["n"], bindings[:5])
@@ -0,0 +1,35 @@
+"""graph 模块单元测试共用 fixture。"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any, Callable
+
+import pytest
+
+from common.config import ConfigManager
+from common.config.settings import GraphConfig, GraphProjectionProfileConfig
+
+
+@pytest.fixture(scope="session")
+def settings_base() -> Any:
+    """全局配置快照；配置已由 tests/conftest.py 在收集阶段加载，这里只读取一次。"""
+
+    return ConfigManager.current().settings
+
+
+@pytest.fixture
+def make_settings(settings_base: Any) -> Callable[[GraphProjectionProfileConfig], SimpleNamespace]:
+    """按给定投影 profile 构造 settings 替身，其余配置复用会话级快照。"""
+
+    postgres = getattr(settings_base, "postgres", SimpleNamespace(dsn="postgres://", schema="public"))
+
+    def _make(profile: GraphProjectionProfileConfig) -> SimpleNamespace:
+        return SimpleNamespace(
+            graph=GraphConfig(projection_profiles={"default": profile}),
+            rdf=settings_base.rdf,
+            security=settings_base.security,
+            app=settings_base.app,
+            postgres=postgres,
+        )
+
+    return _make
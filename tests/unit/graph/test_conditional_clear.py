@@ -2,9 +2,12 @@
 from __future__ import annotations
 
 import re
-import shlex
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import cache
+from itertools import islice
 from types import SimpleNamespace
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 import pytest
 import pytest_asyncio
@@ -20,20 +23,131 @@ from sf_rdf_acl.graph.named_graph import (
 from sf_rdf_acl.query.dsl import GraphRef
 
 
+# 桩客户端解析 SPARQL 所用的正则，模块加载时编译一次
+_GRAPH_IRI_RE = re.compile(r"GRAPH\s+<([^>]+)>")
+_BLOCK_RE = re.compile(r"GRAPH\s+<[^>]+>\s*\{(.*?)\}\s*\}", re.DOTALL)
+# 查询解析结果缓存容量
+_PARSE_CACHE_SIZE = 256
+
+# FILTER(isIRI/isLiteral) 对应的内部对象类型
+_OBJECT_TYPES = {"IRI": "uri", "Literal": "literal"}
+
+# FILTER 行的固定前缀，直接用 str.find 定位，无需正则
+_PREFIX_MARK = 'STRSTARTS(STR(?s), "'
+_WHITELIST_MARK = "?p IN ("
+# 去除白名单 IRI 两侧尖括号的转换表
+_ANGLE_BRACKETS = str.maketrans("", "", "<>")
+
+# 批量填充的常量三元组，模块加载时构造一次
+_BULK_TRIPLES: tuple[tuple[str, str, tuple[str, str]], ...] = tuple(
+    (f"http://example.com/bulk/{idx}", "http://example.com/bulk", ("literal", f"bulk-{idx}"))
+    for idx in range(20)
+)
+
+
+def _split_triple(line: str) -> list[str]:
+    """将单行三元组模式切分为 token，仅识别 ``<IRI>``、``"字面量"`` 与 ``?var``/前缀名。
+
+    字面量保留引号（与 ``_triple_tokens`` 的表示一致），并连带其后的 ``@lang``/``^^type`` 后缀。
+    """
+
+    tokens: list[str] = []
+    length = len(line)
+    index = 0
+    while index < length:
+        char = line[index]
+        if char.isspace():
+            index += 1
+            continue
+        end = index + 1
+        if char == "<":
+            close = line.find(">", end)
+            end = length if close < 0 else close + 1
+        elif char == '"':
+            while end < length and line[end] != '"':
+                end += 2 if line[end] == "\\" else 1
+            end += 1
+        while end < length and not line[end].isspace():
+            end += 1
+        tokens.append(line[index:end])
+        index = end
+    return tokens
+
+
+@cache
+def _triple_tokens(triple: tuple[str, str, tuple[str, str]]) -> tuple[str, str, str]:
+    """将内部三元组表示转换为 SPARQL Token；三元组为不可变元组，同一三元组只格式化一次。"""
+
+    subject, predicate, (obj_type, obj_value) = triple
+    subject_token = f"<{subject}>"
+    predicate_token = f"<{predicate}>"
+    if obj_type == "uri":
+        object_token = f"<{obj_value}>"
+    else:
+        object_token = f'"{obj_value}"'
+    return subject_token, predicate_token, object_token
+
+
+@dataclass(slots=True)
+class _GraphColumns:
+    """单个命名图的列式存储（SoA）及其索引。
+
+    - subjects/predicates/obj_types/obj_values: 按行号对齐的各列
+    - by_predicate: 谓词 -> 行号列表
+    - sorted_subjects/sorted_rows: 按主语排序后的主语与对应行号，用于前缀二分查找
+    """
+
+    subjects: list[str]
+    predicates: list[str]
+    obj_types: list[str]
+    obj_values: list[str]
+    by_predicate: dict[str, list[int]] = field(default_factory=dict)
+    sorted_subjects: list[str] = field(default_factory=list)
+    sorted_rows: list[int] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, triples: list[tuple[str, str, tuple[str, str]]]) -> "_GraphColumns":
+        columns = cls(
+            subjects=[triple[0] for triple in triples],
+            predicates=[triple[1] for triple in triples],
+            obj_types=[triple[2][0] for triple in triples],
+            obj_values=[triple[2][1] for triple in triples],
+        )
+        for row, predicate in enumerate(columns.predicates):
+            columns.by_predicate.setdefault(predicate, []).append(row)
+        columns.sorted_rows = sorted(range(len(triples)), key=columns.subjects.__getitem__)
+        columns.sorted_subjects = [columns.subjects[row] for row in columns.sorted_rows]
+        return columns
+
+
 class StubFusekiClient:
     """模拟 Fuseki 客户端，以可控数据集实现查询与更新。"""
 
-    def __init__(self, initial_data: dict[str, list[tuple[str, str, tuple[str, str]]]]) -> None:
+    def __init__(
+        self,
+        initial_data: dict[str, list[tuple[str, str, tuple[str, str]]]] | None = None,
+        *,
+        initial_data_factory: Callable[[], dict[str, list[tuple[str, str, tuple[str, str]]]]] | None = None,
+    ) -> None:
         """初始化测试桩。
 
         功能:
             复制初始三元组数据，避免测试间的状态相互影响。
         参数:
-            initial_data (dict[str, list[tuple[str, str, tuple[str, str]]]]):
+            initial_data (dict[str, list[tuple[str, str, tuple[str, str]]]] | None):
                 键为命名图 IRI，值为三元组列表；三元组格式为 ``(subject, predicate, (object_type, object_value))``。
+            initial_data_factory (Callable[[], dict[...]] | None):
+                惰性提供初始数据的工厂，首次查询/更新时才调用；与 ``initial_data`` 二选一。
         """
 
-        self._data = {graph: list(triples) for graph, triples in initial_data.items()}
+        self._data: dict[str, list[tuple[str, str, tuple[str, str]]]] | None = None
+        if initial_data is not None:
+            self._data = {graph: list(triples) for graph, triples in initial_data.items()}
+        self._data_factory = initial_data_factory
+        # 查询文本 -> (图 IRI, 三元组模式, 过滤规则)；dry-run 与执行阶段会重复下发相同语句
+        self._parse_cache: dict[str, tuple[str, list[list[str]], dict[str, Any]]] = {}
+        # 按图惰性构建的列式存储与索引，数据变更后丢弃重建
+        self._columns: dict[str, _GraphColumns] = {}
 
     async def select(
         self,
@@ -44,16 +158,20 @@ class StubFusekiClient:
     ) -> dict[str, Any]:
         """模拟 SELECT 查询，返回 JSON 结构的结果。"""
 
-        graph_iri = self._extract_graph(query)
-        matched = self._filter_triples(graph_iri, query)
+        self._ensure_loaded()
+        graph_iri, patterns, filters = self._decompose(query)
+        matched = self._iter_matched(graph_iri, patterns, filters)
         if "COUNT(" in query:
+            # 计数只需遍历，不物化匹配列表
+            count = sum(1 for _ in matched)
             return {
                 "vars": ["count"],
                 "bindings": [
-                    {"count": {"type": "literal", "value": str(len(matched))}}
+                    {"count": {"type": "literal", "value": str(count)}}
                 ],
             }
-        bindings = [self._to_binding(triple) for triple in matched[:10]]
+        # 样本预览最多 10 条，取满即停止扫描
+        bindings = [self._to_binding(triple) for triple in islice(matched, 10)]
         return {"vars": ["s", "p", "o"], "bindings": bindings}
 
     async def update(
@@ -65,35 +183,111 @@ class StubFusekiClient:
     ) -> dict[str, Any]:
         """模拟 UPDATE 删除操作，移除匹配的三元组。"""
 
-        graph_iri = self._extract_graph(query)
-        matched = self._filter_triples(graph_iri, query)
+        self._ensure_loaded()
+        graph_iri, patterns, filters = self._decompose(query)
+        matched = set(self._filter_triples(graph_iri, patterns, filters))
         triples = self._data.get(graph_iri, [])
         self._data[graph_iri] = [triple for triple in triples if triple not in matched]
+        self._columns.pop(graph_iri, None)
         return {"status": 200, "durationMs": 15.0}
 
+    def _ensure_loaded(self) -> None:
+        """首次访问时通过工厂物化初始数据。"""
+
+        if self._data is None:
+            factory = self._data_factory
+            self._data = {graph: list(triples) for graph, triples in factory().items()} if factory else {}
+
+    def _decompose(self, query: str) -> tuple[str, list[list[str]], dict[str, Any]]:
+        """解析查询得到图 IRI、三元组模式与过滤规则，相同查询文本直接命中缓存。"""
+
+        cached = self._parse_cache.get(query)
+        if cached is not None:
+            return cached
+        patterns, filters = self._parse_conditions(query)
+        decomposed = (self._extract_graph(query), patterns, filters)
+        if len(self._parse_cache) >= _PARSE_CACHE_SIZE:
+            # 淘汰最早写入的条目
+            self._parse_cache.pop(next(iter(self._parse_cache)))
+        self._parse_cache[query] = decomposed
+        return decomposed
+
     def _extract_graph(self, query: str) -> str:
         """从 SPARQL 语句中提取 GRAPH IRI。"""
 
-        match = re.search(r"GRAPH\s+<([^>]+)>", query)
+        match = _GRAPH_IRI_RE.search(query)
         if not match:
             raise ValueError("未找到 GRAPH IRI")
         return match.group(1)
 
-    def _filter_triples(self, graph_iri: str, query: str) -> list[tuple[str, str, tuple[str, str]]]:
-        """根据 WHERE 子句过滤命名图中的三元组。"""
+    def _filter_triples(
+        self,
+        graph_iri: str,
+        patterns: list[list[str]],
+        filters: dict[str, Any],
+    ) -> list[tuple[str, str, tuple[str, str]]]:
+        """根据解析出的模式与过滤规则筛选命名图中的三元组。"""
+
+        return list(self._iter_matched(graph_iri, patterns, filters))
 
-        patterns, filters = self._parse_conditions(query)
-        triples = self._data.get(graph_iri, [])
-        matched: list[tuple[str, str, tuple[str, str]]] = []
-        for triple in triples:
-            if self._match_patterns(triple, patterns) and self._match_filters(triple, filters):
-                matched.append(triple)
-        return matched
+    def _iter_matched(
+        self,
+        graph_iri: str,
+        patterns: list[list[str]],
+        filters: dict[str, Any],
+    ) -> Iterator[tuple[str, str, tuple[str, str]]]:
+        """惰性产出满足模式与过滤规则的三元组。
+
+        先在单列上执行廉价的过滤判断（主语前缀、谓词白名单、对象类型），
+        仅对通过的行重组三元组并做模式匹配。
+        """
+
+        columns = self._graph_columns(graph_iri)
+        subjects, predicates = columns.subjects, columns.predicates
+        obj_types, obj_values = columns.obj_types, columns.obj_values
+        prefix = filters.get("subject_prefix")
+        whitelist = filters.get("predicate_whitelist")
+        obj_type = _OBJECT_TYPES.get(filters.get("object_type"))
+        for row in self._candidate_rows(columns, patterns, prefix):
+            if prefix and not subjects[row].startswith(prefix):
+                continue
+            if whitelist and predicates[row] not in whitelist:
+                continue
+            if obj_type and obj_types[row] != obj_type:
+                continue
+            triple = (subjects[row], predicates[row], (obj_types[row], obj_values[row]))
+            if self._match_patterns(triple, patterns):
+                yield triple
+
+    @staticmethod
+    def _candidate_rows(columns: _GraphColumns, patterns: list[list[str]], prefix: str | None) -> Iterable[int]:
+        """借助索引缩小候选行：具体谓词走谓词索引，主语前缀走有序主语二分，否则全量扫描。"""
+
+        predicate = next((parts[1] for parts in patterns if parts[1].startswith("<")), None)
+        if predicate is not None:
+            return columns.by_predicate.get(predicate[1:-1], ())
+        if prefix:
+            subjects = columns.sorted_subjects
+            start = bisect_left(subjects, prefix)
+            end = start
+            while end < len(subjects) and subjects[end].startswith(prefix):
+                end += 1
+            return columns.sorted_rows[start:end]
+        return range(len(columns.subjects))
+
+    def _graph_columns(self, graph_iri: str) -> _GraphColumns:
+        """返回命名图的列式存储，首次访问或数据变更后重建。"""
+
+        columns = self._columns.get(graph_iri)
+        if columns is None:
+            columns = _GraphColumns.build(self._data.get(graph_iri, []))
+            self._columns[graph_iri] = columns
+        return columns
 
     def _parse_conditions(self, query: str) -> tuple[list[list[str]], dict[str, Any]]:
         """解析 WHERE 语句得到三元组模式与过滤规则。"""
 
-        block_match = re.search(r"GRAPH\s+<[^>]+>\s*\{(.*?)\}\s*\}", query, re.DOTALL)
+        block_match = _BLOCK_RE.search(query)
         if not block_match:
             return [], {}
         block = block_match.group(1)
@@ -108,21 +302,27 @@ class StubFusekiClient:
                 continue
             if line.endswith("."):
                 line = line[:-1].strip()
-            parts = shlex.split(line)
-            if len(parts) == 3:
+            parts = _split_triple(line)
+            # 全变量模式（如 ?s ?p ?o）对任意三元组恒成立，解析时直接丢弃，匹配阶段无需格式化 token
+            if len(parts) == 3 and not all(part.startswith("?") for part in parts):
                 patterns.append(parts)
         return patterns, filters
 
     def _collect_filter(self, line: str, filters: dict[str, Any]) -> None:
         """解析 FILTER 条件，记录主语前缀、谓词白名单或对象类型。"""
 
-        prefix_match = re.search(r'STRSTARTS\(STR\(\?s\), "([^"]*)"\)', line)
-        if prefix_match:
-            filters["subject_prefix"] = prefix_match.group(1)
-        whitelist_match = re.search(r"\?p IN \(([^)]+)\)", line)
-        if whitelist_match:
-            values = [token.strip() for token in whitelist_match.group(1).split() if token.strip()]
-            filters["predicate_whitelist"] = [value.strip("<>") for value in values]
+        start = line.find(_PREFIX_MARK)
+        if start >= 0:
+            start += len(_PREFIX_MARK)
+            end = line.find('"', start)
+            if end >= 0:
+                filters["subject_prefix"] = line[start:end]
+        start = line.find(_WHITELIST_MARK)
+        if start >= 0:
+            start += len(_WHITELIST_MARK)
+            end = line.find(")", start)
+            if end > start:
+                filters["predicate_whitelist"] = frozenset(token.translate(_ANGLE_BRACKETS) for token in line[start:end].split())
         if "isIRI(?o)" in line:
             filters["object_type"] = "IRI"
         if "isLiteral(?o)" in line:
@@ -133,7 +333,7 @@ class StubFusekiClient:
 
         if not patterns:
             return True
-        subject_token, predicate_token, object_token = self._triple_tokens(triple)
+        subject_token, predicate_token, object_token = _triple_tokens(triple)
         for parts in patterns:
             if len(parts) != 3:
                 continue
@@ -145,35 +345,6 @@ class StubFusekiClient:
                 return False
         return True
 
-    def _match_filters(self, triple: tuple[str, str, tuple[str, str]], filters: dict[str, Any]) -> bool:
-        """按照解析出的过滤器判定三元组是否满足要求。"""
-
-        subject, predicate, (obj_type, obj_value) = triple
-        prefix = filters.get("subject_prefix")
-        if prefix and not subject.startswith(prefix):
-            return False
-        whitelist = filters.get("predicate_whitelist")
-        if whitelist and predicate not in whitelist:
-            return False
-        obj_limit = filters.get("object_type")
-        if obj_limit == "IRI" and obj_type != "uri":
-            return False
-        if obj_limit == "Literal" and obj_type != "literal":
-            return False
-        return True
-
-    def _triple_tokens(self, triple: tuple[str, str, tuple[str, str]]) -> tuple[str, str, str]:
-        """将内部三元组表示转换为 SPARQL Token。"""
-
-        subject, predicate, (obj_type, obj_value) = triple
-        subject_token = f"<{subject}>"
-        predicate_token = f"<{predicate}>"
-        if obj_type == "uri":
-            object_token = f"<{obj_value}>"
-        else:
-            object_token = f'"{obj_value}"'
-        return subject_token, predicate_token, object_token
-
     def _token_match(self, token: str, actual: str) -> bool:
         """判断模式 token 与实际 token 是否匹配。"""
 
@@ -184,32 +355,21 @@ class StubFusekiClient:
     def _to_binding(self, triple: tuple[str, str, tuple[str, str]]) -> dict[str, Any]:
         """将内部三元组转换为 SPARQL JSON Binding。"""
 
-        subject, predicate, (obj_type, obj_value) = triple
-        binding = {
-            "s": {"type": "uri", "value": subject},
-            "p": {"type": "uri", "value": predicate},
+        obj = triple[2]
+        return {
+            "s": {"type": "uri", "value": triple[0]},
+            "p": {"type": "uri", "value": triple[1]},
+            "o": {"type": "uri" if obj[0] == "uri" else "literal", "value": obj[1]},
         }
-        binding["o"] = {
-            "type": "uri" if obj_type == "uri" else "literal",
-            "value": obj_value,
-        }
-        return binding
 
 
-@pytest_asyncio.fixture
-async def manager(monkeypatch: pytest.MonkeyPatch) -> NamedGraphManager:
-    """构造带桩客户端的 NamedGraphManager 实例。"""
+@pytest.fixture(scope="session")
+def _shared_fixture_data() -> SimpleNamespace:
+    """整个会话只构造一次的配置、目标图 IRI 与初始三元组。"""
 
     settings = Settings()
-    dummy_config = SimpleNamespace(settings=settings, security=settings.security)
-    monkeypatch.setattr(ConfigManager, "current", classmethod(lambda cls: dummy_config))
-
     graph_iri = settings.rdf.naming.graph_format.format(model="test", version="v1", env="dev")
-    bulk_triples = [
-        (f"http://example.com/bulk/{idx}", "http://example.com/bulk", ("literal", f"bulk-{idx}"))
-        for idx in range(20)
-    ]
-    initial_triples = [
+    initial_triples = (
         ("http://example.com/specific/1", "http://example.com/pred", ("literal", "value-1")),
         (
             "http://example.com/specific/2",
@@ -223,9 +383,21 @@ async def manager(monkeypatch: pytest.MonkeyPatch) -> NamedGraphManager:
         ),
         ("http://example.com/other/1", "http://example.com/toDelete", ("literal", "x")),
         ("http://example.com/other/2", "http://example.com/toDelete", ("literal", "y")),
-    ] + bulk_triples
+    ) + _BULK_TRIPLES
+    return SimpleNamespace(settings=settings, graph_iri=graph_iri, initial_triples=initial_triples)
+
+
+@pytest_asyncio.fixture
+async def manager(monkeypatch: pytest.MonkeyPatch, _shared_fixture_data: SimpleNamespace) -> NamedGraphManager:
+    """构造带桩客户端的 NamedGraphManager 实例；仅桩客户端的可变数据按用例新建。"""
+
+    settings = _shared_fixture_data.settings
+    dummy_config = SimpleNamespace(settings=settings, security=settings.security)
+    monkeypatch.setattr(ConfigManager, "current", classmethod(lambda cls: dummy_config))
 
-    client = StubFusekiClient({graph_iri: initial_triples})
+    client = StubFusekiClient(
+        initial_data_factory=lambda: {_shared_fixture_data.graph_iri: _shared_fixture_data.initial_triples}
+    )
     return NamedGraphManager(client=client, settings=settings)
 
 
@@ -2,59 +2,46 @@ from __future__ import annotations
 
 """GraphProjectionBuilder 过滤规则与限制策略测试。"""
 
+from unittest.mock import AsyncMock
+
 import pytest
 
-from common.config import ConfigManager
-from common.config.settings import GraphConfig, GraphProjectionProfileConfig
-from types import SimpleNamespace
+from common.config.settings import GraphProjectionProfileConfig
+from common.exceptions import APIError
 from sf_rdf_acl.graph.projection import GraphProjectionBuilder
 from sf_rdf_acl.query.dsl import GraphRef, QueryDSL
 
 
-ConfigManager.load()
-
-
-class _StubClient:
-    def __init__(self) -> None:
-        self.last_query: str | None = None
-
-    async def select(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        self.last_query = query
-        return {
-            "bindings": [
-                {
-                    "s": {"type": "uri", "value": "urn:a"},
-                    "p": {"type": "uri", "value": "http://semanticforge.ai/ontologies/core#relatesTo"},
-                    "o": {"type": "uri", "value": "urn:b"},
-                    "sourceType": {"type": "uri", "value": "ex:Node"},
-                    "targetType": {"type": "uri", "value": "ex:Node"},
-                },
-                {
-                    "s": {"type": "uri", "value": "urn:a"},
-                    "p": {"type": "uri", "value": "http://semanticforge.ai/ontologies/core#filtered"},
-                    "o": {"type": "literal", "value": "label"},
-                },
-            ],
-            "stats": {"status": 200},
-        }
+# 桩客户端 select 返回的固定绑定
+_SELECT_RESULT = {
+    "bindings": [
+        {
+            "s": {"type": "uri", "value": "urn:a"},
+            "p": {"type": "uri", "value": "http://semanticforge.ai/ontologies/core#relatesTo"},
+            "o": {"type": "uri", "value": "urn:b"},
+            "sourceType": {"type": "uri", "value": "ex:Node"},
+            "targetType": {"type": "uri", "value": "ex:Node"},
+        },
+        {
+            "s": {"type": "uri", "value": "urn:a"},
+            "p": {"type": "uri", "value": "http://semanticforge.ai/ontologies/core#filtered"},
+            "o": {"type": "literal", "value": "label"},
+        },
+    ],
+    "stats": {"status": 200},
+}
 
 
 @pytest.mark.asyncio
-async def test_projection_filters_edges_and_literals() -> None:
-    base_settings = ConfigManager.current().settings
+async def test_projection_filters_edges_and_literals(make_settings, fuseki_stub: AsyncMock) -> None:
     profile = GraphProjectionProfileConfig(
         edge_predicates=["sf:relatesTo"],
         include_literals=False,
         limit=100,
     )
-    settings = SimpleNamespace(
-        graph=GraphConfig(projection_profiles={"default": profile}),
-        rdf=base_settings.rdf,
-        security=base_settings.security,
-        app=base_settings.app,
-        postgres=getattr(base_settings, "postgres", SimpleNamespace(dsn="postgres://", schema="public")),
-    )
-    builder = GraphProjectionBuilder(client=_StubClient(), settings=settings)
+    settings = make_settings(profile)
+    fuseki_stub.select.return_value = _SELECT_RESULT
+    builder = GraphProjectionBuilder(client=fuseki_stub, settings=settings)
     result = await builder.to_graphjson(
         GraphRef(name="urn:test"),
         profile="default",
@@ -73,18 +60,12 @@ async def test_projection_filters_edges_and_literals() -> None:
 
 
 @pytest.mark.asyncio
-async def test_projection_limit_violation_raises_error() -> None:
-    base_settings = ConfigManager.current().settings
+async def test_projection_limit_violation_raises_error(make_settings, fuseki_stub: AsyncMock) -> None:
     profile = GraphProjectionProfileConfig(limit=1)
-    settings = SimpleNamespace(
-        graph=GraphConfig(projection_profiles={"default": profile}),
-        rdf=base_settings.rdf,
-        security=base_settings.security,
-        app=base_settings.app,
-        postgres=getattr(base_settings, "postgres", SimpleNamespace(dsn="postgres://", schema="public")),
-    )
-    builder = GraphProjectionBuilder(client=_StubClient(), settings=settings)
-    with pytest.raises(Exception):
+    settings = make_settings(profile)
+    fuseki_stub.select.return_value = _SELECT_RESULT
+    builder = GraphProjectionBuilder(client=fuseki_stub, settings=settings)
+    with pytest.raises(APIError):
         await builder.to_graphjson(
             GraphRef(name="urn:test"),
             profile="default",
@@ -2,33 +2,26 @@ from __future__ import annotations
 
 """NamedGraphManager create 行为测试：已存在与新创建分支。"""
 
+from unittest.mock import AsyncMock
+
 import pytest
 
 from common.config import ConfigManager
 from common.exceptions import ExternalServiceError
 from common.exceptions.codes import ErrorCode
+from sf_rdf_acl.connection.client import FusekiClient
 from sf_rdf_acl.graph.named_graph import NamedGraphManager
 from sf_rdf_acl.query.dsl import GraphRef
 
 
 ConfigManager.load()
-
-
-class _CreateClient:
-    def __init__(self, *, already_exists: bool) -> None:
-        self.already_exists = already_exists
-        self.update_calls: list[str] = []
-
-    async def update(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        self.update_calls.append(query)
-        if self.already_exists:
-            raise ExternalServiceError(ErrorCode.FUSEKI_QUERY_ERROR, "Graph already exists", details={})
-        return {"status": 200}
+_SETTINGS = ConfigManager.current().settings
 
 
 @pytest.mark.asyncio
-async def test_create_returns_exists_when_backend_reports_already() -> None:
-    manager = NamedGraphManager(client=_CreateClient(already_exists=True), settings=ConfigManager.current().settings)
+async def test_create_returns_exists_when_backend_reports_already(fuseki_stub: AsyncMock) -> None:
+    fuseki_stub.update.side_effect = ExternalServiceError(ErrorCode.FUSEKI_QUERY_ERROR, "Graph already exists", details={})
+    manager = NamedGraphManager(client=fuseki_stub, settings=_SETTINGS)
     graph = GraphRef(name="urn:test")
 
     result = await manager.create(graph, trace_id="trace")
@@ -37,11 +30,24 @@ async def test_create_returns_exists_when_backend_reports_already() -> None:
 
 
 @pytest.mark.asyncio
-async def test_create_success_returns_created() -> None:
-    manager = NamedGraphManager(client=_CreateClient(already_exists=False), settings=ConfigManager.current().settings)
+async def test_create_success_returns_created(fuseki_stub: AsyncMock) -> None:
+    manager = NamedGraphManager(client=fuseki_stub, settings=_SETTINGS)
     graph = GraphRef(name="urn:test")
 
     result = await manager.create(graph, trace_id="trace")
 
     assert result["status"] == "created"
 
+
+@pytest.mark.asyncio
+async def test_manager_closes_only_its_own_client(fuseki_stub: AsyncMock, monkeypatch: pytest.MonkeyPatch) -> None:
+    closed = AsyncMock()
+    monkeypatch.setattr(FusekiClient, "aclose", closed)
+
+    async with NamedGraphManager(settings=_SETTINGS):
+        pass
+    async with NamedGraphManager(client=fuseki_stub, settings=_SETTINGS):
+        pass
+
+    closed.assert_awaited_once()
+    fuseki_stub.aclose.assert_not_awaited()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 """ProvenanceService 生成证明三元组的语句覆盖测试。"""
 
+from unittest.mock import AsyncMock
+
 import pytest
 
 from common.config import ConfigManager
@@ -13,18 +15,9 @@ from sf_rdf_acl.transaction.upsert import Provenance, Triple
 ConfigManager.load()
 
 
-class _StubClient:
-    def __init__(self) -> None:
-        self.last_update: str | None = None
-
-    async def update(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> None:
-        self.last_update = query
-
-
 @pytest.mark.asyncio
-async def test_provenance_statements_cover_all_fields() -> None:
-    client = _StubClient()
-    service = ProvenanceService(client=client)
+async def test_provenance_statements_cover_all_fields(fuseki_stub: AsyncMock) -> None:
+    service = ProvenanceService(client=fuseki_stub)
     graph = GraphRef(name="urn:test")
     triples = [
         Triple(s="urn:s", p="urn:p", o="urn:o"),
@@ -44,5 +37,6 @@ async def test_provenance_statements_cover_all_fields() -> None:
     assert "sf:pipeline \"daily\"" in statements
     assert "sf:attempt 2" in statements
     assert "sf:success true" in statements
-    assert client.last_update is not None and "INSERT DATA" in client.last_update
+    fuseki_stub.update.assert_awaited_once()
+    assert "INSERT DATA" in fuseki_stub.update.await_args.args[0]
 
@@ -63,6 +63,23 @@ def test_group_by_and_having_clause(builder: SPARQLQueryBuilder) -> None:
     assert "COUNT(DISTINCT ?s) AS ?cnt" in sparql, "DISTINCT 聚合未生效"
 
 
+def test_solution_modifiers_follow_sparql_order(builder: SPARQLQueryBuilder) -> None:
+    """验证聚合查询显式排序时，子句按 GROUP BY → HAVING → ORDER BY → LIMIT 的语法顺序输出。"""
+
+    dsl = QueryDSL(
+        type="entity",
+        aggregations=[Aggregation(function="COUNT", variable="?s", alias="?cnt")],
+        group_by=GroupBy(variables=["?type"]),
+        having=[Filter(field="?cnt", operator=">", value=1)],
+        sort={"by": "cnt", "order": "desc"},
+    )
+
+    sparql = builder.build_select(dsl)
+
+    positions = [sparql.index(keyword) for keyword in ("GROUP BY", "HAVING", "ORDER BY DESC(?cnt)", "LIMIT")]
+    assert positions == sorted(positions), "结果修饰子句顺序不符合 SPARQL 语法"
+
+
 def test_group_concat_with_separator_and_distinct(builder: SPARQLQueryBuilder) -> None:
     """验证 GROUP_CONCAT 支持 DISTINCT 与分隔符参数，确保生成的语法包含正确的转义。"""
 
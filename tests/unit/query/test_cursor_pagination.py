@@ -8,6 +8,9 @@
 - 端到端分页：构造真实图数据（Fuseki），逐页拉取，验证无重复与 has_more 判断
 """
 
+import asyncio
+import base64
+import json
 import uuid
 from typing import Any
 
@@ -35,6 +38,26 @@ class TestCursorPagination:
         assert decoded["value"] == "http://example.com/resource/100"
         assert decoded["type"] == "uri"
 
+    def test_encode_cursor_defaults_missing_type_to_uri(self) -> None:
+        """单元格 type 为 None 时按 uri 处理。"""
+
+        cursor = CursorPagination.encode_cursor({"s": {"value": "http://example.com/1", "type": None}}, "?s")
+        assert CursorPagination.decode_cursor(cursor) == {"type": "uri", "value": "http://example.com/1"}
+
+    def test_encode_cursor_keeps_none_value_distinct_from_empty(self) -> None:
+        """value 为 None 与空串的游标解码后应保持区分。"""
+
+        missing = CursorPagination.encode_cursor({"v": {"value": None, "type": "literal"}}, "?v")
+        empty = CursorPagination.encode_cursor({"v": {"value": "", "type": "literal"}}, "?v")
+        assert CursorPagination.decode_cursor(missing) == {"type": "literal", "value": None}
+        assert CursorPagination.decode_cursor(empty) == {"type": "literal", "value": ""}
+
+    def test_decode_legacy_json_cursor(self) -> None:
+        """旧版 JSON 载荷的游标仍可解析。"""
+
+        legacy = base64.urlsafe_b64encode(json.dumps({"type": "literal", "value": "标签"}).encode("utf-8")).decode("ascii")
+        assert CursorPagination.decode_cursor(legacy) == {"type": "literal", "value": "标签"}
+
     def test_cursor_filter_uri(self) -> None:
         """针对 IRI 的 STR 比较过滤。"""
 
@@ -49,6 +72,20 @@ class TestCursorPagination:
         filter_str = CursorPagination.build_cursor_filter(cursor_data, "?value")
         assert "?value >" in filter_str
 
+    def test_cursor_template_matches_direct_build(self) -> None:
+        """模板渲染结果与逐页构建的查询一致。"""
+
+        builder = SPARQLQueryBuilder()
+        dsl = QueryDSL(type="entity")
+        graph = "http://example.com/graph/paging"
+        template = builder.build_select_with_cursor_template(dsl, 5, "?s", graph=graph)
+        cursor = CursorPagination.encode_cursor({"s": {"value": "http://example.com/resource/100", "type": "uri"}}, "?s")
+        for value in (None, cursor):
+            expected = builder.build_select_with_cursor(dsl, CursorPage(cursor=value, size=5), "?s", graph=graph)
+            assert template.render(value) == expected
+        assert "STR(?s) >" in template.render(cursor)
+        assert "FILTER" not in template.render(None)
+
 
 @pytest.fixture(scope="session")
 def settings() -> Settings:
@@ -75,9 +112,9 @@ def fuseki_client(settings: Settings) -> FusekiClient:
     )
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="module")
 async def paging_graph(settings: Settings):
-    """构造一个用于分页测试的命名图并清理。"""
+    """构造一个用于分页测试的命名图并清理；用例只读，模块内共享一次建图与写入。"""
 
     from sf_rdf_acl.graph.named_graph import NamedGraphManager
 
@@ -135,19 +172,22 @@ async def test_pagination_no_duplicates(fuseki_client: FusekiClient, paging_grap
 
     graph_iri = paging_graph["graph_iri"]
     seen: set[str] = set()
-    cursor = None
     page_count = 0
 
+    # 拿到下一页游标后立即预取，处理当前页与下一页请求重叠进行
+    page = await _fetch_page(fuseki_client, graph_iri, CursorPage(cursor=None, size=2))
     while True:
-        cp = CursorPage(cursor=cursor, size=2)
-        page = await _fetch_page(fuseki_client, graph_iri, cp)
-        for item in page.results:
-            sid = item["s"]["value"]
-            assert sid not in seen, f"Duplicate: {sid}"
-            seen.add(sid)
-        if not page.has_more:
+        next_task = (
+            asyncio.create_task(_fetch_page(fuseki_client, graph_iri, CursorPage(cursor=page.next_cursor, size=2)))
+            if page.has_more
+            else None
+        )
+        prior = len(seen)
+        seen.update(item["s"]["value"] for item in page.results)
+        assert len(seen) == prior + len(page.results), f"Duplicate in page {page_count}"
+        if next_task is None:
             break
-        cursor = page.next_cursor
+        page = await next_task
         page_count += 1
         assert page_count < 1000
 
@@ -2,8 +2,8 @@ from __future__ import annotations
 
 """SPARQLQueryBuilder 基础构建能力测试。"""
 
-import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 
 from sf_rdf_acl.query.builder import SPARQLQueryBuilder
 from sf_rdf_acl.query.dsl import Filter, Page, QueryDSL, TimeWindow
@@ -48,7 +48,23 @@ def test_build_construct_uses_construct_block() -> None:
 
     query = builder.build_construct(dsl)
 
+    normalized = " ".join(query.split())
     assert query.startswith("PREFIX")
-    assert "CONSTRUCT" in query
-    assert re.search(r"CONSTRUCT\s*{\s*\?s \?p \?o .\s*}", query)
+    assert "CONSTRUCT { ?s ?p ?o . }" in normalized
 
+
+def test_build_select_renders_equal_but_distinct_values() -> None:
+    builder = SPARQLQueryBuilder(default_prefixes={"ex": "http://example.com/"})
+
+    def filter_line(value: object) -> str:
+        query = builder.build_select(QueryDSL(type="entity", filters=[Filter(field="ex:v", op="=", value=value)]))
+        return next(line.strip() for line in query.splitlines() if "FILTER" in line)
+
+    # 取值相等但文本不同，重复构建时不能复用先前的查询文本
+    assert filter_line(Decimal("1.0")) == 'FILTER(?f0 = "1.0")'
+    assert filter_line(Decimal("1.00")) == 'FILTER(?f0 = "1.00")'
+    assert filter_line(datetime(2024, 1, 1, tzinfo=timezone.utc)) == 'FILTER(?f0 = "2024-01-01T00:00:00Z"^^xsd:dateTime)'
+    assert filter_line(datetime(2024, 1, 1, 8, tzinfo=timezone(timedelta(hours=8)))) == (
+        'FILTER(?f0 = "2024-01-01T08:00:00+08:00"^^xsd:dateTime)'
+    )
+    assert filter_line(True) != filter_line(1)
@@ -56,6 +56,77 @@ def test_build_select_with_time_window_and_literals() -> None:
     assert "FILTER(?__time <= \"2024-12-31T00:00:00" in query
 
 
+def test_build_select_renders_params_for_same_shape() -> None:
+    builder = _builder()
+
+    def make_dsl(name: str, low: int, day: int, offset: int) -> QueryDSL:
+        return QueryDSL(
+            type="entity",
+            filters=[
+                Filter(field="ex:name", op="=", value=name),
+                Filter(field="ex:score", op="range", value={"gte": low}),
+            ],
+            time_window=TimeWindow(gte=datetime(2024, 1, day)),
+            page=Page(size=10, offset=offset),
+        )
+
+    first = builder.build_select(make_dsl("Alpha", 1, 1, 10))
+    second_dsl = make_dsl('Be"ta', 5, 2, 20)
+    second = builder.build_select(second_dsl)
+
+    template, params = builder.build_select_template(second_dsl)
+    assert template == builder.build_select_template(make_dsl("Alpha", 1, 1, 10))[0]
+    assert second == template.render(params)
+    assert "FILTER(?f0 = \"Be\\\"ta\")" in second and "FILTER(?f1 >= 5)" in second
+    assert "OFFSET 20" in second and first != second
+
+
+def test_build_select_template_renders_same_query() -> None:
+    builder = _builder()
+
+    def make_dsl(name: str, size: int) -> QueryDSL:
+        return QueryDSL(type="entity", filters=[Filter(field="ex:name", op="=", value=name)], page=Page(size=size))
+
+    template, params = builder.build_select_template(make_dsl("Alpha", 10))
+    other_template, other_params = builder.build_select_template(make_dsl("Beta", 20))
+
+    assert template == other_template and template.param_count == 2
+    assert params == ['"Alpha"', "10"] and other_params == ['"Beta"', "20"]
+    assert template.render(other_params) == builder.build_select(make_dsl("Beta", 20))
+    with pytest.raises(ValueError):
+        template.render(params[:1])
+
+
+def test_in_filter_dedupes_and_switches_to_values_for_large_lists() -> None:
+    builder = _builder()
+
+    small = builder.build_select(
+        QueryDSL(type="entity", filters=[Filter(field="ex:status", op="in", value=["open", "open", True, 1])])
+    )
+    large = builder.build_select(
+        QueryDSL(type="entity", filters=[Filter(field="ex:id", op="in", value=[f"id-{i}" for i in range(60)] * 2)])
+    )
+
+    assert "FILTER(?f0 IN (\"open\", true, 1))" in small
+    assert 'VALUES ?f0 { "id-0" "id-1" ' in large and ' "id-59" }' in large
+    assert "IN (" not in large and large.count('"id-59"') == 1
+
+
+def test_in_filter_keeps_in_for_large_typed_lists() -> None:
+    builder = _builder()
+
+    # VALUES 按 RDF 项精确匹配，会丢失 1 与 1.0 等数值的按值比较语义，类型化取值始终使用 IN
+    numbers = builder.build_select(
+        QueryDSL(type="entity", filters=[Filter(field="ex:score", op="in", value=list(range(60)))])
+    )
+    mixed = builder.build_select(
+        QueryDSL(type="entity", filters=[Filter(field="ex:id", op="in", value=[f"id-{i}" for i in range(60)] + [1.5])])
+    )
+
+    assert "FILTER(?f0 IN (0, 1, 2, " in numbers and "VALUES" not in numbers
+    assert "FILTER(?f0 IN (" in mixed and ", 1.5))" in mixed and "VALUES" not in mixed
+
+
 def test_unknown_prefix_raises_value_error() -> None:
     builder = _builder()
     dsl = QueryDSL(type="entity", filters=[Filter(field="unknown:attr", op="=", value="x")])
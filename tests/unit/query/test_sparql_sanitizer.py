@@ -51,6 +51,17 @@ class TestSPARQLSanitizer:
         result = SPARQLSanitizer.escape_literal('Hello "World"')
         assert result == '"Hello \\\"World\\\""'.replace('\\\\', '\\'), "字面量转义不正确"
 
+    def test_escape_literal_escapes_control_whitespace(self) -> None:
+        """换行/回车/制表符应转义为 SPARQL 转义序列，避免生成非法的短字符串字面量。"""
+
+        assert SPARQLSanitizer.escape_literal("a\nb\r\tc") == '"a\\nb\\r\\tc"'
+
+    def test_escape_uri_rejects_whitespace(self) -> None:
+        """IRI 中出现空白字符时应被拒绝。"""
+
+        with pytest.raises(ValueError):
+            SPARQLSanitizer.escape_uri("http://example.com/a b")
+
     def test_escape_literal_with_datatype(self) -> None:
         """测试带数据类型的字面量表达式。"""
 
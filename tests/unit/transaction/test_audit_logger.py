@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+"""AuditLogger 写入测试：使用内存 Engine 桩记录执行的 SQL 与参数。"""
+
+import asyncio
+import threading
+from typing import Any
+
+import pytest
+
+from sf_rdf_acl.transaction.audit import AuditLogger
+
+
+class _Result:
+    def __init__(self, value: int) -> None:
+        self._value = value
+
+    def scalar_one(self) -> int:
+        return self._value
+
+
+class _Conn:
+    def __init__(self, engine: "_Engine") -> None:
+        self._engine = engine
+
+    def __enter__(self) -> "_Conn":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def execute(self, sql: Any, params: Any) -> _Result:
+        if self._engine.fail:
+            raise RuntimeError("db down")
+        self._engine.calls.append((str(sql), params))
+        self._engine.threads.append(threading.current_thread().name)
+        return _Result(len(self._engine.calls))
+
+
+class _Engine:
+    def __init__(self, *, fail: bool = False) -> None:
+        self.fail = fail
+        self.calls: list[tuple[str, Any]] = []
+        self.threads: list[str] = []
+        self.transactions = 0
+
+    def begin(self) -> _Conn:
+        self.transactions += 1
+        return _Conn(self)
+
+
+def _request_kwargs(trace_id: str, status_code: int = 200) -> dict[str, Any]:
+    return {
+        "trace_id": trace_id,
+        "route": "/rdf/query",
+        "method": "POST",
+        "status_code": status_code,
+        "duration_ms": 12.5,
+        "params_hash": "hash",
+    }
+
+
+def test_log_operation_success_and_failure() -> None:
+    engine = _Engine()
+    logger = AuditLogger("postgresql://unused", "audit", engine=engine)
+    audit_id = logger.log_operation(
+        op_type="rdf.upsert",
+        graph_iri="urn:g",
+        tx_id="tx",
+        trace_id="t-op",
+        request_hash="h",
+        result_status="success",
+        latency_ms=3.7,
+    )
+    assert audit_id == "1"
+    sql, params = engine.calls[0]
+    assert "audit.rdf_operation_audit" in sql
+    assert params["actor"] == "system" and params["latency_ms"] == 3
+
+    failing = AuditLogger("postgresql://unused", "audit", engine=_Engine(fail=True))
+    assert failing.log_operation(
+        op_type="rdf.upsert",
+        graph_iri="urn:g",
+        tx_id="tx",
+        trace_id="t-op",
+        request_hash="h",
+        result_status="failed",
+        latency_ms=1.0,
+    ) is None
+
+
+@pytest.mark.asyncio
+async def test_log_request_async_batches_rows_until_close() -> None:
+    engine = _Engine()
+    logger = AuditLogger("postgresql://unused", "audit", engine=engine, batch_size=10)
+
+    for index in range(3):
+        await logger.log_request_async(**_request_kwargs(f"t-{index}"))
+    await logger.log_request_async(**_request_kwargs("t-1", status_code=500))
+    await logger.aclose()
+
+    assert engine.transactions == 1
+    sql, params = engine.calls[0]
+    assert len(engine.threads) == 1 and engine.threads[0].startswith("sf-audit")
+    assert [row["trace_id"] for row in params] == ["t-0", "t-1", "t-2"]
+    assert params[1]["status_code"] == 500
+    assert engine.threads == ["sf-audit_0"]
+
+
+@pytest.mark.asyncio
+async def test_log_operation_async_runs_on_audit_executor() -> None:
+    engine = _Engine()
+    logger = AuditLogger("postgresql://unused", "audit", engine=engine)
+
+    audit_id = await logger.log_operation_async(
+        op_type="rdf.upsert",
+        graph_iri="urn:g",
+        tx_id="tx",
+        trace_id="t-op-async",
+        request_hash="h",
+        result_status="success",
+        latency_ms=2.0,
+    )
+    await logger.aclose()
+
+    assert audit_id == "1"
+    assert engine.threads[0].startswith("sf-audit")
+
+
+@pytest.mark.asyncio
+async def test_log_request_async_swallows_write_errors() -> None:
+    logger = AuditLogger("postgresql://unused", "audit", engine=_Engine(fail=True))
+
+    await logger.log_request_async(**_request_kwargs("t-fail"))
+    await logger.aclose()
+    await logger.aclose()
+
+
+def test_log_request_async_rebinds_writer_to_new_loop() -> None:
+    engine = _Engine()
+    logger = AuditLogger("postgresql://unused", "audit", engine=engine, batch_size=10)
+
+    async def enqueue(trace_id: str) -> None:
+        await logger.log_request_async(**_request_kwargs(trace_id))
+
+    async def enqueue_and_close(trace_id: str) -> None:
+        await enqueue(trace_id)
+        await logger.aclose()
+
+    # 旧循环关闭时不取消任务：写入任务停在已关闭的循环上，既未完成也不会再被调度
+    old_loop = asyncio.new_event_loop()
+    try:
+        old_loop.run_until_complete(enqueue("t-0"))
+        while not engine.calls:
+            old_loop.run_until_complete(asyncio.sleep(0.01))
+    finally:
+        old_loop.close()
+    asyncio.run(enqueue_and_close("t-1"))
+
+    assert [params["trace_id"] for _, params in engine.calls] == ["t-0", "t-1"]
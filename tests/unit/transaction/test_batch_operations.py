@@ -7,6 +7,7 @@ from __future__ import annotations
 - 失败批次的单条重试与失败记录
 """
 
+import asyncio
 import uuid
 from typing import Any
 
@@ -47,8 +48,10 @@ def fuseki_client(settings: Settings) -> FusekiClient:
     )
 
 
-@pytest_asyncio.fixture
+@pytest_asyncio.fixture(scope="module")
 async def batch_graph(settings: Settings):
+    """模块内共享的批处理目标图；各用例写入不同谓词，互不干扰。"""
+
     mgr = NamedGraphManager()
     unique = uuid.uuid4().hex
     graph_ref = GraphRef(model="batch", version=f"v{unique[:8]}", env="dev")
@@ -117,3 +120,84 @@ async def test_large_batch_and_retry(fuseki_client: FusekiClient, batch_graph: d
     count_val = int(check["bindings"][0]["cnt"]["value"]) if check["bindings"] else 0
     assert count_val >= res.success - 5  # 近似校验，避免后端延迟写导致瞬时差异
 
+
+class _ConcurrencyProbeClient:
+    """记录同时在途的 UPDATE 数量，并拒绝包含错误绑定的批次。"""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self.updates: list[str] = []
+
+    async def update(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if "unterminated_literal" in query:
+                raise RuntimeError("syntax error")
+            self.updates.append(query)
+            return {"status": 200}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_batches_run_concurrently_within_limit() -> None:
+    client = _ConcurrencyProbeClient()
+    operator = BatchOperator(client, batch_size=10, max_retries=1, max_concurrency=2)
+    bindings = [{"?s": f"<http://example.com/c/{i:03d}>", "?o": f'"v{i:03d}"'} for i in range(50)]
+    bindings.insert(5, {"?s": "<http://example.com/c/bad>", "?o": "unterminated_literal"})
+
+    res = await operator.apply_template(
+        BatchTemplate(pattern="{?s} <http://example.com/p> {?o} .", bindings=bindings),
+        "urn:test",
+        trace_id="test-batch-concurrency",
+    )
+
+    assert client.peak == 2
+    assert res.total == 51 and res.success == 50 and res.failed == 1
+    assert res.failed_items == [bindings[5]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_retries_bindings_concurrently() -> None:
+    client = _ConcurrencyProbeClient()
+    operator = BatchOperator(client, batch_size=10, max_retries=1, max_concurrency=4)
+    bindings = [{"?s": f"<http://example.com/r/{i:03d}>", "?o": f'"v{i:03d}"'} for i in range(9)]
+    bindings.insert(3, {"?s": "<http://example.com/r/bad>", "?o": "unterminated_literal"})
+
+    res = await operator.apply_template(
+        BatchTemplate(pattern="{?s} <http://example.com/p> {?o} .", bindings=bindings),
+        "urn:test",
+        trace_id="test-batch-retry-concurrency",
+    )
+
+    # 单批失败后，10 条单条重试在并发上限内同时进行
+    assert client.peak == 4
+    assert res.success == 9 and res.failed_items == [bindings[3]]
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_renders_template_once_per_binding() -> None:
+    client = _ConcurrencyProbeClient()
+    operator = BatchOperator(client, batch_size=10, max_retries=1)
+    bindings = [
+        {"?s": "<http://example.com/r/1>", "?o": '"{?s}"'},
+        {"?s": "<http://example.com/r/2>"},
+    ]
+
+    res = await operator.apply_template(
+        BatchTemplate(pattern="{?s} <http://example.com/p> {?o} .", bindings=bindings),
+        "urn:test",
+        trace_id="test-batch-render",
+    )
+
+    assert res.success == 2
+    assert client.updates == [
+        "INSERT DATA {\n"
+        "  GRAPH <urn:test> {\n"
+        '    <http://example.com/r/1> <http://example.com/p> "{?s}" . <http://example.com/r/2> <http://example.com/p> {?o} .\n'
+        "  }\n"
+        "}"
+    ]
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 """TransactionManager 基础执行测试：验证 UPDATE 调用与审计记录。"""
 
-import asyncio
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -14,24 +14,6 @@ from sf_rdf_acl.transaction.upsert import Triple, UpsertRequest
 ConfigManager.load()
 
 
-class StubClient:
-    def __init__(self) -> None:
-        self.updates: list[str] = []
-
-    async def select(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        return {"bindings": []}
-
-    async def construct(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        return {"turtle": ""}
-
-    async def update(self, update: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        self.updates.append(update)
-        return {"status": 200, "durationMs": 1.0}
-
-    async def health(self) -> dict[str, str]:  # pragma: no cover
-        return {"ok": True}
-
-
 class StubAudit:
     async def log_operation_async(self, **kwargs):  # pragma: no cover
         return "audit-id"
@@ -41,9 +23,8 @@ class StubAudit:
 
 
 @pytest.mark.asyncio
-async def test_transaction_manager_executes_updates():
-    client = StubClient()
-    manager = TransactionManager(client=client, audit_logger=StubAudit())
+async def test_transaction_manager_executes_updates(fuseki_stub: AsyncMock):
+    manager = TransactionManager(client=fuseki_stub, audit_logger=StubAudit())
     request = UpsertRequest(
         graph={"name": "urn:sf:test"},
         triples=[Triple(s="http://example.com/a", p="http://example.com/name", o="Alice")],
@@ -53,7 +34,16 @@ async def test_transaction_manager_executes_updates():
 
     result = await manager.upsert(request, trace_id="trace-a", actor="tester")
 
-    assert client.updates, "预期至少执行一次 UPDATE"
+    assert fuseki_stub.update.await_count, "预期至少执行一次 UPDATE"
     assert result["applied"] == 1
     assert result.get("auditId") == "audit-id"
 
+
+@pytest.mark.asyncio
+async def test_transaction_manager_aclose_flushes_audit_logger(fuseki_stub: AsyncMock) -> None:
+    audit = AsyncMock()
+    manager = TransactionManager(client=fuseki_stub, audit_logger=audit)
+
+    await manager.aclose()
+
+    audit.aclose.assert_awaited_once()
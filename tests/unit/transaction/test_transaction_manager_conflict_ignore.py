@@ -2,6 +2,8 @@ from __future__ import annotations
 
 """TransactionManager 冲突忽略策略测试：存在即不更新。"""
 
+from unittest.mock import AsyncMock
+
 import pytest
 
 from common.config import ConfigManager
@@ -12,21 +14,6 @@ from sf_rdf_acl.transaction.upsert import Triple, UpsertRequest
 ConfigManager.load()
 
 
-class _ConflictClient:
-    def __init__(self) -> None:
-        self.update_calls = 0
-
-    async def select(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        return {"bindings": [{"s": {"type": "uri", "value": "urn:s"}}]}
-
-    async def construct(self, *args, **kwargs):  # pragma: no cover - not used
-        return {"turtle": ""}
-
-    async def update(self, *args, **kwargs):  # pragma: no cover - should not run for ignore conflict
-        self.update_calls += 1
-        return {"status": 200}
-
-
 class _StubAudit:
     async def log_operation_async(self, **kwargs):  # pragma: no cover
         return "audit-id"
@@ -36,9 +23,9 @@ class _StubAudit:
 
 
 @pytest.mark.asyncio
-async def test_transaction_manager_reports_ignore_conflict() -> None:
-    client = _ConflictClient()
-    manager = TransactionManager(client=client, audit_logger=_StubAudit())
+async def test_transaction_manager_reports_ignore_conflict(fuseki_stub: AsyncMock) -> None:
+    fuseki_stub.select.return_value = {"bindings": [{"s": {"type": "uri", "value": "urn:s"}}]}
+    manager = TransactionManager(client=fuseki_stub, audit_logger=_StubAudit())
     request = UpsertRequest(
         graph={"name": "urn:test"},
         triples=[Triple(s="urn:s", p="urn:p", o="literal")],
@@ -49,5 +36,6 @@ async def test_transaction_manager_reports_ignore_conflict() -> None:
 
     assert result["conflicts"]
     assert result["conflicts"][0]["key"]
-    assert client.update_calls == 0, "Ignore conflicts should not issue updates"
+    assert fuseki_stub.update.await_count == 0, "Ignore conflicts should not issue updates"
+    assert "auditId" not in result, "No-op ignore upserts should skip the audit log"
 
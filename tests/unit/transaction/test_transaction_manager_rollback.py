@@ -2,6 +2,8 @@ from __future__ import annotations
 
 """TransactionManager 回滚路径测试：失败后使用快照恢复。"""
 
+from unittest.mock import AsyncMock
+
 import pytest
 
 from common.config import ConfigManager
@@ -27,25 +29,16 @@ class _SnapshotPlanner(UpsertPlanner):
         return UpsertPlan(graph_iri="urn:test", statements=[statement], request_hash="hash")
 
 
-class _FailingClient:
-    def __init__(self) -> None:
-        self.update_calls: list[str] = []
-        self.construct_calls: list[str] = []
-        self._first = True
+_SNAPSHOT = {"turtle": '<urn:s> <urn:p> "literal" .'}
+_OK = {"status": 200}
+
 
-    async def select(self, *args, **kwargs):  # pragma: no cover - not used here
-        return {"bindings": []}
+def _boom() -> ExternalServiceError:
+    return ExternalServiceError(ErrorCode.FUSEKI_QUERY_ERROR, "boom", details={})
 
-    async def construct(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        self.construct_calls.append(query)
-        return {"turtle": '<urn:s> <urn:p> "literal" .'}
 
-    async def update(self, query: str, *, timeout: int | None = None, trace_id: str | None = None) -> dict:
-        self.update_calls.append(query)
-        if self._first:
-            self._first = False
-            raise ExternalServiceError(ErrorCode.FUSEKI_QUERY_ERROR, "boom", details={})
-        return {"status": 200}
+def _update_queries(stub: AsyncMock) -> list[str]:
+    return [call.args[0] for call in stub.update.await_args_list]
 
 
 class _StubAudit:
@@ -54,15 +47,48 @@ class _StubAudit:
 
 
 @pytest.mark.asyncio
-async def test_transaction_manager_rolls_back_on_failure() -> None:
-    client = _FailingClient()
-    manager = TransactionManager(planner=_SnapshotPlanner(), client=client, audit_logger=_StubAudit())
+async def test_transaction_manager_rolls_back_on_failure(fuseki_stub: AsyncMock) -> None:
+    fuseki_stub.construct.return_value = _SNAPSHOT
+    fuseki_stub.update.side_effect = [_boom(), _OK]
+    manager = TransactionManager(planner=_SnapshotPlanner(), client=fuseki_stub, audit_logger=_StubAudit())
     request = UpsertRequest(graph={"name": "urn:test"}, triples=[Triple(s="urn:s", p="urn:p", o="literal")])
 
     with pytest.raises(ExternalServiceError):
         await manager.upsert(request, trace_id="trace")
 
-    assert client.construct_calls, "Expected snapshot CONSTRUCT to be invoked"
-    assert len(client.update_calls) >= 2, "Rollback update should be executed"
-    assert "INSERT" in client.update_calls[-1]
+    update_calls = _update_queries(fuseki_stub)
+    assert fuseki_stub.construct.await_count, "Expected snapshot CONSTRUCT to be invoked"
+    assert len(update_calls) >= 2, "Rollback update should be executed"
+    assert "INSERT" in update_calls[-1]
+
+
+class _MultiSnapshotPlanner(UpsertPlanner):
+    def plan(self, request: UpsertRequest) -> UpsertPlan:
+        statements = []
+        for subject in ("urn:s1", "urn:s2"):
+            statements.append(
+                UpsertStatement(
+                    sparql=f"DELETE {{ <{subject}> ?p ?o }} WHERE {{ <{subject}> ?p ?o }}",
+                    key=f"s::{subject}",
+                    strategy="replace",
+                    triples=[Triple(s=subject, p="urn:p", o="literal")],
+                    requires_snapshot=True,
+                )
+            )
+        return UpsertPlan(graph_iri="urn:test", statements=statements, request_hash="hash")
+
+
+@pytest.mark.asyncio
+async def test_transaction_manager_batches_rollback_statements(fuseki_stub: AsyncMock) -> None:
+    fuseki_stub.construct.return_value = _SNAPSHOT
+    fuseki_stub.update.side_effect = [_OK, _boom(), _OK]
+    manager = TransactionManager(planner=_MultiSnapshotPlanner(), client=fuseki_stub)
+    request = UpsertRequest(graph={"name": "urn:test"}, triples=[Triple(s="urn:s1", p="urn:p", o="literal")])
+
+    with pytest.raises(ExternalServiceError):
+        await manager.upsert(request, trace_id="trace")
 
+    update_calls = _update_queries(fuseki_stub)
+    assert fuseki_stub.construct.await_count == 2
+    assert len(update_calls) == 3, "Rollback should be sent as a single UPDATE"
+    assert update_calls[-1].count("INSERT") == 2
@@ -9,10 +9,11 @@ from sf_rdf_acl.transaction.upsert import Triple, UpsertPlanner, UpsertRequest
 
 
 ConfigManager.load()
+_SETTINGS = ConfigManager.current().settings
 
 
 def test_custom_key_statement_contains_all_fields() -> None:
-    planner = UpsertPlanner()
+    planner = UpsertPlanner(_SETTINGS)
     request = UpsertRequest(
         graph={"name": "urn:sf:test"},
         triples=[
@@ -34,7 +35,7 @@ def test_custom_key_statement_contains_all_fields() -> None:
 
 
 def test_custom_key_with_invalid_field_raises() -> None:
-    planner = UpsertPlanner()
+    planner = UpsertPlanner(_SETTINGS)
     request = UpsertRequest(
         graph={"name": "urn:sf:test"},
         triples=[Triple(s="urn:s", p="urn:p", o="literal")],
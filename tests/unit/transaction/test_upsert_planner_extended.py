@@ -9,10 +9,11 @@ from sf_rdf_acl.transaction.upsert import Triple, UpsertPlanner, UpsertRequest
 
 
 ConfigManager.load()
+_SETTINGS = ConfigManager.current().settings
 
 
 def test_plan_replace_by_subject_predicate_generates_statement():
-    planner = UpsertPlanner()
+    planner = UpsertPlanner(_SETTINGS)
     request = UpsertRequest(
         graph={"name": "urn:sf:test"},
         triples=[
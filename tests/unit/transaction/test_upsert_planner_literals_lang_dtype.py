@@ -2,6 +2,9 @@ from __future__ import annotations
 
 """UpsertPlanner 字面量的类型与语言标记渲染测试。"""
 
+import pytest
+from pydantic import ValidationError
+
 from common.config import ConfigManager
 from sf_rdf_acl.transaction.upsert import Triple, UpsertPlanner, UpsertRequest
 
@@ -30,3 +33,21 @@ def test_literal_rendering_with_dtype_and_lang() -> None:
     assert '"bonjour"@fr' in sparql
     assert '<http://example.com/obj>' in sparql
 
+
+def test_literal_escaping_quotes_and_newlines() -> None:
+    planner = UpsertPlanner()
+    request = UpsertRequest(
+        graph={"name": "urn:sf:test"},
+        triples=[Triple(s="urn:s", p="urn:note", o='say "hi"\nback\\slash')],
+        upsert_key="s",
+        merge_strategy="append",
+    )
+
+    sparql = planner.plan(request).statements[0].sparql
+
+    assert '"say \\"hi\\"\\nback\\\\slash"' in sparql
+
+
+def test_triple_rejects_non_string_terms() -> None:
+    with pytest.raises(ValidationError):
+        Triple(s="urn:s", p="urn:p", o=5)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+"""resolve_graph_iri 命名图解析与渲染缓存测试。"""
+
+from common.config import ConfigManager
+from sf_rdf_acl.query.dsl import GraphRef
+from sf_rdf_acl.utils import _format_graph_iri, resolve_graph_iri
+
+
+ConfigManager.load()
+
+
+def test_resolve_graph_iri_caches_rendering_by_value() -> None:
+    settings = ConfigManager.current().settings
+    _format_graph_iri.cache_clear()
+
+    first = resolve_graph_iri(GraphRef(model="demo", version="v2", env="test", scenario_id="s1"), settings)
+    again = resolve_graph_iri(GraphRef(model="demo", version="v2", env="test", scenario_id="s1"), settings)
+    other = resolve_graph_iri(GraphRef(model="demo", version="v2", env="prod"), settings)
+
+    expected = settings.rdf.naming.graph_format.format(model="demo", version="v2", env="test")
+    assert first == again == f"{expected}:scenario:s1"
+    assert other != first
+    assert _format_graph_iri.cache_info().hits == 1
+
+
+def test_resolve_graph_iri_passthrough_and_none() -> None:
+    settings = ConfigManager.current().settings
+
+    assert resolve_graph_iri(None, settings) is None
+    assert resolve_graph_iri(GraphRef(name="urn:explicit"), settings) == "urn:explicit"